@@ -0,0 +1,130 @@
+"""
+Shared helpers for the ChemiSuite benchmarks
+Path setup, latency statistics, simulated devices and JSON output
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'devices', 'drivers'))
+
+# Loggable parameters of the simulated devices. These mirror
+# get_loggable_parameters() in devices/ika_stirrer.py and devices/azura_pump.py,
+# which can't be imported headless because they build NiceGUI panels.
+IKA_PARAMETERS = {
+    'temperature': {'method': 'get_temperature', 'unit': '°C', 'args': {'sensor_type': 2},
+                    'deadband': None, 'heartbeat': None},
+    'speed': {'method': 'get_speed', 'unit': 'RPM', 'args': {}, 'deadband': None, 'heartbeat': None},
+}
+AZURA_PARAMETERS = {
+    'flow_rate': {'method': 'get_flow', 'unit': 'µL/min', 'args': {}, 'deadband': None, 'heartbeat': None},
+    'pressure': {'method': 'get_pressure', 'unit': 'MPa', 'args': {}, 'deadband': None, 'heartbeat': None},
+    'motor_current': {'method': 'get_motor_current', 'unit': '%', 'args': {}, 'deadband': None, 'heartbeat': None},
+}
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms):
+    """Summarize latency samples in milliseconds"""
+    return {
+        'count': len(samples_ms),
+        'mean_ms': round(statistics.mean(samples_ms), 3) if samples_ms else None,
+        'p50_ms': round(percentile(samples_ms, 50), 3) if samples_ms else None,
+        'p95_ms': round(percentile(samples_ms, 95), 3) if samples_ms else None,
+        'p99_ms': round(percentile(samples_ms, 99), 3) if samples_ms else None,
+        'max_ms': round(max(samples_ms), 3) if samples_ms else None,
+    }
+
+
+def environment() -> Dict:
+    """Describe the machine a benchmark ran on"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def write_results(results: Dict, output: Optional[str] = None):
+    """Print results as JSON, or write them to output"""
+    results.setdefault('environment', environment())
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+def load_data_logger(work_dir: str):
+    """
+    Import the data_logger module without touching the real database
+
+    Importing it creates the global data_logger instance, whose database
+    path is relative to the working directory.
+    """
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        import data_logger
+    finally:
+        os.chdir(cwd)
+    return data_logger
+
+
+def make_simulated_devices(count: int, latency: float = 0.02, jitter: float = 0.0,
+                           error_rate: float = 0.0, connect: bool = True) -> List[Dict]:
+    """
+    Build device dicts backed by sim:// ports, alternating IKA hotplates and
+    AZURA pumps, each on its own port
+
+    Args:
+        count: Number of devices
+        latency, jitter, error_rate: Simulator options (seconds, seconds, 0-1)
+        connect: Open the simulated ports (in parallel; connect() waits for
+            the device like it would on hardware)
+
+    Returns:
+        Device dicts shaped like the ones pages/devices.py creates
+    """
+    from IKA_Hotplate_driver import IKAHotplateDriver
+    from Azura_Pump_driver import AzuraPumpDriver
+
+    devices = []
+    for index in range(count):
+        kind = 'ika' if index % 2 == 0 else 'azura'
+        port = f"sim://{kind}/{index}?latency={latency}&jitter={jitter}&error_rate={error_rate}&seed={index}"
+
+        if kind == 'ika':
+            driver = IKAHotplateDriver(port)
+            device = {'name': f"Hotplate {index}", 'type': 'ika_stirrer',
+                      'loggable_parameters': IKA_PARAMETERS}
+        else:
+            driver = AzuraPumpDriver(port)
+            device = {'name': f"Pump {index}", 'type': 'azura_pump',
+                      'loggable_parameters': AZURA_PARAMETERS}
+
+        device.update({'driver': driver, 'com_port': port})
+        devices.append(device)
+
+    if connect and devices:
+        with ThreadPoolExecutor(max_workers=len(devices)) as pool:
+            list(pool.map(lambda device: device['driver'].connect(), devices))
+
+    return devices
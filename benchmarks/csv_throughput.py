@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+CSV export/import throughput benchmark for ChemiSuite
+Exports a session of the given size with export_to_csv() and imports the
+file back with import_from_csv()
+
+Usage:
+    python benchmarks/csv_throughput.py [--points 200000] [--repeat 3] [--output results.json]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from common import write_results
+from database.db_manager import DatabaseManager
+
+
+def run(points: int, series: int, repeat: int) -> dict:
+    """Time exporting and re-importing a session of `points` data points"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        session_id = db.create_session('benchmark', 1)
+
+        start = time.time() - points / series
+        db.record_data_points(
+            (session_id, start + index // series, f"Device {index % series // 5}", 'benchmark',
+             f"param_{index % 5}", index * 0.5, 'u')
+            for index in range(points)
+        )
+        written = db.flush()
+
+        csv_path = os.path.join(tmp_dir, 'export.csv')
+        export_seconds = []
+        import_seconds = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            db.export_to_csv(session_id, csv_path)
+            export_seconds.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            imported_id = db.import_from_csv(csv_path)
+            import_seconds.append(time.perf_counter() - started)
+            db.delete_session(imported_id)
+
+        csv_bytes = os.path.getsize(csv_path)
+        db.close()
+
+        export_best = min(export_seconds)
+        import_best = min(import_seconds)
+        return {
+            'benchmark': 'csv_throughput',
+            'points': written,
+            'csv_bytes': csv_bytes,
+            'repeat': repeat,
+            'export': {
+                'best_seconds': round(export_best, 3),
+                'median_seconds': round(statistics.median(export_seconds), 3),
+                'rows_per_second': round(written / export_best, 1),
+                'mb_per_second': round(csv_bytes / export_best / 1e6, 2),
+            },
+            'import': {
+                'best_seconds': round(import_best, 3),
+                'median_seconds': round(statistics.median(import_seconds), 3),
+                'rows_per_second': round(written / import_best, 1),
+                'mb_per_second': round(csv_bytes / import_best / 1e6, 2),
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=200000, help='Data points in the exported session')
+    parser.add_argument('--series', type=int, default=20, help='Distinct parameters in the session')
+    parser.add_argument('--repeat', type=int, default=3, help='Export/import rounds (best is reported)')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.points, args.series, args.repeat)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Database read latency benchmark for ChemiSuite
+Measures UI-style read latency while a writer thread saturates data_points
+
+Usage:
+    python benchmarks/db_read_latency.py [--seconds 10] [--readers 2] [--output results.json]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from common import summarize, write_results
+from database.db_manager import DatabaseManager
+
+
+def run(seconds: float, readers: int, batch_size: int, parameters: int) -> dict:
+    """Run the benchmark against a fresh temporary database"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        session_id = db.create_session('benchmark', 1)
+
+        stop = threading.Event()
+        written = {'points': 0}
+
+        def writer():
+            """Write batches back to back, flushing each one"""
+            value = 0.0
+            while not stop.is_set():
+                # Offset repeated series by a microsecond so no sample overwrites another
+                now = time.time()
+                batch = [
+                    (session_id, now + (i // parameters) * 1e-6, f"Device {i % 10}", 'benchmark',
+                     f"param_{i % parameters}", value, 'u')
+                    for i in range(batch_size)
+                ]
+                db.record_data_points(batch)
+                written['points'] += db.flush()
+                value += 1.0
+
+        latencies = {'get_recent_data': [], 'get_data_point_count': []}
+        latencies_lock = threading.Lock()
+
+        def reader():
+            """Issue the same reads as the Data Logging page, as fast as possible"""
+            while not stop.is_set():
+                start = time.perf_counter()
+                db.get_recent_data(session_id, minutes=1)
+                recent_ms = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                db.get_data_point_count(session_id)
+                count_ms = (time.perf_counter() - start) * 1000
+
+                with latencies_lock:
+                    latencies['get_recent_data'].append(recent_ms)
+                    latencies['get_data_point_count'].append(count_ms)
+
+                # Space reads out like a UI timer would, just much faster
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=writer, daemon=True)]
+        threads += [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        db.close()
+
+        return {
+            'benchmark': 'db_read_latency',
+            'seconds': round(elapsed, 3),
+            'readers': readers,
+            'batch_size': batch_size,
+            'writer_points': written['points'],
+            'writer_points_per_second': round(written['points'] / elapsed, 1),
+            'reads': {name: summarize(samples) for name, samples in latencies.items()},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=10.0, help='Benchmark duration')
+    parser.add_argument('--readers', type=int, default=2, help='Number of concurrent reader threads')
+    parser.add_argument('--batch-size', type=int, default=200, help='Data points per writer transaction')
+    parser.add_argument('--parameters', type=int, default=20, help='Distinct parameters written')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.seconds, args.readers, args.batch_size, args.parameters)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Database insert and range-query benchmark for ChemiSuite
+Measures batch insert latency, then the latency of time-window reads over
+the history that was written
+
+Usage:
+    python benchmarks/db_write_query.py [--hours 24] [--series 50] [--interval 5] [--output results.json]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from common import summarize, write_results
+from database.db_manager import DatabaseManager
+
+
+def run(hours: float, series: int, interval: float, batch_size: int, queries: int) -> dict:
+    """Write `hours` of history for `series` parameters, then query it"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        session_id = db.create_session('benchmark', int(interval))
+
+        # History ending now, so get_recent_data() windows hit real data
+        end = time.time()
+        start = end - hours * 3600
+        steps = int(hours * 3600 / interval)
+
+        insert_ms = []
+        batch = []
+        total = 0
+        started = time.perf_counter()
+        for step in range(steps):
+            timestamp = start + step * interval
+            for index in range(series):
+                batch.append((session_id, timestamp, f"Device {index // 5}", 'benchmark',
+                              f"param_{index % 5}", float(step % 100), 'u'))
+
+            if len(batch) >= batch_size or step == steps - 1:
+                batch_start = time.perf_counter()
+                db.record_data_points(batch)
+                total += db.flush()
+                insert_ms.append((time.perf_counter() - batch_start) * 1000)
+                batch = []
+        insert_seconds = time.perf_counter() - started
+
+        # Range queries: windows the Data Logging page asks for, plus a
+        # single-parameter read of the whole session
+        query_ms = {}
+        for minutes in (1, 10, 60):
+            samples = []
+            for _ in range(queries):
+                query_start = time.perf_counter()
+                rows = db.get_recent_data(session_id, minutes=minutes)
+                samples.append((time.perf_counter() - query_start) * 1000)
+            query_ms[f"recent_{minutes}min"] = dict(summarize(samples), rows=len(rows))
+
+        samples = []
+        for _ in range(max(1, queries // 10)):
+            query_start = time.perf_counter()
+            rows = db.get_session_data(session_id, parameter='param_0')
+            samples.append((time.perf_counter() - query_start) * 1000)
+        query_ms['session_one_parameter'] = dict(summarize(samples), rows=len(rows))
+
+        samples = []
+        for _ in range(queries):
+            query_start = time.perf_counter()
+            db.get_data_point_count(session_id)
+            samples.append((time.perf_counter() - query_start) * 1000)
+        query_ms['count'] = summarize(samples)
+
+        db.close()
+        db_bytes = os.path.getsize(os.path.join(tmp_dir, 'bench.db'))
+
+        return {
+            'benchmark': 'db_write_query',
+            'hours': hours,
+            'series': series,
+            'interval_seconds': interval,
+            'points': total,
+            'batch_size': batch_size,
+            'insert_points_per_second': round(total / insert_seconds, 1),
+            'insert_batch': summarize(insert_ms),
+            'queries': query_ms,
+            'database_bytes': db_bytes,
+            'bytes_per_point': round(db_bytes / total, 2) if total else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=24.0, help='Hours of history to write')
+    parser.add_argument('--series', type=int, default=50, help='Number of logged parameters')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between samples of a parameter')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Data points per insert transaction')
+    parser.add_argument('--queries', type=int, default=50, help='Repetitions of each query')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.hours, args.series, args.interval, args.batch_size, args.queries)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
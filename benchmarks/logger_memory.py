@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Long-session memory benchmark for ChemiSuite
+Replays a 72-hour logging session against zero-latency simulated devices as
+fast as possible and samples process memory once per simulated hour
+
+The session runs on a simulated clock: each cycle advances it by the
+logging interval, and data points are stamped with simulated wall-clock
+time. Deadbands are bypassed so every reading is stored, the worst case for
+database and buffer growth.
+
+Usage:
+    python benchmarks/logger_memory.py [--hours 72] [--devices 10] [--interval 5] [--output results.json]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from common import load_data_logger, make_simulated_devices, write_results
+from database.db_manager import DatabaseManager
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def run(hours: float, device_count: int, interval: float, trace: bool) -> dict:
+    """Replay `hours` of logging and return memory samples per simulated hour"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_logger = load_data_logger(tmp_dir)
+
+        class RecordEverythingLogger(data_logger.DataLogger):
+            """DataLogger that stores every reading regardless of deadband"""
+
+            def _should_record(self, device_name, param_name, value):
+                super()._should_record(device_name, param_name, value)
+                return True
+
+        db_path = os.path.join(tmp_dir, 'bench.db')
+        db = DatabaseManager(db_path)
+        devices = make_simulated_devices(device_count, latency=0.0)
+
+        # Set up a session by hand so the polling loop runs on our clock
+        logger = RecordEverythingLogger(db)
+        logger.devices_to_log = devices
+        logger.parameters_to_log = {device['name']: list(device['loggable_parameters']) for device in devices}
+        logger.interval_seconds = interval
+        logger._schedule = logger._build_schedule({})
+        logger.tick_seconds = interval
+        logger.active_session_id = db.create_session('benchmark', int(interval))
+        ports = logger._group_devices_by_port()
+
+        if trace:
+            tracemalloc.start()
+
+        gc.collect()
+        samples = [{'hour': 0, 'rss_mb': round(current_rss_mb(), 2), 'points': 0}]
+        wall_start = time.time() - hours * 3600
+        cycles_per_hour = int(3600 / interval)
+        points = 0
+        started = time.perf_counter()
+
+        for cycle in range(int(hours * cycles_per_hour)):
+            sim_now = cycle * interval
+            timestamp = wall_start + sim_now
+            for port_devices in ports.values():
+                due = logger._take_due_parameters(port_devices, sim_now)
+                batch = logger._poll_port(due, logger.active_session_id)
+                # Stamp with the simulated clock instead of datetime.now()
+                db.record_data_points([(point[0], timestamp) + point[2:] for point in batch])
+                points += len(batch)
+
+            if (cycle + 1) % cycles_per_hour == 0:
+                db.flush()
+                gc.collect()
+                sample = {
+                    'hour': (cycle + 1) // cycles_per_hour,
+                    'rss_mb': round(current_rss_mb(), 2),
+                    'points': points,
+                    'database_mb': round(os.path.getsize(db_path) / 1e6, 2),
+                }
+                if trace:
+                    sample['traced_mb'] = round(tracemalloc.get_traced_memory()[0] / 1e6, 2)
+                samples.append(sample)
+
+        db.flush()
+        elapsed = time.perf_counter() - started
+        if trace:
+            tracemalloc.stop()
+
+        for device in devices:
+            device['driver'].disconnect()
+        db.close()
+
+        # Growth after the first simulated hour, once caches have warmed up
+        warm = samples[1] if len(samples) > 2 else samples[0]
+        last = samples[-1]
+        span = max(1, last['hour'] - warm['hour'])
+
+        return {
+            'benchmark': 'logger_memory',
+            'simulated_hours': hours,
+            'devices': device_count,
+            'interval_seconds': interval,
+            'points': points,
+            'seconds': round(elapsed, 3),
+            'points_per_second': round(points / elapsed, 1),
+            'rss_start_mb': samples[0]['rss_mb'],
+            'rss_end_mb': last['rss_mb'],
+            'rss_growth_mb_per_hour': round((last['rss_mb'] - warm['rss_mb']) / span, 4),
+            'samples': samples,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=72.0, help='Simulated session length')
+    parser.add_argument('--devices', type=int, default=10, help='Number of simulated devices')
+    parser.add_argument('--interval', type=float, default=5.0, help='Logging interval in seconds')
+    parser.add_argument('--tracemalloc', action='store_true', help='Also report Python-allocated memory (slower)')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.hours, args.devices, args.interval, args.tracemalloc)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
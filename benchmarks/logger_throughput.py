@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Data logger throughput benchmark for ChemiSuite
+Runs a real DataLogger session against simulated devices and measures
+samples per second and poll-cycle jitter versus interval_seconds
+
+Usage:
+    python benchmarks/logger_throughput.py [--devices 20] [--interval 1] [--seconds 30] [--output results.json]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from common import load_data_logger, make_simulated_devices, summarize, write_results
+from database.db_manager import DatabaseManager
+
+
+def run(device_count: int, interval: float, seconds: float, latency: float, jitter: float,
+        error_rate: float, use_telemetry: bool) -> dict:
+    """Log from simulated devices for the given time into a temporary database"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_logger = load_data_logger(tmp_dir)
+        from telemetry import telemetry
+
+        class InstrumentedLogger(data_logger.DataLogger):
+            """DataLogger that records when each poll cycle starts"""
+
+            def __init__(self, db):
+                super().__init__(db)
+                self.cycle_starts = []
+
+            def _poll_devices(self, deadline=None):
+                self.cycle_starts.append(time.monotonic())
+                super()._poll_devices(deadline)
+
+        devices = make_simulated_devices(device_count, latency, jitter, error_rate)
+        if use_telemetry:
+            for device in devices:
+                telemetry.register(device, poll_interval=interval)
+
+        db = DatabaseManager(os.path.join(tmp_dir, 'bench.db'))
+        logger = InstrumentedLogger(db)
+        parameters = {device['name']: list(device['loggable_parameters']) for device in devices}
+
+        logger.start_session('benchmark', devices, parameters, interval_seconds=interval)
+        started = time.perf_counter()
+        time.sleep(seconds)
+        recorded = logger.total_data_points
+        suppressed = logger.suppressed_points
+        missed = logger.missed_cycles
+        logger.stop_session()
+        elapsed = time.perf_counter() - started
+
+        telemetry.stop_all()
+        for device in devices:
+            device['driver'].disconnect()
+        db.close()
+
+        # Jitter: how far each cycle start strays from the fixed-rate schedule
+        starts = logger.cycle_starts
+        periods_ms = [(b - a) * 1000 for a, b in zip(starts, starts[1:])]
+        lateness_ms = [abs((start - starts[0]) - round((start - starts[0]) / interval) * interval) * 1000
+                       for start in starts]
+
+        readings = recorded + suppressed
+        return {
+            'benchmark': 'logger_throughput',
+            'seconds': round(elapsed, 3),
+            'devices': device_count,
+            'parameters': sum(len(params) for params in parameters.values()),
+            'interval_seconds': interval,
+            'simulator': {'latency': latency, 'jitter': jitter, 'error_rate': error_rate},
+            'telemetry': use_telemetry,
+            'cycles': len(starts),
+            'missed_cycles': missed,
+            'readings': readings,
+            'readings_per_second': round(readings / elapsed, 1),
+            'recorded_points': recorded,
+            'recorded_points_per_second': round(recorded / elapsed, 1),
+            'suppressed_points': suppressed,
+            'cycle_period': summarize(periods_ms),
+            'cycle_jitter': summarize(lateness_ms),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--devices', type=int, default=20, help='Number of simulated devices')
+    parser.add_argument('--interval', type=float, default=1.0, help='Logging interval in seconds')
+    parser.add_argument('--seconds', type=float, default=30.0, help='Benchmark duration')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated reply latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.005, help='Simulated latency jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of lost replies')
+    parser.add_argument('--telemetry', action='store_true', help='Read through the shared telemetry service')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.devices, args.interval, args.seconds, args.latency, args.jitter,
+                  args.error_rate, args.telemetry)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+MQTT publisher load benchmark for ChemiSuite
+Publishes many topics through MQTTPublisher to an in-process FakeBroker
+(or a real broker such as a local Mosquitto) and measures delivered
+messages per second, PUBACK latency, drops and recovery from a broker outage
+
+Usage:
+    python benchmarks/mqtt_publish.py [--topics 500] [--rate 1] [--seconds 20] [--outage 3] [--output results.json]
+    python benchmarks/mqtt_publish.py --broker localhost:1883 --topics 500
+"""
+
+import argparse
+import threading
+import time
+from typing import Optional
+
+from common import write_results
+from mqtt_publisher import MQTT_ERR_NO_CONN, MQTT_ERR_SUCCESS, MQTTPublisher, PahoConnection
+from simulators.mqtt_broker import FakeBroker
+
+
+def run(topics: int, rate: float, seconds: float, qos: int, max_inflight: int, topic_rate: Optional[float],
+        latency: float, jitter: float, outage: float, broker: Optional[str] = None) -> dict:
+    """
+    Publish every topic rate times per second for the given time
+
+    With the fake broker, the broker goes offline for `outage` seconds a
+    third of the way in; messages refused meanwhile are counted, not retried.
+    """
+    if broker:
+        host, _, port = broker.partition(':')
+        fake = None
+        factory = lambda: PahoConnection(host, int(port or 1883), client_id=f"chemisuite_bench_{time.time()}")
+    else:
+        fake = FakeBroker(latency=latency, jitter=jitter, seed=1)
+        factory = fake.connection
+
+    publisher = MQTTPublisher(factory, max_inflight=max_inflight, topic_rate=topic_rate,
+                              backoff_initial=0.2, backoff_max=2.0)
+    publisher.start()
+    deadline = time.monotonic() + 10.0
+    while not publisher.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    if not publisher.connected:
+        publisher.stop()
+        raise RuntimeError(f"Could not connect: {publisher.last_error}")
+
+    counts = {'offered': 0, 'accepted': 0, 'refused_offline': 0, 'refused_full': 0}
+    names = [f"chemisuite/bench/device/{index}" for index in range(topics)]
+    recovery = {}
+
+    def outage_window():
+        time.sleep(seconds / 3)
+        fake.go_offline()
+        time.sleep(outage)
+        fake.go_online()
+        back = time.monotonic()
+        while not publisher.connected:
+            time.sleep(0.005)
+        recovery['seconds'] = time.monotonic() - back
+
+    if fake is not None and outage > 0:
+        threading.Thread(target=outage_window, daemon=True).start()
+
+    started = time.perf_counter()
+    next_round = time.monotonic()
+    end = next_round + seconds
+    sequence = 0
+    while next_round < end:
+        for topic in names:
+            handle = publisher.publish(topic, f'{{"seq": {sequence}, "value": {sequence * 0.1:.1f}}}', qos=qos)
+            counts['offered'] += 1
+            if handle.rc == MQTT_ERR_SUCCESS:
+                counts['accepted'] += 1
+            elif handle.rc == MQTT_ERR_NO_CONN:
+                counts['refused_offline'] += 1
+            else:
+                counts['refused_full'] += 1
+        sequence += 1
+        next_round += 1.0 / rate
+        time.sleep(max(0.0, next_round - time.monotonic()))
+
+    # Let the publisher finish what it accepted
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
+        stats = publisher.get_stats()
+        if not stats['queue_depth'] and not stats['inflight']:
+            break
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    stats = publisher.get_stats()
+    publisher.stop()
+
+    return {
+        'benchmark': 'mqtt_publish',
+        'broker': broker or 'fake',
+        'seconds': round(elapsed, 3),
+        'topics': topics,
+        'rate_per_topic': rate,
+        'qos': qos,
+        'max_inflight': max_inflight,
+        'topic_rate': topic_rate,
+        'fake_broker': {'latency': latency, 'jitter': jitter, 'outage_seconds': outage} if fake else None,
+        **counts,
+        'published': stats['published'],
+        'published_per_second': round(stats['published'] / elapsed, 1),
+        'coalesced': stats['coalesced'],
+        'resent': stats['resent'],
+        'reconnects': stats['connects'] - 1,
+        'recovery_seconds': round(recovery['seconds'], 3) if 'seconds' in recovery else None,
+        'latency_ms': stats['latency_ms'],
+        'broker_received': fake.get_stats()['received'] if fake else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--topics', type=int, default=500, help='Number of topics')
+    parser.add_argument('--rate', type=float, default=1.0, help='Messages per second per topic')
+    parser.add_argument('--seconds', type=float, default=20.0, help='Benchmark duration')
+    parser.add_argument('--qos', type=int, default=1, choices=(0, 1), help='QoS of the messages')
+    parser.add_argument('--max-inflight', type=int, default=20, help='QoS 1 messages awaiting PUBACK at once')
+    parser.add_argument('--topic-rate', type=float, default=10.0, help='Per-topic rate limit (0: unlimited)')
+    parser.add_argument('--latency', type=float, default=0.005, help='Fake broker ack latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.002, help='Fake broker latency jitter in seconds')
+    parser.add_argument('--outage', type=float, default=3.0, help='Fake broker outage in seconds (0: none)')
+    parser.add_argument('--broker', help='host:port of a real broker (e.g. a local Mosquitto) instead of the fake')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = run(args.topics, args.rate, args.seconds, args.qos, args.max_inflight, args.topic_rate or None,
+                  args.latency, args.jitter, args.outage, args.broker)
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
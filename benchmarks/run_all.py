@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Run the ChemiSuite benchmark suite and write one JSON report
+
+Usage:
+    python benchmarks/run_all.py [--quick] [--output results.json]
+
+--quick shortens every benchmark (well under a minute in total) for smoke runs;
+the full run replays a 72-hour session and takes several minutes. Compare
+reports from two releases to spot regressions in the logging hot paths.
+"""
+
+import argparse
+import sys
+
+import csv_throughput
+import db_read_latency
+import db_write_query
+import logger_memory
+import logger_throughput
+import mqtt_publish
+from common import environment, write_results
+
+# (name, full-run kwargs, quick-run kwargs)
+SUITE = [
+    ('logger_throughput', logger_throughput.run,
+     dict(device_count=50, interval=1.0, seconds=30.0, latency=0.02, jitter=0.005, error_rate=0.0, use_telemetry=False),
+     dict(device_count=20, interval=1.0, seconds=5.0, latency=0.02, jitter=0.005, error_rate=0.0, use_telemetry=False)),
+    ('db_write_query', db_write_query.run,
+     dict(hours=24.0, series=50, interval=5.0, batch_size=5000, queries=50),
+     dict(hours=2.0, series=50, interval=5.0, batch_size=5000, queries=10)),
+    ('db_read_latency', db_read_latency.run,
+     dict(seconds=10.0, readers=2, batch_size=200, parameters=20),
+     dict(seconds=3.0, readers=2, batch_size=200, parameters=20)),
+    ('csv_throughput', csv_throughput.run,
+     dict(points=200000, series=20, repeat=3),
+     dict(points=20000, series=20, repeat=1)),
+    ('logger_memory', logger_memory.run,
+     dict(hours=72.0, device_count=10, interval=5.0, trace=False),
+     dict(hours=6.0, device_count=10, interval=5.0, trace=False)),
+    ('mqtt_publish', mqtt_publish.run,
+     dict(topics=500, rate=1.0, seconds=20.0, qos=1, max_inflight=20, topic_rate=10.0, latency=0.005, jitter=0.002,
+          outage=3.0),
+     dict(topics=200, rate=1.0, seconds=5.0, qos=1, max_inflight=20, topic_rate=10.0, latency=0.005, jitter=0.002,
+          outage=1.0)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Short smoke run of every benchmark')
+    parser.add_argument('--only', nargs='+', choices=[name for name, *_ in SUITE], help='Run only these benchmarks')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = {'suite': 'chemisuite', 'quick': args.quick, 'environment': environment(), 'results': {}}
+    for name, run, full_kwargs, quick_kwargs in SUITE:
+        if args.only and name not in args.only:
+            continue
+        print(f"Running {name}...", file=sys.stderr, flush=True)
+        report['results'][name] = run(**(quick_kwargs if args.quick else full_kwargs))
+
+    write_results(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -171,6 +171,9 @@ if __name__ in {"__main__", "__mp_main__"}:
 
     def on_startup():
         app.native.main_window.move(0, 0)
+        # Thin, archive and vacuum old sessions in the background
+        from data_logger import data_logger
+        data_logger.retention.start(lambda: data_logger.active_session_id)
         # Close splash screen after NiceGUI window is ready
         import splashscreen
         if hasattr(splashscreen, 'close_splash'):
@@ -193,6 +196,14 @@ if __name__ in {"__main__", "__mp_main__"}:
         from pages import devices as devices_page
         devices_page.cleanup_all_device_webcams()
 
+        # Stop background retention work
+        from data_logger import data_logger
+        data_logger.retention.stop()
+
+        # Stop telemetry polling before closing the ports underneath it
+        from telemetry import telemetry
+        telemetry.stop_all()
+
         # Cleanup device connections
         for device in devices_page.devices:
             if 'driver' in device and device['driver'] is not None:
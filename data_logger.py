@@ -5,16 +5,147 @@ Manages background polling and data collection from devices
 
 import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Callable
 from database.db_manager import DatabaseManager
+from database.retention import RetentionManager
+from telemetry import telemetry
+
+
+class RecentSamples:
+    """
+    In-memory ring buffers holding the last few minutes of every logged series
+
+    Each (device_name, parameter) gets a fixed pair of array('d') buffers
+    (epoch seconds and values) sized for the window at that parameter's
+    sampling interval, so memory stays constant however long a session
+    runs. Port workers append under a lock; readers get copies.
+    """
+
+    def __init__(self, window_seconds: float = 600):
+        """
+        Initialize the buffers
+
+        Args:
+            window_seconds: History kept per series
+        """
+        self.window_seconds = window_seconds
+        self._intervals = {}
+        self._series = {}  # Dict: (device_name, parameter) -> ring buffer entry
+        self._lock = threading.Lock()
+
+    def reset(self, intervals: Optional[Dict[tuple, float]] = None):
+        """
+        Drop all samples, e.g. when a new session starts
+
+        Args:
+            intervals: (device_name, parameter) -> sampling interval in seconds,
+                used to size each series' buffer
+        """
+        with self._lock:
+            self._intervals = dict(intervals or {})
+            self._series = {}
+
+    def append(self, batch: List[tuple]):
+        """Add a batch of (session_id, timestamp, device_name, device_type, parameter, value, unit) points"""
+        with self._lock:
+            for _, timestamp, device_name, device_type, param_name, value, unit in batch:
+                entry = self._series.get((device_name, param_name))
+                if entry is None:
+                    interval = max(self._intervals.get((device_name, param_name), 1.0), 0.01)
+                    capacity = int(self.window_seconds / interval) + 2
+                    entry = self._series[(device_name, param_name)] = {
+                        'device_type': device_type,
+                        'unit': unit,
+                        'timestamps': array('d', bytes(8 * capacity)),
+                        'values': array('d', bytes(8 * capacity)),
+                        'head': 0,
+                        'count': 0,
+                    }
+
+                head = entry['head']
+                capacity = len(entry['values'])
+                entry['timestamps'][head] = timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp
+                entry['values'][head] = value
+                entry['head'] = (head + 1) % capacity
+                entry['count'] = min(entry['count'] + 1, capacity)
+
+    def snapshot(self, cursors: Optional[Dict[tuple, float]] = None,
+                 device_name: Optional[str] = None) -> List[Dict]:
+        """
+        Copy the buffered samples of every series, oldest first
+
+        Args:
+            cursors: Optional (device_name, parameter) -> last epoch timestamp
+                already seen; only newer samples are returned and the cursors
+                are advanced in place
+            device_name: Only return this device's series
+
+        Returns:
+            List of dictionaries with device_name, device_type, parameter,
+            unit, timestamps (epoch seconds) and values, for series with
+            samples to report
+        """
+        cutoff = time.time() - self.window_seconds
+        copies = []
+        with self._lock:
+            for key, entry in self._series.items():
+                if device_name is not None and key[0] != device_name:
+                    continue
+                count, head = entry['count'], entry['head']
+                if count < len(entry['values']):
+                    timestamps, values = entry['timestamps'][:count], entry['values'][:count]
+                else:
+                    timestamps = entry['timestamps'][head:] + entry['timestamps'][:head]
+                    values = entry['values'][head:] + entry['values'][:head]
+                copies.append((key, entry, timestamps, values))
+
+        snapshot = []
+        for (name, param_name), entry, timestamps, values in copies:
+            start = bisect_left(timestamps, cutoff)
+            if cursors is not None and (name, param_name) in cursors:
+                start = max(start, bisect_right(timestamps, cursors[(name, param_name)]))
+            if start >= len(timestamps):
+                continue
+            if cursors is not None:
+                cursors[(name, param_name)] = timestamps[-1]
+            snapshot.append({
+                'device_name': name,
+                'device_type': entry['device_type'],
+                'parameter': param_name,
+                'unit': entry['unit'],
+                'timestamps': timestamps[start:].tolist(),
+                'values': values[start:].tolist(),
+            })
+        return snapshot
+
+    def latest(self) -> Dict[tuple, tuple]:
+        """Get the newest (epoch timestamp, value, unit) of every series, keyed by (device_name, parameter)"""
+        with self._lock:
+            return {
+                key: (entry['timestamps'][entry['head'] - 1], entry['values'][entry['head'] - 1], entry['unit'])
+                for key, entry in self._series.items() if entry['count']
+            }
+
 
 class DataLogger:
     """Central data logging service"""
 
-    def __init__(self):
-        """Initialize data logger"""
-        self.db = DatabaseManager()
+    # Seconds of recent samples kept in memory for live consumers
+    RECENT_WINDOW_SECONDS = 600
+
+    def __init__(self, db: Optional[DatabaseManager] = None):
+        """
+        Initialize data logger
+
+        Args:
+            db: Database to log into (default: the ChemiSuite database)
+        """
+        self.db = db or DatabaseManager()
+        self.retention = RetentionManager(self.db)
         self.active_session_id = None
         self.polling_thread = None
         self.running = False
@@ -25,62 +156,140 @@ class DataLogger:
         self.parameters_to_log = {}  # Dict: device_name -> [parameters]
         self.interval_seconds = 5
 
+        # Per-parameter sampling state: (device_name, parameter) -> schedule entry
+        self._schedule = {}
+        self.tick_seconds = 5
+
+        # One worker per serial port so slow devices don't delay each other
+        self._executor = None
+        self._port_futures = {}  # Dict: port -> Future of that port's current poll
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+
         # Statistics
         self.total_data_points = 0
         self.last_poll_time = None
         self.poll_count = 0
+        self.last_cycle_seconds = None
+        self.missed_cycles = 0
+        self.suppressed_points = 0
+
+        # Recent samples for live plots and publishers
+        self.recent = RecentSamples(self.RECENT_WINDOW_SECONDS)
 
     def start_session(self, session_name: str, devices: List[Dict],
                      parameters: Dict[str, List[str]], interval_seconds: int = 5,
-                     metadata: Dict = None):
+                     metadata: Dict = None,
+                     parameter_settings: Dict[str, Dict[str, Dict]] = None):
         """
         Start a new logging session
 
+        Each parameter is sampled on its own schedule. Its 'interval',
+        'deadband' and 'heartbeat' come from parameter_settings, then from the
+        device module's get_loggable_parameters(), and the interval falls back
+        to interval_seconds. With a deadband, a reading is only recorded when
+        it differs from the last recorded value by more than the deadband, or
+        when no value has been recorded for 'heartbeat' seconds.
+
         Args:
             session_name: Name for this logging session
             devices: List of device objects to log from
             parameters: Dict mapping device_name to list of parameters to log
-            interval_seconds: How often to poll devices (in seconds)
+            interval_seconds: Default polling interval (in seconds)
             metadata: Optional metadata to store with session
+            parameter_settings: Optional dict mapping device_name to
+                {parameter: {'interval', 'deadband', 'heartbeat'}} overrides
         """
         if self.running:
             raise RuntimeError("A logging session is already running. Stop it first.")
 
+        # Store configuration
+        self.devices_to_log = devices
+        self.parameters_to_log = parameters
+        self.interval_seconds = interval_seconds
+        self._schedule = self._build_schedule(parameter_settings or {})
+        self.tick_seconds = min((entry['interval'] for entry in self._schedule.values()),
+                                default=interval_seconds)
+
+        # Record the effective sampling settings with the session
+        session_metadata = dict(metadata or {})
+        session_metadata['parameter_settings'] = {
+            f"{device_name}.{param_name}": {
+                key: entry[key] for key in ('interval', 'deadband', 'heartbeat')
+            }
+            for (device_name, param_name), entry in self._schedule.items()
+        }
+
         # Create session in database
         self.active_session_id = self.db.create_session(
             name=session_name,
             interval_seconds=interval_seconds,
-            metadata=metadata or {}
+            metadata=session_metadata
         )
 
-        # Store configuration
-        self.devices_to_log = devices
-        self.parameters_to_log = parameters
-        self.interval_seconds = interval_seconds
-
         # Reset statistics
         self.total_data_points = 0
         self.poll_count = 0
         self.last_poll_time = None
+        self.last_cycle_seconds = None
+        self.missed_cycles = 0
+        self.suppressed_points = 0
+        self.recent.reset({key: entry['interval'] for key, entry in self._schedule.items()})
+        self._set_telemetry_intervals()
+
+        # Start one polling worker per serial port
+        port_count = len(self._group_devices_by_port())
+        self._executor = ThreadPoolExecutor(max_workers=max(1, port_count),
+                                            thread_name_prefix="DataLogger-Port")
+        self._port_futures = {}
 
         # Start polling thread
         self.running = True
         self.paused = False
+        self._stop_event.clear()
         self.polling_thread = threading.Thread(target=self._polling_loop, daemon=True)
         self.polling_thread.start()
 
         return self.active_session_id
 
+    def _set_telemetry_intervals(self, restore: bool = False):
+        """
+        Poll each logged device through telemetry at least as often as its
+        fastest logged parameter, so the logger is served from the cache
+
+        Args:
+            restore: Put the devices back on their registered poll interval
+        """
+        fastest = {}
+        for (device_name, _), entry in self._schedule.items():
+            fastest[device_name] = min(entry['interval'], fastest.get(device_name, entry['interval']))
+
+        for device_name, interval in fastest.items():
+            device_telemetry = telemetry.get(device_name)
+            if device_telemetry is not None:
+                device_telemetry.set_poll_interval(
+                    None if restore else min(interval, device_telemetry.default_poll_interval))
+
     def stop_session(self):
         """Stop the current logging session"""
         if not self.running:
             return
 
         self.running = False
+        self._stop_event.set()
 
-        # Wait for polling thread to finish
+        # Wait for polling thread and any in-flight device reads to finish
         if self.polling_thread:
             self.polling_thread.join(timeout=5)
+        self._wait_for_port_polls(timeout=5)
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        # Make sure every buffered data point is on disk
+        self.db.flush()
+        self._set_telemetry_intervals(restore=True)
 
         # Update session status in database
         if self.active_session_id:
@@ -95,6 +304,8 @@ class DataLogger:
         """Pause data collection without stopping the session"""
         if self.running and not self.paused:
             self.paused = True
+            self._wait_for_port_polls(timeout=5)
+            self.db.flush()
             if self.active_session_id:
                 self.db.update_session_status(self.active_session_id, 'paused')
 
@@ -106,65 +317,235 @@ class DataLogger:
                 self.db.update_session_status(self.active_session_id, 'running')
 
     def _polling_loop(self):
-        """Background polling loop that collects data from devices"""
+        """
+        Background polling loop that collects data from devices
+
+        Cycles start on a fixed-rate schedule measured with the monotonic
+        clock, so time spent talking to devices doesn't stretch the interval.
+        If a cycle overruns, the missed ticks are skipped rather than run
+        back to back.
+        """
+        next_tick = time.monotonic()
+
         while self.running:
             if not self.paused:
-                self._poll_devices()
+                cycle_start = time.monotonic()
+                self._poll_devices(deadline=next_tick + self.tick_seconds)
+                self.last_cycle_seconds = time.monotonic() - cycle_start
                 self.poll_count += 1
                 self.last_poll_time = datetime.now()
 
-            # Sleep for the specified interval
-            time.sleep(self.interval_seconds)
+            next_tick += self.tick_seconds
+            now = time.monotonic()
 
-    def _poll_devices(self):
-        """Poll all configured devices and record data points"""
-        for device in self.devices_to_log:
-            device_name = device['name']
-            device_type = device['type']
-            driver = device.get('driver')
+            # Skip ticks that passed entirely; a tick that is only just due
+            # (e.g. after waiting out a slow port) starts right away
+            missed = int((now - next_tick) // self.tick_seconds) if now > next_tick else 0
+            if missed:
+                self.missed_cycles += missed
+                next_tick += missed * self.tick_seconds
 
-            # Skip if device has no driver or isn't connected
-            if not driver:
-                continue
+            # Wait for the next tick (returns early when the session stops)
+            self._stop_event.wait(max(0.0, next_tick - now))
 
-            # Get parameters to log for this device
-            params = self.parameters_to_log.get(device_name, [])
+    def _build_schedule(self, parameter_settings: Dict[str, Dict[str, Dict]]) -> Dict:
+        """Resolve the sampling settings of every logged parameter"""
+        schedule = {}
 
-            # Get loggable parameters configuration from device
+        for device in self.devices_to_log:
+            device_name = device['name']
             loggable_params = device.get('loggable_parameters', {})
+            overrides = parameter_settings.get(device_name, {})
 
-            for param_name in params:
+            for param_name in self.parameters_to_log.get(device_name, []):
                 if param_name not in loggable_params:
                     continue
 
-                param_config = loggable_params[param_name]
+                settings = dict(loggable_params[param_name])
+                settings.update({key: value for key, value in overrides.get(param_name, {}).items()
+                                 if value is not None})
+
+                schedule[(device_name, param_name)] = {
+                    'interval': settings.get('interval') or self.interval_seconds,
+                    'deadband': settings.get('deadband'),
+                    'heartbeat': settings.get('heartbeat'),
+                    'next_due': 0.0,
+                    'last_value': None,
+                    'last_recorded': None
+                }
+
+        return schedule
+
+    def _group_devices_by_port(self) -> Dict[str, List[Dict]]:
+        """Group the devices being logged by the serial port they share"""
+        groups = {}
+        for device in self.devices_to_log:
+            port = device.get('com_port') or device['name']
+            groups.setdefault(port, []).append(device)
+        return groups
+
+    def _take_due_parameters(self, devices: List[Dict], now: float) -> List[tuple]:
+        """
+        Collect the parameters of a port's devices that are due for sampling
+
+        Due parameters have their next sample time advanced on a fixed-rate
+        schedule; samples missed by more than one interval are skipped.
 
-                try:
+        Returns:
+            List of (device, [parameter names]) for devices with due parameters
+        """
+        # Anything due before the middle of the next tick belongs to this one
+        horizon = now + self.tick_seconds / 2
+        due = []
+
+        for device in devices:
+            due_params = []
+            for param_name in self.parameters_to_log.get(device['name'], []):
+                entry = self._schedule.get((device['name'], param_name))
+                if entry is None or entry['next_due'] > horizon:
+                    continue
+
+                due_params.append(param_name)
+                entry['next_due'] += entry['interval']
+                if entry['next_due'] <= now:
+                    entry['next_due'] = now + entry['interval']
+
+            if due_params:
+                due.append((device, due_params))
+
+        return due
+
+    def _poll_devices(self, deadline: Optional[float] = None):
+        """
+        Poll the parameters that are due and record data points
+
+        Each serial port is polled by its own worker, so a cycle takes as long
+        as the slowest port rather than the sum of all devices. A port whose
+        previous poll is still running is skipped for this cycle; its
+        parameters stay due for the next one.
+
+        Args:
+            deadline: Monotonic time to stop waiting for slow ports
+        """
+        futures = []
+        now = time.monotonic()
+
+        for port, devices in self._group_devices_by_port().items():
+            previous = self._port_futures.get(port)
+            if previous is not None and not previous.done():
+                continue
+
+            due = self._take_due_parameters(devices, now)
+            if not due:
+                continue
+
+            # The session id is fixed now: a poll still running after stop_session() keeps it
+            future = self._executor.submit(self._poll_port, due, self.active_session_id)
+            future.add_done_callback(self._record_port_batch)
+            self._port_futures[port] = future
+            futures.append(future)
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        wait(futures, timeout=timeout)
+
+    def _wait_for_port_polls(self, timeout: float):
+        """Wait for in-flight port polls so their data points are buffered"""
+        wait(list(self._port_futures.values()), timeout=timeout)
+
+    def _record_port_batch(self, future):
+        """Hand a finished port poll's data points to the database writer"""
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        batch = future.result()
+        if batch:
+            self.recent.append(batch)
+            self.db.record_data_points(batch)
+            with self._stats_lock:
+                self.total_data_points += len(batch)
+
+    def _poll_port(self, due: List[tuple], session_id: int) -> List[tuple]:
+        """Read the due parameters from the devices on one port, in order"""
+        batch = []
+        for device, params in due:
+            batch.extend(self._poll_device(device, params, session_id))
+        return batch
+
+    def _poll_device(self, device: Dict, params: List[str], session_id: int) -> List[tuple]:
+        """Read the given parameters of one device for the given session"""
+        batch = []
+
+        device_name = device['name']
+        device_type = device['type']
+        driver = device.get('driver')
+
+        # Skip if device has no driver or isn't connected
+        if not driver:
+            return batch
+
+        # Get loggable parameters configuration from device
+        loggable_params = device.get('loggable_parameters', {})
+
+        # Connected devices are polled by the telemetry service; reuse its readings
+        device_telemetry = telemetry.get(device_name)
+
+        for param_name in params:
+            if param_name not in loggable_params:
+                continue
+
+            param_config = loggable_params[param_name]
+
+            try:
+                if device_telemetry is not None:
+                    # Cached value from the current poll period, or one read queued behind
+                    # other I/O; the slack covers a poll that finishes a little late
+                    interval = self._schedule[(device_name, param_name)]['interval']
+                    max_age = 1.5 * max(interval, device_telemetry.poll_interval)
+                    value = device_telemetry.read(param_name, max_age=max_age)
+                else:
                     # Call the device method to get the value
-                    method_name = param_config['method']
-                    method = getattr(driver, method_name, None)
-
-                    if method:
-                        # Call method with configured arguments
-                        args = param_config.get('args', {})
-                        value = method(**args)
-
-                        # Record the data point
-                        if value is not None:
-                            self.db.record_data_point(
-                                session_id=self.active_session_id,
-                                device_name=device_name,
-                                device_type=device_type,
-                                parameter=param_name,
-                                value=float(value),
-                                unit=param_config['unit']
-                            )
-                            self.total_data_points += 1
-
-                except Exception as e:
-                    # Silently ignore errors during polling (device might be disconnected)
-                    print(f"Error polling {device_name}.{param_name}: {e}")
-                    pass
+                    method = getattr(driver, param_config['method'], None)
+                    value = method(**param_config.get('args', {})) if method else None
+
+                # Queue the data point for this port's batch
+                if value is not None and self._should_record(device_name, param_name, float(value)):
+                    batch.append((
+                        session_id,
+                        datetime.now(),
+                        device_name,
+                        device_type,
+                        param_name,
+                        float(value),
+                        param_config['unit']
+                    ))
+
+            except Exception as e:
+                # Silently ignore errors during polling (device might be disconnected)
+                print(f"Error polling {device_name}.{param_name}: {e}")
+                pass
+
+        return batch
+
+    def _should_record(self, device_name: str, param_name: str, value: float) -> bool:
+        """Apply the parameter's deadband and heartbeat to a new reading"""
+        entry = self._schedule[(device_name, param_name)]
+        now = time.monotonic()
+
+        record = (
+            entry['last_value'] is None
+            or entry['deadband'] is None
+            or abs(value - entry['last_value']) > entry['deadband']
+            or (entry['heartbeat'] is not None and now - entry['last_recorded'] >= entry['heartbeat'])
+        )
+
+        if record:
+            entry['last_value'] = value
+            entry['last_recorded'] = now
+        else:
+            with self._stats_lock:
+                self.suppressed_points += 1
+
+        return record
 
     def get_session_status(self) -> Dict:
         """Get current session status and statistics"""
@@ -195,7 +576,10 @@ class DataLogger:
             'poll_count': self.poll_count,
             'data_points': db_data_points,
             'interval_seconds': self.interval_seconds,
-            'last_poll': self.last_poll_time.isoformat() if self.last_poll_time else None
+            'last_poll': self.last_poll_time.isoformat() if self.last_poll_time else None,
+            'last_cycle_ms': round(self.last_cycle_seconds * 1000, 1) if self.last_cycle_seconds is not None else None,
+            'missed_cycles': self.missed_cycles,
+            'suppressed_points': self.suppressed_points
         }
 
     def get_all_sessions(self) -> List[Dict]:
@@ -210,9 +594,48 @@ class DataLogger:
         """Get recent data points for live plotting"""
         return self.db.get_recent_data(session_id, minutes)
 
-    def export_session_to_csv(self, session_id: int, filepath: str):
-        """Export a session to CSV file"""
-        self.db.export_to_csv(session_id, filepath)
+    def get_live_snapshot(self, cursors: Optional[Dict[tuple, float]] = None,
+                          device_name: Optional[str] = None) -> List[Dict]:
+        """Get the active session's recent samples from memory (see RecentSamples.snapshot)"""
+        return self.recent.snapshot(cursors, device_name)
+
+    def get_latest_values(self) -> Dict[tuple, tuple]:
+        """Get the newest logged (timestamp, value, unit) of every series, keyed by (device_name, parameter)"""
+        return self.recent.latest()
+
+    def get_data_window(self, session_id: int, start=None, end=None, cursors: Optional[Dict[int, int]] = None,
+                        parameter: Optional[str] = None, monotonic: bool = False):
+        """Get data points between explicit epoch (or monotonic) bounds, optionally since per-series cursors"""
+        return self.db.get_data_window(session_id, start, end, cursors, parameter, monotonic)
+
+    def get_series_updates(self, session_id: int, cursors: Dict[int, int], minutes: float = 10) -> List[Dict]:
+        """Get points newer than each series' cursor for incremental live plotting"""
+        return self.db.get_series_updates(session_id, cursors, minutes)
+
+    def get_series_stats(self, session_id: int) -> List[Dict]:
+        """Get count, min, max and mean of every series in a session"""
+        return self.db.get_series_stats(session_id)
+
+    def get_rollup_data(self, session_id: int, resolution: str = '1m', start=None, end=None) -> List[Dict]:
+        """Get 1-minute or 1-hour aggregates of a session for overview plots"""
+        return self.db.get_rollup_data(session_id, resolution, start, end)
+
+    def get_downsampled_data(self, session_id: int, start=None, end=None, max_points: int = 2000,
+                             method: str = 'lttb') -> List[Dict]:
+        """Get at most max_points points per series for a time range (for plotting)"""
+        return self.db.get_downsampled_data(session_id, start, end, max_points, method)
+
+    def export_session_to_csv(self, session_id: int, filepath: str, compress: Optional[bool] = None,
+                              progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+        """Export a session to CSV file (gzip for .gz paths) and return the row count"""
+        return self.db.export_to_csv(session_id, filepath, compress=compress,
+                                     progress_callback=progress_callback)
+
+    def export_session_wide(self, session_id: int, filepath: str, align_seconds: Optional[float] = None,
+                            progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+        """Export a session as a wide Parquet/Arrow/NPZ table (format from the extension)"""
+        return self.db.export_wide(session_id, filepath, align_seconds=align_seconds,
+                                   progress_callback=progress_callback)
 
     def delete_session(self, session_id: int):
         """Delete a session and all its data"""
@@ -222,9 +645,28 @@ class DataLogger:
 
         self.db.delete_session(session_id)
 
-    def import_session_from_csv(self, filepath: str) -> int:
+    def archive_session(self, session_id: int) -> str:
+        """Move a stopped session's data to a compressed archive file and return its path"""
+        if session_id == self.active_session_id:
+            raise RuntimeError("Cannot archive active session. Stop it first.")
+
+        policy = self.retention.session_policy(self.db.get_session_info(session_id) or {})
+        return self.db.archive_session(session_id, policy['archive_dir'], policy['partition_dir'])
+
+    def restore_session(self, session_id: int):
+        """Bring an archived session's data back as a partition file"""
+        policy = self.retention.session_policy(self.db.get_session_info(session_id) or {})
+        self.db.restore_session(session_id, policy['partition_dir'])
+
+    def import_session_from_csv(self, filepath: str,
+                                progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
         """Import a session from CSV file"""
-        return self.db.import_from_csv(filepath)
+        return self.db.import_from_csv(filepath, progress_callback=progress_callback)
+
+    def import_sessions_from_csv(self, filepaths: List[str],
+                                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, object]:
+        """Import several CSV files concurrently; maps each path to its session ID or error"""
+        return self.db.import_many_from_csv(filepaths, progress_callback=progress_callback)
 
 
 # Global data logger instance
@@ -5,16 +5,259 @@ Handles SQLite database operations for logging sessions and data points
 
 import sqlite3
 import os
+import codecs
+import csv
+import io
+import gzip
+import heapq
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator, Callable
 import json
 
+# Schema versions (stored in PRAGMA user_version)
+#   0/1: data_points holds one TEXT-heavy row per sample with an ISO timestamp
+#   2:   samples reference a series dictionary and use epoch-microsecond timestamps
+#   3:   per-series counters and 1-minute/1-hour rollups maintained by the writer
+SCHEMA_VERSION = 3
+
+# Rollup tables by resolution, with their bucket width in microseconds
+ROLLUPS = {
+    '1m': ('rollup_1m', 60 * 1_000_000),
+    '1h': ('rollup_1h', 3600 * 1_000_000),
+}
+
+
+def _to_epoch_us(value) -> int:
+    """Convert a datetime, ISO timestamp string or epoch seconds to epoch microseconds"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        # Whole seconds and microseconds separately to avoid float rounding
+        return int(value.replace(microsecond=0).timestamp()) * 1_000_000 + value.microsecond
+    return int(round(value * 1_000_000))
+
+
+def _monotonic_to_epoch_us(value: float) -> int:
+    """Convert a time.monotonic() reading to epoch microseconds using the current clock offset"""
+    return int(round((time.time() - time.monotonic() + value) * 1_000_000))
+
+
+def _format_rows(rows: Iterable[Tuple]) -> List[Tuple]:
+    """
+    Convert (ts, device_name, parameter, value, unit) rows to timestamp strings
+
+    Rows arrive ordered by time, so the local-time conversion is only redone
+    when the whole second changes.
+    """
+    formatted = []
+    append = formatted.append
+    last_seconds = None
+    prefix = ''
+
+    for ts, device_name, parameter, value, unit in rows:
+        seconds, micros = divmod(ts, 1_000_000)
+        if seconds != last_seconds:
+            last_seconds = seconds
+            prefix = datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+        append((f"{prefix}.{micros:06d}" if micros else prefix, device_name, parameter, value, unit))
+
+    return formatted
+
+
+def _format_timestamps(timestamps: Iterable[int]) -> List[str]:
+    """Convert ordered epoch-microsecond timestamps to the strings _format_rows() produces"""
+    formatted = []
+    append = formatted.append
+    last_seconds = None
+    prefix = ''
+
+    for ts in timestamps:
+        seconds, micros = divmod(int(ts), 1_000_000)
+        if seconds != last_seconds:
+            last_seconds = seconds
+            prefix = datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+        append(f"{prefix}.{micros:06d}" if micros else prefix)
+
+    return formatted
+
+
+def _lttb(x, y, max_points: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each of max_points - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    point kept from the previous bucket and the mean of the next bucket.
+
+    Args:
+        x: NumPy array of timestamps (ascending)
+        y: NumPy array of values
+        max_points: Number of points to keep (at least 3)
+
+    Returns:
+        NumPy array of the indices kept
+    """
+    import numpy as np
+
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    # Mean of every bucket, computed up front; the last "next bucket" is the final point
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, x[-1])
+    mean_y = np.append(sums_y / counts, y[-1])
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        # Twice the triangle area; the constant factor doesn't change the argmax
+        areas = np.abs((ax - cx) * (y[start:stop] - ay) - (ax - x[start:stop]) * (cy - ay))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+def _minmax(x, y, max_points: int):
+    """
+    Min/max bucketing: keep the lowest and highest point of max_points // 2 equal-width time buckets
+
+    Args:
+        x: NumPy array of timestamps (ascending)
+        y: NumPy array of values
+        max_points: Upper bound on the number of points kept
+
+    Returns:
+        NumPy array of the indices kept, in time order
+    """
+    import numpy as np
+
+    n = len(x)
+    buckets = max(1, max_points // 2)
+    if n <= max_points:
+        return np.arange(n)
+
+    span = max(1, int(x[-1]) - int(x[0]))
+    bucket_ids = np.minimum((x - x[0]) * buckets // (span + 1), buckets - 1)
+
+    # Sort by bucket, then value: each bucket's first and last entries are its min and max
+    order = np.lexsort((y, bucket_ids))
+    sorted_ids = bucket_ids[order]
+    firsts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    lasts = np.r_[firsts[1:] - 1, n - 1]
+
+    return np.unique(np.concatenate([order[firsts], order[lasts]]))
+
+
+def _detect_encoding(filepath: str) -> str:
+    """Return 'utf-8-sig' if the whole file decodes as UTF-8, else 'cp1252' (older Windows exports)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with (gzip.open if filepath.endswith('.gz') else open)(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return 'cp1252'
+    return 'utf-8-sig'
+
+
+def _parse_csv_block(block: bytes, encoding: str) -> List[Tuple]:
+    """
+    Parse a block of whole CSV data lines into (ts, device_name, parameter, value, unit)
+
+    Module-level so it can run in a worker process. Timestamps are mostly
+    ordered, so the local-time conversion is only redone when the whole
+    second changes.
+    """
+    rows = []
+    append = rows.append
+    last_prefix = None
+    base = 0
+
+    for row in csv.reader(io.StringIO(block.decode(encoding), newline='')):
+        if not row:
+            continue
+        timestamp, device_name, parameter, value, unit = row
+        prefix = timestamp[:19]
+        fraction = timestamp[20:]
+        if len(timestamp) == 19 or (len(timestamp) > 20 and timestamp[19] == '.' and fraction.isdigit()):
+            if prefix != last_prefix:
+                last_prefix = prefix
+                base = int(datetime.fromisoformat(prefix).timestamp()) * 1_000_000
+            ts = base + (int(fraction[:6].ljust(6, '0')) if fraction else 0)
+        else:
+            ts = _to_epoch_us(timestamp)
+        append((ts, device_name, parameter, float(value), unit))
+
+    return rows
+
+
 class DatabaseManager:
     """Manages SQLite database for data logging"""
 
-    def __init__(self, db_path: str = "database/chemisuite.db"):
-        """Initialize database manager and create tables if needed"""
+    # Connection tuning applied to every connection
+    CACHE_SIZE_KB = 64 * 1024          # Page cache per connection
+    MMAP_SIZE = 256 * 1024 * 1024      # Memory-mapped I/O window
+    BUSY_TIMEOUT_MS = 5000             # How long to wait on a locked database
+
+    # CSV import
+    IMPORT_BLOCK_BYTES = 4 * 1024 * 1024          # Lines parsed and written per transaction
+    PARALLEL_PARSE_BYTES = 64 * 1024 * 1024       # Files this large are parsed in worker processes
+
+    def __init__(self, db_path: str = "database/chemisuite.db",
+                 flush_interval_ms: int = 500, max_batch_size: int = 5000):
+        """
+        Initialize database manager and create tables if needed
+
+        Args:
+            db_path: Path to the SQLite database file
+            flush_interval_ms: Maximum age of buffered data points before they are written
+            max_batch_size: Number of buffered data points that triggers an immediate write
+        """
         self.db_path = db_path
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch_size = max_batch_size
+
+        # Single writer connection, serialized by _write_lock
+        self._writer = None
+        self._write_lock = threading.Lock()
+
+        # One reader connection per thread so UI reads never queue behind writes
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+        # (session_id, device_name, parameter, unit) -> series id, owned by the writer
+        self._series_ids = {}
+
+        # Sessions moved to their own partition files: session_id -> path (None: hot database)
+        self._partition_paths = {}
+        # Read-only partition connections: path -> {thread id: connection}
+        self._partition_readers = {}
+
+        # In-memory buffer for data points
+        self._buffer_lock = threading.Lock()
+        self._pending_points = []
+        self._flush_event = threading.Event()
+        self._flush_stop = threading.Event()
+        self._flush_thread = None
 
         # Ensure database directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -22,152 +265,790 @@ class DatabaseManager:
         # Initialize database schema
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the ChemiSuite pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               timeout=self.BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        """Return the persistent connection used for all writes"""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+
+    def _get_reader(self) -> sqlite3.Connection:
+        """Return the calling thread's reader connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def _partition_path(self, session_id: int) -> Optional[str]:
+        """Return the partition file holding a session's data, or None if it is in the hot database"""
+        if session_id not in self._partition_paths:
+            row = self._get_reader().execute("SELECT metadata FROM logging_sessions WHERE id = ?",
+                                             (session_id,)).fetchone()
+            partition = json.loads(row[0]).get('partition') if row and row[0] else None
+            self._partition_paths[session_id] = partition['path'] if partition else None
+        return self._partition_paths[session_id]
+
+    def _reader_for(self, session_id: int) -> sqlite3.Connection:
+        """
+        Route a session's reads to the database that holds its data
+
+        Sessions in the hot database use the thread's reader; partitioned
+        sessions get a per-thread read-only connection to their own file,
+        which has the same schema, so every query runs unchanged.
+        """
+        path = self._partition_path(session_id)
+        if path is None:
+            return self._get_reader()
+
+        thread_id = threading.get_ident()
+        with self._readers_lock:
+            conn = self._partition_readers.setdefault(path, {}).get(thread_id)
+            if conn is None:
+                conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True,
+                                       check_same_thread=False, timeout=self.BUSY_TIMEOUT_MS / 1000)
+                conn.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KB}")
+                conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+                self._partition_readers[path][thread_id] = conn
+        return conn
+
+    def _forget_partition(self, session_id: int):
+        """Close reader connections to a session's partition file and drop it from the routing cache"""
+        path = self._partition_paths.pop(session_id, None)
+        if path is None:
+            return
+        with self._readers_lock:
+            for conn in self._partition_readers.pop(path, {}).values():
+                conn.close()
+
+    @contextmanager
+    def _write_transaction(self):
+        """Run a block on the writer connection inside one transaction"""
+        with self._write_lock:
+            conn = self._get_writer()
+            with conn:
+                yield conn
+
     def _init_database(self):
-        """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Create tables if they don't exist and migrate older schemas"""
+        with self._write_transaction() as conn:
+            # Incremental auto-vacuum lets freed pages be returned to the OS a
+            # few at a time (see incremental_vacuum); it only takes effect
+            # here for a new file, existing files are converted below
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
-        # Create logging_sessions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS logging_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                start_time DATETIME NOT NULL,
-                end_time DATETIME,
-                interval_seconds INTEGER NOT NULL,
-                status TEXT NOT NULL,
-                metadata TEXT
-            )
-        """)
+            # WAL lets readers run concurrently with the writer; the setting
+            # is stored in the database file
+            conn.execute("PRAGMA journal_mode = WAL")
 
-        # Create data_points table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS data_points (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cursor = conn.cursor()
+
+            # Create logging_sessions table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS logging_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    start_time DATETIME NOT NULL,
+                    end_time DATETIME,
+                    interval_seconds INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    metadata TEXT
+                )
+            """)
+
+        version = self._get_writer().execute("PRAGMA user_version").fetchone()[0]
+        if self._has_legacy_data_points():
+            self._migrate_legacy_data_points()
+
+        with self._write_transaction() as conn:
+            self._create_data_tables(conn)
+            if version < 3 and conn.execute("SELECT 1 FROM data_points LIMIT 1").fetchone():
+                # Rollups start empty; build them once from the samples already stored
+                print("Building data point rollups...")
+                self._rebuild_rollups(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        with self._write_lock:
+            conn = self._get_writer()
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # A full VACUUM is the only way to switch an existing file over
+                print("Enabling incremental vacuum (one-off VACUUM)...")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+
+    def _create_data_tables(self, conn: sqlite3.Connection):
+        """Create the series dictionary and the compact data_points table"""
+        # One row per logged (session, device, parameter, unit) combination
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS series (
+                id INTEGER PRIMARY KEY,
                 session_id INTEGER NOT NULL,
-                timestamp DATETIME NOT NULL,
                 device_name TEXT NOT NULL,
                 device_type TEXT NOT NULL,
                 parameter TEXT NOT NULL,
-                value REAL,
-                unit TEXT,
-                FOREIGN KEY(session_id) REFERENCES logging_sessions(id)
+                unit TEXT NOT NULL DEFAULT '',
+                FOREIGN KEY(session_id) REFERENCES logging_sessions(id),
+                UNIQUE(session_id, device_name, parameter, unit)
             )
         """)
 
-        # Create index for faster queries
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_session_time
-            ON data_points(session_id, timestamp)
+        # Samples clustered by series and time; ts is epoch microseconds
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS data_points (
+                series_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                value REAL,
+                PRIMARY KEY(series_id, ts),
+                FOREIGN KEY(series_id) REFERENCES series(id)
+            ) WITHOUT ROWID
         """)
 
-        conn.commit()
-        conn.close()
+        # Running totals per series, so counts and overall min/max/mean never scan samples
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS series_stats (
+                series_id INTEGER PRIMARY KEY,
+                count INTEGER NOT NULL,
+                sum REAL NOT NULL,
+                min REAL,
+                max REAL,
+                first_ts INTEGER,
+                last_ts INTEGER,
+                FOREIGN KEY(series_id) REFERENCES series(id)
+            )
+        """)
 
-    def create_session(self, name: str, interval_seconds: int, metadata: Dict = None) -> int:
-        """Create a new logging session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Per-series aggregates over fixed time buckets (bucket start in epoch microseconds)
+        for table, _ in ROLLUPS.values():
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    series_id INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    sum REAL NOT NULL,
+                    min REAL,
+                    max REAL,
+                    PRIMARY KEY(series_id, bucket),
+                    FOREIGN KEY(series_id) REFERENCES series(id)
+                ) WITHOUT ROWID
+            """)
 
-        cursor.execute("""
-            INSERT INTO logging_sessions (name, start_time, interval_seconds, status, metadata)
-            VALUES (?, ?, ?, ?, ?)
-        """, (name, datetime.now(), interval_seconds, 'running', json.dumps(metadata or {})))
+    def _update_rollups(self, conn: sqlite3.Connection, points: Iterable[Tuple]):
+        """
+        Fold newly written samples into series_stats and the rollup tables
 
-        session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        The batch is aggregated in memory first, so each touched series and
+        bucket costs one upsert. Call inside the transaction that wrote the
+        samples. A sample that replaces one with the same series and
+        timestamp is counted again; rebuild_rollups() recomputes exact
+        figures from the samples.
 
-        return session_id
+        Args:
+            points: (series_id, ts, value) tuples
+        """
+        # Aggregate the batch into the finest buckets, then fold those into
+        # the coarser buckets and the per-series totals
+        resolutions = sorted(ROLLUPS.items(), key=lambda item: item[1][1])
+        finest_width = resolutions[0][1][1]
 
-    def update_session_status(self, session_id: int, status: str):
-        """Update session status (running, paused, stopped)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        finest = {}
+        for series_id, ts, value in points:
+            if value is None:
+                continue
+            key = (series_id, ts - ts % finest_width)
+            bucket = finest.get(key)
+            if bucket is None:
+                finest[key] = [1, value, value, value, ts, ts]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                if value < bucket[2]:
+                    bucket[2] = value
+                elif value > bucket[3]:
+                    bucket[3] = value
+                if ts < bucket[4]:
+                    bucket[4] = ts
+                elif ts > bucket[5]:
+                    bucket[5] = ts
 
-        cursor.execute("""
-            UPDATE logging_sessions
-            SET status = ?
-            WHERE id = ?
-        """, (status, session_id))
+        if not finest:
+            return
 
-        # If stopping, set end_time
-        if status == 'stopped':
-            cursor.execute("""
+        def fold(buckets, key_of):
+            folded = {}
+            for key, (count, total, minimum, maximum, first_ts, last_ts) in buckets.items():
+                key = key_of(key)
+                target = folded.get(key)
+                if target is None:
+                    folded[key] = [count, total, minimum, maximum, first_ts, last_ts]
+                else:
+                    target[0] += count
+                    target[1] += total
+                    target[2] = min(target[2], minimum)
+                    target[3] = max(target[3], maximum)
+                    target[4] = min(target[4], first_ts)
+                    target[5] = max(target[5], last_ts)
+            return folded
+
+        for resolution, (table, width) in resolutions:
+            buckets = finest if width == finest_width else fold(finest, lambda key: (key[0], key[1] - key[1] % width))
+            conn.executemany(f"""
+                INSERT INTO {table} (series_id, bucket, count, sum, min, max)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(series_id, bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    sum = sum + excluded.sum,
+                    min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max)
+            """, [(*key, *bucket[:4]) for key, bucket in buckets.items()])
+
+        stats = fold(finest, itemgetter(0))
+        conn.executemany("""
+            INSERT INTO series_stats (series_id, count, sum, min, max, first_ts, last_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(series_id) DO UPDATE SET
+                count = count + excluded.count,
+                sum = sum + excluded.sum,
+                min = MIN(min, excluded.min),
+                max = MAX(max, excluded.max),
+                first_ts = MIN(first_ts, excluded.first_ts),
+                last_ts = MAX(last_ts, excluded.last_ts)
+        """, [(series_id, *entry) for series_id, entry in stats.items()])
+
+    def _rebuild_rollups(self, conn: sqlite3.Connection, session_id: Optional[int] = None):
+        """
+        Recompute series_stats and the rollup tables from data_points (one session or all)
+
+        Only the finest rollup is computed from the samples; coarser rollups
+        and the counters are folded from it, and first/last timestamps are
+        primary-key lookups.
+        """
+        if session_id is None:
+            where, params = "", ()
+        else:
+            where, params = "WHERE series_id IN (SELECT id FROM series WHERE session_id = ?)", (session_id,)
+
+        source = None
+        for table, width in sorted(ROLLUPS.values(), key=itemgetter(1)):
+            conn.execute(f"DELETE FROM {table} {where}", params)
+            if source is None:
+                conn.execute(f"""
+                    INSERT INTO {table} (series_id, bucket, count, sum, min, max)
+                    SELECT series_id, ts - ts % {width}, COUNT(value), TOTAL(value), MIN(value), MAX(value)
+                    FROM data_points {where}
+                    GROUP BY series_id, ts - ts % {width}
+                    HAVING COUNT(value) > 0
+                """, params)
+            else:
+                conn.execute(f"""
+                    INSERT INTO {table} (series_id, bucket, count, sum, min, max)
+                    SELECT series_id, bucket - bucket % {width}, SUM(count), SUM(sum), MIN(min), MAX(max)
+                    FROM {source} {where}
+                    GROUP BY series_id, bucket - bucket % {width}
+                """, params)
+            source = table
+
+        conn.execute(f"DELETE FROM series_stats {where}", params)
+        conn.execute(f"""
+            INSERT INTO series_stats (series_id, count, sum, min, max, first_ts, last_ts)
+            SELECT series_id, SUM(count), SUM(sum), MIN(min), MAX(max),
+                   (SELECT MIN(ts) FROM data_points d WHERE d.series_id = r.series_id),
+                   (SELECT MAX(ts) FROM data_points d WHERE d.series_id = r.series_id)
+            FROM {source} r {where}
+            GROUP BY series_id
+        """, params)
+
+    def rebuild_rollups(self, session_id: Optional[int] = None):
+        """
+        Recompute counters and rollups from the stored samples
+
+        Args:
+            session_id: Session to rebuild (default: all sessions)
+        """
+        if session_id is not None and self._partition_path(session_id) is not None:
+            partition = DatabaseManager(self._partition_path(session_id))
+            try:
+                partition.rebuild_rollups(session_id)
+            finally:
+                partition.close()
+            return
+
+        self.flush()
+        with self._write_transaction() as conn:
+            self._rebuild_rollups(conn, session_id)
+
+    def _has_legacy_data_points(self) -> bool:
+        """Check whether data_points still uses the original row-per-sample layout"""
+        conn = self._get_writer()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(data_points)")]
+        return 'device_name' in columns
+
+    def _migrate_legacy_data_points(self, chunk_size: int = 10000):
+        """
+        Convert a legacy data_points table to the series/epoch layout in place
+
+        The conversion runs in one transaction, so an interrupted migration
+        leaves the original table untouched. The file is vacuumed afterwards
+        to release the space held by the old rows.
+        """
+        print("Migrating data_points to the compact series schema...")
+
+        with self._write_lock:
+            conn = self._get_writer()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DROP INDEX IF EXISTS idx_session_time")
+                conn.execute("ALTER TABLE data_points RENAME TO data_points_legacy")
+                self._create_data_tables(conn)
+
+                # Build the series dictionary from the distinct combinations
+                conn.execute("""
+                    INSERT OR IGNORE INTO series (session_id, device_name, device_type, parameter, unit)
+                    SELECT session_id, device_name, MIN(device_type), parameter, COALESCE(unit, '')
+                    FROM data_points_legacy
+                    GROUP BY session_id, device_name, parameter, COALESCE(unit, '')
+                """)
+                series_ids = {
+                    (session_id, device_name, parameter, unit): series_id
+                    for series_id, session_id, device_name, parameter, unit in conn.execute(
+                        "SELECT id, session_id, device_name, parameter, unit FROM series"
+                    )
+                }
+
+                # Copy the samples across in chunks, converting timestamps
+                source = conn.cursor()
+                source.execute("""
+                    SELECT session_id, device_name, parameter, COALESCE(unit, ''), timestamp, value
+                    FROM data_points_legacy
+                    ORDER BY id
+                """)
+                migrated = 0
+                while True:
+                    rows = source.fetchmany(chunk_size)
+                    if not rows:
+                        break
+
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO data_points (series_id, ts, value)
+                        VALUES (?, ?, ?)
+                    """, [
+                        (series_ids[(session_id, device_name, parameter, unit)], _to_epoch_us(timestamp), value)
+                        for session_id, device_name, parameter, unit, timestamp, value in rows
+                    ])
+                    migrated += len(rows)
+
+                conn.execute("DROP TABLE data_points_legacy")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            # Reclaim the space freed by the legacy table
+            conn.execute("VACUUM")
+
+        print(f"Migrated {migrated} data points")
+
+    def create_session(self, name: str, interval_seconds: int, metadata: Dict = None) -> int:
+        """Create a new logging session"""
+        with self._write_transaction() as conn:
+            cursor = conn.execute("""
+                INSERT INTO logging_sessions (name, start_time, interval_seconds, status, metadata)
+                VALUES (?, ?, ?, ?, ?)
+            """, (name, datetime.now(), interval_seconds, 'running', json.dumps(metadata or {})))
+
+            return cursor.lastrowid
+
+    def update_session_status(self, session_id: int, status: str):
+        """Update session status (running, paused, stopped)"""
+        with self._write_transaction() as conn:
+            conn.execute("""
                 UPDATE logging_sessions
-                SET end_time = ?
+                SET status = ?
                 WHERE id = ?
-            """, (datetime.now(), session_id))
+            """, (status, session_id))
 
-        conn.commit()
-        conn.close()
+            # If stopping, set end_time
+            if status == 'stopped':
+                conn.execute("""
+                    UPDATE logging_sessions
+                    SET end_time = ?
+                    WHERE id = ?
+                """, (datetime.now(), session_id))
 
     def record_data_point(self, session_id: int, device_name: str, device_type: str,
                          parameter: str, value: float, unit: str):
-        """Record a single data point"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Record a single data point (buffered, see record_data_points)"""
+        self.record_data_points([
+            (session_id, datetime.now(), device_name, device_type, parameter, value, unit)
+        ])
 
-        cursor.execute("""
-            INSERT INTO data_points (session_id, timestamp, device_name, device_type, parameter, value, unit)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (session_id, datetime.now(), device_name, device_type, parameter, value, unit))
+    def record_data_points(self, points: Iterable[Tuple]):
+        """
+        Buffer a batch of data points for writing
 
-        conn.commit()
-        conn.close()
+        Points are held in memory and written by a background thread in a
+        single transaction every flush_interval_ms, or sooner once
+        max_batch_size points are pending. The caller never waits on disk I/O.
+        Call flush() to force pending points to disk.
+
+        Args:
+            points: Iterable of (session_id, timestamp, device_name, device_type,
+                    parameter, value, unit) tuples. The timestamp may be a datetime
+                    or epoch seconds; None means now. Points without a session
+                    are dropped.
+        """
+        now = _to_epoch_us(datetime.now())
+        rows = [
+            (session_id, _to_epoch_us(timestamp) if timestamp is not None else now,
+             device_name, device_type, parameter, value, unit)
+            for session_id, timestamp, device_name, device_type, parameter, value, unit in points
+            if session_id is not None
+        ]
+        if not rows:
+            return
+
+        with self._buffer_lock:
+            self._pending_points.extend(rows)
+            pending = len(self._pending_points)
+
+            if self._flush_thread is None or not self._flush_thread.is_alive():
+                self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True,
+                                                      name="DatabaseManager-Writer")
+                self._flush_thread.start()
+
+        if pending >= self.max_batch_size:
+            self._flush_event.set()
+
+    def _flush_loop(self):
+        """Background thread that writes buffered data points periodically until close()"""
+        while not self._flush_stop.is_set():
+            self._flush_event.wait(timeout=self.flush_interval_ms / 1000)
+            self._flush_event.clear()
+
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error writing data points: {e}")
+
+    def flush(self) -> int:
+        """
+        Write all buffered data points in one transaction
+
+        Blocks until any write already in progress has committed, so data
+        recorded before the call is durable once it returns. If the write
+        fails, the points go back to the buffer for the next flush.
+
+        Returns:
+            Number of data points written
+        """
+        with self._write_lock:
+            with self._buffer_lock:
+                batch = self._pending_points
+                self._pending_points = []
+
+            if not batch:
+                return 0
+
+            known_series = len(self._series_ids)
+            conn = self._get_writer()
+            try:
+                with conn:
+                    points = [
+                        (self._get_series_id(conn, session_id, device_name, device_type, parameter, unit), ts, value)
+                        for session_id, ts, device_name, device_type, parameter, value, unit in batch
+                    ]
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO data_points (series_id, ts, value)
+                        VALUES (?, ?, ?)
+                    """, points)
+                    self._update_rollups(conn, points)
+            except Exception:
+                # Series created in the rolled-back transaction don't exist
+                for key in list(self._series_ids)[known_series:]:
+                    del self._series_ids[key]
+                with self._buffer_lock:
+                    self._pending_points[:0] = batch
+                raise
+
+        return len(batch)
+
+    def _get_series_id(self, conn: sqlite3.Connection, session_id: int, device_name: str,
+                       device_type: str, parameter: str, unit: Optional[str]) -> int:
+        """Look up (or create) the series id for a data point; call with the writer lock held"""
+        unit = unit or ''
+        key = (session_id, device_name, parameter, unit)
+        series_id = self._series_ids.get(key)
+
+        if series_id is None:
+            conn.execute("""
+                INSERT OR IGNORE INTO series (session_id, device_name, device_type, parameter, unit)
+                VALUES (?, ?, ?, ?, ?)
+            """, (session_id, device_name, device_type, parameter, unit))
+            series_id = conn.execute("""
+                SELECT id FROM series
+                WHERE session_id = ? AND device_name = ? AND parameter = ? AND unit = ?
+            """, key).fetchone()[0]
+            self._series_ids[key] = series_id
+
+        return series_id
+
+    def close(self):
+        """Stop the writer thread, flush buffered data points and close all connections"""
+        self._flush_stop.set()
+        self._flush_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5.0)
+            self._flush_thread = None
+        self.flush()
+
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+            for conns in self._partition_readers.values():
+                for conn in conns.values():
+                    conn.close()
+            self._partition_readers = {}
+        self._local = threading.local()
 
     def get_session_data(self, session_id: int, parameter: Optional[str] = None) -> List[Tuple]:
         """Get all data points for a session, optionally filtered by parameter"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._reader_for(session_id).cursor()
 
         if parameter:
             cursor.execute("""
-                SELECT timestamp, device_name, parameter, value, unit
-                FROM data_points
-                WHERE session_id = ? AND parameter = ?
-                ORDER BY timestamp
+                SELECT d.ts, s.device_name, s.parameter, d.value, s.unit
+                FROM series s
+                JOIN data_points d ON d.series_id = s.id
+                WHERE s.session_id = ? AND s.parameter = ?
+                ORDER BY d.ts, s.id
             """, (session_id, parameter))
         else:
             cursor.execute("""
-                SELECT timestamp, device_name, parameter, value, unit
-                FROM data_points
-                WHERE session_id = ?
-                ORDER BY timestamp
+                SELECT d.ts, s.device_name, s.parameter, d.value, s.unit
+                FROM series s
+                JOIN data_points d ON d.series_id = s.id
+                WHERE s.session_id = ?
+                ORDER BY d.ts, s.id
             """, (session_id,))
 
-        data = cursor.fetchall()
-        conn.close()
-
-        return data
+        return _format_rows(cursor.fetchall())
 
     def get_recent_data(self, session_id: int, minutes: int = 10) -> List[Tuple]:
         """Get data points from the last N minutes"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self.get_data_window(session_id, start=time.time() - minutes * 60)
 
-        cursor.execute("""
-            SELECT timestamp, device_name, parameter, value, unit
-            FROM data_points
-            WHERE session_id = ?
-            AND timestamp >= datetime('now', '-' || ? || ' minutes')
-            ORDER BY timestamp
-        """, (session_id, minutes))
-
-        data = cursor.fetchall()
-        conn.close()
+    def get_data_window(self, session_id: int, start=None, end=None, cursors: Optional[Dict[int, int]] = None,
+                        parameter: Optional[str] = None, monotonic: bool = False) -> List[Tuple]:
+        """
+        Get a session's data points in the half-open time window [start, end)
+
+        The bounds are converted to epoch microseconds once and bound as
+        parameters, so each series is read as a pure primary-key range scan;
+        the per-series results are merged by timestamp instead of being
+        sorted by SQLite.
+
+        Passing a cursors dictionary turns this into a "since last seen"
+        read for live consumers: each series starts after its cursor (or at
+        start if it has none) and the cursors are advanced in place to the
+        newest timestamp returned.
+
+        Args:
+            session_id: Session to read
+            start: Window start as a datetime, ISO string or epoch seconds
+                (time.monotonic() seconds if monotonic is set); None for the
+                beginning of the session
+            end: Window end (exclusive), same types as start; None for no limit
+            cursors: Optional series_id -> last epoch-microsecond timestamp seen
+            parameter: Optional parameter name to filter on
+            monotonic: Interpret numeric start/end as time.monotonic() readings
+
+        Returns:
+            List of (timestamp, device_name, parameter, value, unit) rows in
+            time order, like get_session_data()
+        """
+        def bound(value):
+            if value is None:
+                return None
+            if monotonic and isinstance(value, (int, float)):
+                return _monotonic_to_epoch_us(value)
+            return _to_epoch_us(value)
+
+        start_us, end_us = bound(start), bound(end)
+        conn = self._reader_for(session_id)
+
+        query = "SELECT id, device_name, parameter, unit FROM series WHERE session_id = ?"
+        params = [session_id]
+        if parameter:
+            query += " AND parameter = ?"
+            params.append(parameter)
+
+        per_series = []
+        for series_id, device_name, param_name, unit in conn.execute(query + " ORDER BY id", params):
+            after = cursors.get(series_id) if cursors is not None else None
+            if after is not None:
+                where, args = "ts > ?", [series_id, after]
+                if start_us is not None and start_us > after:
+                    where, args = "ts >= ?", [series_id, start_us]
+            else:
+                where, args = "ts >= ?", [series_id, start_us if start_us is not None else -2 ** 63]
+            if end_us is not None:
+                where += " AND ts < ?"
+                args.append(end_us)
+
+            rows = conn.execute(f"SELECT ts, value FROM data_points WHERE series_id = ? AND {where} ORDER BY ts",
+                                args).fetchall()
+            if not rows:
+                continue
+            if cursors is not None:
+                cursors[series_id] = rows[-1][0]
+            per_series.append([(ts, device_name, param_name, value, unit) for ts, value in rows])
+
+        # Ties on ts keep series order, matching ORDER BY d.ts, s.id
+        return _format_rows(heapq.merge(*per_series, key=itemgetter(0)))
+
+    def get_series_updates(self, session_id: int, cursors: Dict[int, int],
+                           minutes: float = 10) -> List[Dict]:
+        """
+        Get each series' data points newer than the caller's last-seen timestamp
+
+        Every series is read as a primary-key range scan starting after its
+        cursor, so a live consumer polling this pays only for points it has
+        not seen yet. Series without a cursor start at the beginning of the
+        window. Cursors are advanced in place.
+
+        Args:
+            session_id: Session to read
+            cursors: series_id -> last epoch-microsecond timestamp already seen
+            minutes: Window for series the caller has not seen yet
+
+        Returns:
+            List of dictionaries with series_id, device_name, parameter, unit,
+            timestamps (formatted like get_recent_data) and values, for series
+            with new points
+        """
+        conn = self._reader_for(session_id)
+        window_start = _to_epoch_us(datetime.now()) - int(minutes * 60 * 1_000_000)
+
+        series = conn.execute("""
+            SELECT id, device_name, parameter, unit FROM series WHERE session_id = ? ORDER BY id
+        """, (session_id,)).fetchall()
+
+        updates = []
+        for series_id, device_name, parameter, unit in series:
+            after = cursors.get(series_id, window_start - 1)
+            rows = conn.execute("""
+                SELECT ts, value FROM data_points WHERE series_id = ? AND ts > ? ORDER BY ts
+            """, (series_id, after)).fetchall()
+            if not rows:
+                continue
+
+            cursors[series_id] = rows[-1][0]
+            updates.append({
+                'series_id': series_id,
+                'device_name': device_name,
+                'parameter': parameter,
+                'unit': unit,
+                'timestamps': _format_timestamps(row[0] for row in rows),
+                'values': [row[1] for row in rows],
+            })
+
+        return updates
+
+    # Downsampling methods for get_downsampled_data()
+    DOWNSAMPLERS = {'lttb': _lttb, 'minmax': _minmax}
+
+    def get_downsampled_data(self, session_id: int, start=None, end=None, max_points: int = 2000,
+                             method: str = 'lttb', parameter: Optional[str] = None) -> List[Dict]:
+        """
+        Get a session's series reduced to at most max_points points each
+
+        Each series is read as one primary-key range scan for [start, end]
+        and reduced with NumPy, so plotting a long session (or a zoomed-in
+        slice of it) sends a bounded number of points per trace.
+
+        Args:
+            session_id: Session to read
+            start: Range start as datetime, timestamp string or epoch seconds (default: session start)
+            end: Range end, same types (default: session end)
+            max_points: Maximum points returned per series
+            method: 'lttb' (shape-preserving) or 'minmax' (keeps every spike)
+            parameter: Optional parameter name to filter on
+
+        Returns:
+            List of dictionaries with series_id, device_name, parameter, unit,
+            timestamps, values and raw_points (non-NULL points in the range
+            before downsampling)
+        """
+        import numpy as np
+
+        downsample = self.DOWNSAMPLERS[method]
+        start_us = _to_epoch_us(start) if start is not None else -2 ** 63
+        end_us = _to_epoch_us(end) if end is not None else 2 ** 63 - 1
 
-        return data
+        conn = self._reader_for(session_id)
+        query = "SELECT id, device_name, parameter, unit FROM series WHERE session_id = ?"
+        params = [session_id]
+        if parameter:
+            query += " AND parameter = ?"
+            params.append(parameter)
+        series = conn.execute(query + " ORDER BY id", params).fetchall()
+
+        result = []
+        for series_id, device_name, param_name, unit in series:
+            # NULL values (failed reads) can't be plotted or fed to NumPy
+            rows = conn.execute("""
+                SELECT ts, value FROM data_points
+                WHERE series_id = ? AND ts BETWEEN ? AND ? AND value IS NOT NULL
+                ORDER BY ts
+            """, (series_id, start_us, end_us)).fetchall()
+            if not rows:
+                continue
+
+            ts = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+            kept = downsample(ts, values, max_points)
+
+            result.append({
+                'series_id': series_id,
+                'device_name': device_name,
+                'parameter': param_name,
+                'unit': unit,
+                'timestamps': _format_timestamps(ts[kept]),
+                'values': values[kept].tolist(),
+                'raw_points': len(rows),
+            })
+
+        return result
 
     def get_all_sessions(self) -> List[Dict]:
         """Get all logging sessions"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._get_reader().cursor()
 
         cursor.execute("""
-            SELECT id, name, start_time, end_time, interval_seconds, status, metadata
-            FROM logging_sessions
-            ORDER BY start_time DESC
+            SELECT l.id, l.name, l.start_time, l.end_time, l.interval_seconds, l.status, l.metadata,
+                   (SELECT COALESCE(SUM(st.count), 0)
+                    FROM series s JOIN series_stats st ON st.series_id = s.id
+                    WHERE s.session_id = l.id)
+            FROM logging_sessions l
+            ORDER BY l.start_time DESC
         """)
 
         sessions = []
@@ -179,16 +1060,19 @@ class DatabaseManager:
                 'end_time': row[3],
                 'interval_seconds': row[4],
                 'status': row[5],
-                'metadata': json.loads(row[6]) if row[6] else {}
+                'metadata': json.loads(row[6]) if row[6] else {},
+                'data_points': row[7]
             })
+            # Partitioned and archived sessions keep their count in the metadata
+            moved = sessions[-1]['metadata'].get('partition') or sessions[-1]['metadata'].get('archive')
+            if moved:
+                sessions[-1]['data_points'] = moved.get('data_points', 0)
 
-        conn.close()
         return sessions
 
     def get_session_info(self, session_id: int) -> Optional[Dict]:
         """Get information about a specific session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._get_reader().cursor()
 
         cursor.execute("""
             SELECT id, name, start_time, end_time, interval_seconds, status, metadata
@@ -197,7 +1081,6 @@ class DatabaseManager:
         """, (session_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return {
@@ -212,41 +1095,508 @@ class DatabaseManager:
         return None
 
     def get_data_point_count(self, session_id: int) -> int:
-        """Get the number of data points in a session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Get the number of data points in a session (from the per-series counters)"""
+        cursor = self._reader_for(session_id).cursor()
 
         cursor.execute("""
-            SELECT COUNT(*) FROM data_points WHERE session_id = ?
+            SELECT COALESCE(SUM(st.count), 0)
+            FROM series s
+            JOIN series_stats st ON st.series_id = s.id
+            WHERE s.session_id = ?
         """, (session_id,))
 
-        count = cursor.fetchone()[0]
-        conn.close()
+        return cursor.fetchone()[0]
+
+    def get_series_stats(self, session_id: int) -> List[Dict]:
+        """
+        Get count, min, max and mean of every series in a session
+
+        Args:
+            session_id: Session to summarize
+
+        Returns:
+            List of dictionaries with device_name, parameter, unit, count,
+            min, max, mean, first_time and last_time
+        """
+        cursor = self._reader_for(session_id).cursor()
 
-        return count
+        cursor.execute("""
+            SELECT s.device_name, s.parameter, s.unit, st.count, st.sum, st.min, st.max, st.first_ts, st.last_ts
+            FROM series s
+            JOIN series_stats st ON st.series_id = s.id
+            WHERE s.session_id = ?
+            ORDER BY s.id
+        """, (session_id,))
+
+        stats = []
+        for device_name, parameter, unit, count, total, minimum, maximum, first_ts, last_ts in cursor.fetchall():
+            first_time, last_time = _format_timestamps([first_ts, last_ts])
+            stats.append({
+                'device_name': device_name,
+                'parameter': parameter,
+                'unit': unit,
+                'count': count,
+                'min': minimum,
+                'max': maximum,
+                'mean': total / count if count else None,
+                'first_time': first_time,
+                'last_time': last_time,
+            })
 
-    def delete_session(self, session_id: int):
-        """Delete a session and all its data points"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return stats
 
-        # Delete data points first (foreign key constraint)
-        cursor.execute("DELETE FROM data_points WHERE session_id = ?", (session_id,))
+    def get_rollup_data(self, session_id: int, resolution: str = '1m', start=None, end=None,
+                        parameter: Optional[str] = None) -> List[Dict]:
+        """
+        Get per-bucket aggregates of a session's series from the rollup tables
 
-        # Delete session
-        cursor.execute("DELETE FROM logging_sessions WHERE id = ?", (session_id,))
+        Reads one row per series and bucket instead of every sample, for
+        overview plots of long sessions.
+
+        Args:
+            session_id: Session to read
+            resolution: '1m' or '1h'
+            start: Range start as datetime, timestamp string or epoch seconds (default: all)
+            end: Range end, same types (default: all)
+            parameter: Optional parameter name to filter on
+
+        Returns:
+            List of dictionaries with device_name, parameter, unit and
+            timestamps (bucket starts), count, mean, min and max lists
+        """
+        table, _ = ROLLUPS[resolution]
+        start_us = _to_epoch_us(start) if start is not None else -2 ** 63
+        end_us = _to_epoch_us(end) if end is not None else 2 ** 63 - 1
+
+        conn = self._reader_for(session_id)
+        query = "SELECT id, device_name, parameter, unit FROM series WHERE session_id = ?"
+        params = [session_id]
+        if parameter:
+            query += " AND parameter = ?"
+            params.append(parameter)
+        series = conn.execute(query + " ORDER BY id", params).fetchall()
+
+        result = []
+        for series_id, device_name, param_name, unit in series:
+            rows = conn.execute(f"""
+                SELECT bucket, count, sum, min, max FROM {table}
+                WHERE series_id = ? AND bucket BETWEEN ? AND ?
+                ORDER BY bucket
+            """, (series_id, start_us, end_us)).fetchall()
+            if not rows:
+                continue
+
+            result.append({
+                'device_name': device_name,
+                'parameter': param_name,
+                'unit': unit,
+                'timestamps': _format_timestamps(row[0] for row in rows),
+                'count': [row[1] for row in rows],
+                'mean': [row[2] / row[1] for row in rows],
+                'min': [row[3] for row in rows],
+                'max': [row[4] for row in rows],
+            })
+
+        return result
+
+    def delete_session(self, session_id: int, chunk_size: int = 20000):
+        """
+        Delete a session and all its data points
+
+        Rows are deleted in chunks of chunk_size, each in its own short
+        transaction, so the logger's writes keep flowing while a large
+        session is removed. Partition and archive files of the session
+        are removed with it.
+        """
+        info = self.get_session_info(session_id)
+        self._update_session_row(session_id, status='deleting')
+        self._delete_session_data(session_id, chunk_size)
+
+        self._forget_partition(session_id)
+        for key in ('partition', 'archive'):
+            moved = info['metadata'].get(key) if info else None
+            if moved:
+                for path in (moved['path'], moved['path'] + '-wal', moved['path'] + '-shm'):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        with self._write_transaction() as conn:
+            conn.execute("DELETE FROM logging_sessions WHERE id = ?", (session_id,))
+
+    def _delete_session_data(self, session_id: int, chunk_size: int = 20000):
+        """Delete a session's samples, rollups and series in chunks, keeping its session row"""
+        series_ids = [row[0] for row in self._get_reader().execute(
+            "SELECT id FROM series WHERE session_id = ?", (session_id,))]
+
+        for series_id in series_ids:
+            self._delete_series_rows('data_points', 'ts', series_id, chunk_size)
+            for table, _ in ROLLUPS.values():
+                self._delete_series_rows(table, 'bucket', series_id, chunk_size)
+
+        with self._write_transaction() as conn:
+            conn.execute("""
+                DELETE FROM series_stats
+                WHERE series_id IN (SELECT id FROM series WHERE session_id = ?)
+            """, (session_id,))
+            conn.execute("DELETE FROM series WHERE session_id = ?", (session_id,))
+
+            self._series_ids = {key: series_id for key, series_id in self._series_ids.items()
+                                if key[0] != session_id}
+
+    def _delete_series_rows(self, table: str, column: str, series_id: int, chunk_size: int,
+                            before: Optional[int] = None):
+        """
+        Delete one series' rows from a (series_id, column)-keyed table, chunk_size rows per transaction
+
+        Args:
+            table: data_points or a rollup table
+            column: Second primary-key column (ts or bucket)
+            series_id: Series to delete from
+            chunk_size: Rows per transaction
+            before: Only delete rows with column < before (default: all)
+        """
+        limit = f"AND {column} < ?" if before is not None else ""
+        bound = (before,) if before is not None else ()
+
+        while True:
+            with self._write_transaction() as conn:
+                # The key chunk_size rows in marks the end of this chunk
+                row = conn.execute(f"""
+                    SELECT {column} FROM {table} WHERE series_id = ? {limit}
+                    ORDER BY {column} LIMIT 1 OFFSET ?
+                """, (series_id, *bound, chunk_size)).fetchone()
+
+                if row is None:
+                    conn.execute(f"DELETE FROM {table} WHERE series_id = ? {limit}", (series_id, *bound))
+                    return
+                conn.execute(f"DELETE FROM {table} WHERE series_id = ? AND {column} < ?", (series_id, row[0]))
+
+    def _update_session_row(self, session_id: int, status: Optional[str] = None,
+                            metadata: Optional[Dict] = None):
+        """Set a session's status and/or merge keys into its metadata (None values remove keys)"""
+        with self._write_transaction() as conn:
+            if status is not None:
+                conn.execute("UPDATE logging_sessions SET status = ? WHERE id = ?", (status, session_id))
+            if metadata is not None:
+                row = conn.execute("SELECT metadata FROM logging_sessions WHERE id = ?", (session_id,)).fetchone()
+                merged = json.loads(row[0]) if row and row[0] else {}
+                merged.update(metadata)
+                merged = {key: value for key, value in merged.items() if value is not None}
+                conn.execute("UPDATE logging_sessions SET metadata = ? WHERE id = ?",
+                             (json.dumps(merged), session_id))
+
+    def downsample_session(self, session_id: int, before, bucket_seconds: float = 60,
+                           chunk_buckets: int = 60) -> int:
+        """
+        Replace a session's samples older than `before` with one mean value per time bucket
+
+        Works one series and chunk_buckets buckets per transaction, resuming
+        from where the previous run stopped (kept in the session metadata).
+        The counters and rollups keep the full-resolution figures.
+
+        Args:
+            session_id: Session to thin out
+            before: Cutoff as datetime, timestamp string or epoch seconds
+            bucket_seconds: Resolution kept for old data
+            chunk_buckets: Buckets rewritten per transaction
+
+        Returns:
+            Number of samples removed
+        """
+        path = self._partition_path(session_id)
+        if path is not None:
+            # A partition file is a complete database of its own; thin it in place
+            partition = DatabaseManager(path)
+            try:
+                return partition.downsample_session(session_id, before, bucket_seconds, chunk_buckets)
+            finally:
+                partition.close()
+
+        width = int(bucket_seconds * 1_000_000)
+        cutoff = _to_epoch_us(before)
+        cutoff -= cutoff % width
+
+        info = self.get_session_info(session_id)
+        if info is None:
+            return 0
+        state = info['metadata'].get('retention_state', {})
+        done_until = state.get('downsampled_until') if state.get('downsample_seconds') == bucket_seconds else None
+        if done_until is not None and done_until >= cutoff:
+            return 0
+
+        self.flush()
+        conn = self._get_reader()
+        removed = 0
+        for series_id, first_ts in conn.execute("""
+            SELECT s.id, st.first_ts FROM series s JOIN series_stats st ON st.series_id = s.id
+            WHERE s.session_id = ?
+        """, (session_id,)).fetchall():
+            start = max(first_ts, done_until or first_ts)
+            start -= start % width
+            while start < cutoff:
+                end = min(cutoff, start + chunk_buckets * width)
+                with self._write_transaction() as writer:
+                    buckets = writer.execute(f"""
+                        SELECT series_id, ts - ts % {width}, AVG(value)
+                        FROM data_points WHERE series_id = ? AND ts >= ? AND ts < ?
+                        GROUP BY ts - ts % {width}
+                    """, (series_id, start, end)).fetchall()
+                    cursor = writer.execute("DELETE FROM data_points WHERE series_id = ? AND ts >= ? AND ts < ?",
+                                            (series_id, start, end))
+                    writer.executemany("INSERT INTO data_points (series_id, ts, value) VALUES (?, ?, ?)", buckets)
+                    removed += cursor.rowcount - len(buckets)
+                start = end
+
+        self._update_session_row(session_id, metadata={'retention_state': dict(
+            state, downsampled_until=max(cutoff, done_until or cutoff), downsample_seconds=bucket_seconds)})
+        return removed
+
+    def partition_session(self, session_id: int, partition_dir: str = "database/partitions",
+                          chunk_size: int = 20000) -> str:
+        """
+        Move a stopped session's data out of the hot database into its own file
+
+        The rows are copied into a standalone SQLite file with the ChemiSuite
+        schema on a separate connection, so only the new file is written and
+        the logger is never blocked, then deleted from the hot database in
+        chunks. From then on the session's reads are routed to that file,
+        leaving the hot database with only the sessions still being logged.
+
+        Args:
+            session_id: Session to move (must not be logging)
+            partition_dir: Directory for partition files
+            chunk_size: Rows deleted per transaction
+
+        Returns:
+            Path of the partition file
+        """
+        info = self.get_session_info(session_id)
+        if info is None:
+            raise ValueError(f"Session {session_id} not found")
+        if info['status'] in ('running', 'paused', 'archived', 'deleting'):
+            raise RuntimeError(f"Cannot partition a session that is {info['status']}")
+        if self._partition_path(session_id) is not None:
+            return self._partition_path(session_id)
+
+        self.flush()
+        os.makedirs(partition_dir, exist_ok=True)
+        db_file = os.path.join(partition_dir, f"session_{session_id}.db")
+        for path in (db_file, db_file + '-wal', db_file + '-shm'):
+            if os.path.exists(path):
+                os.remove(path)
+
+        # Create the schema, then copy across with the partition attached
+        DatabaseManager(db_file).close()
+        conn = self._connect()
+        try:
+            conn.execute("ATTACH DATABASE ? AS partition", (db_file,))
+            with conn:
+                conn.execute("INSERT INTO partition.logging_sessions SELECT * FROM logging_sessions WHERE id = ?",
+                             (session_id,))
+                conn.execute("INSERT INTO partition.series SELECT * FROM series WHERE session_id = ?", (session_id,))
+                for table in ['data_points', 'series_stats'] + [table for table, _ in ROLLUPS.values()]:
+                    conn.execute(f"""
+                        INSERT INTO partition.{table}
+                        SELECT * FROM {table} WHERE series_id IN (SELECT id FROM series WHERE session_id = ?)
+                    """, (session_id,))
+            conn.execute("DETACH DATABASE partition")
+        finally:
+            conn.close()
 
-        conn.commit()
+        data_points = self.get_data_point_count(session_id)
+        self._update_session_row(session_id, metadata={'partition': {'path': db_file, 'data_points': data_points}})
+        self._partition_paths.pop(session_id, None)
+        self._delete_session_data(session_id, chunk_size)
+        return db_file
+
+    def archive_session(self, session_id: int, archive_dir: str = "database/archive",
+                        partition_dir: str = "database/partitions", chunk_size: int = 20000) -> str:
+        """
+        Compress a stopped session's data into an archive file
+
+        The session is moved to its partition file first (if it isn't
+        already there) and that file is gzipped. The session stays listed
+        with status 'archived' and can be brought back with restore_session().
+
+        Args:
+            session_id: Session to archive (must not be logging)
+            archive_dir: Directory for archive files
+            partition_dir: Directory for partition files
+            chunk_size: Rows deleted per transaction when partitioning
+
+        Returns:
+            Path of the archive file
+        """
+        import shutil
+
+        info = self.get_session_info(session_id)
+        if info is None:
+            raise ValueError(f"Session {session_id} not found")
+        if info['status'] in ('running', 'paused', 'archived', 'deleting'):
+            raise RuntimeError(f"Cannot archive a session that is {info['status']}")
+
+        db_file = self.partition_session(session_id, partition_dir, chunk_size)
+        partition = self.get_session_info(session_id)['metadata']['partition']
+        self._forget_partition(session_id)
+
+        # Fold the partition's WAL into the file so the archive is self-contained
+        conn = sqlite3.connect(db_file)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode = DELETE")
         conn.close()
 
-    def export_to_csv(self, session_id: int, filepath: str):
-        """Export session data to CSV file"""
-        import csv
+        os.makedirs(archive_dir, exist_ok=True)
+        archive_path = os.path.join(archive_dir, f"session_{session_id}.db.gz")
+        with open(db_file, 'rb') as source, gzip.open(archive_path, 'wb', compresslevel=6) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.remove(db_file)
+
+        self._update_session_row(session_id, status='archived', metadata={
+            'partition': None,
+            'archive': {'path': archive_path, 'data_points': partition['data_points'],
+                        'previous_status': info['status']}})
+        self._forget_partition(session_id)
+        return archive_path
+
+    def restore_session(self, session_id: int, partition_dir: str = "database/partitions"):
+        """
+        Re-attach an archived session by decompressing it back into a partition file
+
+        Args:
+            session_id: Archived session to restore
+            partition_dir: Directory for partition files
+        """
+        import shutil
+
+        info = self.get_session_info(session_id)
+        if info is None or info['status'] != 'archived':
+            raise RuntimeError(f"Session {session_id} is not archived")
+        archive = info['metadata']['archive']
+
+        os.makedirs(partition_dir, exist_ok=True)
+        db_file = os.path.join(partition_dir, f"session_{session_id}.db")
+        with gzip.open(archive['path'], 'rb') as source, open(db_file, 'wb') as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+
+        self._update_session_row(session_id, status=archive.get('previous_status', 'stopped'), metadata={
+            'archive': None,
+            'partition': {'path': db_file, 'data_points': archive['data_points']}})
+        self._partition_paths.pop(session_id, None)
+        os.remove(archive['path'])
+
+    def incremental_vacuum(self, pages_per_step: int = 1000, max_steps: Optional[int] = None) -> int:
+        """
+        Return free pages to the file system a few at a time
+
+        Each step frees at most pages_per_step pages under the writer lock,
+        so logging is only paused briefly.
+
+        Args:
+            pages_per_step: Pages freed per step
+            max_steps: Stop after this many steps (default: until no free pages are left)
+
+        Returns:
+            Number of pages freed
+        """
+        freed = 0
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            with self._write_lock:
+                conn = self._get_writer()
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not free_pages:
+                    break
+                # executescript steps the pragma to completion; execute() would free a single page
+                conn.executescript(f"PRAGMA incremental_vacuum({pages_per_step})")
+                freed += free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            steps += 1
+        return freed
+
+    def iter_session_data(self, session_id: int, parameter: Optional[str] = None,
+                          chunk_size: int = 10000) -> Iterator[List[Tuple]]:
+        """
+        Stream a session's data points in time order, chunk by chunk
+
+        Yields the same rows as get_session_data() without loading the whole
+        session: each series is read along its primary key with fetchmany()
+        and the series are merged by timestamp, so SQLite never has to sort
+        the session and memory stays bounded by chunk_size.
 
+        Args:
+            session_id: Session to read
+            parameter: Optional parameter name to filter on
+            chunk_size: Rows per yielded chunk
+
+        Yields:
+            Lists of (timestamp, device_name, parameter, value, unit) rows
+        """
+        conn = self._reader_for(session_id)
+
+        query = "SELECT id, device_name, parameter, unit FROM series WHERE session_id = ?"
+        params = [session_id]
+        if parameter:
+            query += " AND parameter = ?"
+            params.append(parameter)
+        series = conn.execute(query + " ORDER BY id", params).fetchall()
+        if not series:
+            return
+
+        fetch_size = max(100, chunk_size // len(series))
+
+        def read_series(series_id, device_name, param_name, unit):
+            cursor = conn.execute("SELECT ts, value FROM data_points WHERE series_id = ? ORDER BY ts",
+                                  (series_id,))
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    return
+                for ts, value in rows:
+                    yield ts, device_name, param_name, value, unit
+
+        # Ties on ts keep series order, matching ORDER BY d.ts, s.id
+        merged = heapq.merge(*(read_series(*row) for row in series), key=itemgetter(0))
+
+        chunk = []
+        for row in merged:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield _format_rows(chunk)
+                chunk = []
+        if chunk:
+            yield _format_rows(chunk)
+
+    def export_to_csv(self, session_id: int, filepath: str, compress: Optional[bool] = None,
+                      progress_callback: Optional[Callable[[int, int], None]] = None,
+                      chunk_size: int = 10000) -> int:
+        """
+        Export session data to CSV file
+
+        Rows are streamed from the database in chunks, so memory use doesn't
+        grow with the session size.
+
+        Args:
+            session_id: Session to export
+            filepath: Output file path
+            compress: Write gzip (default: when filepath ends in .gz)
+            progress_callback: Called as progress_callback(rows_written, total_rows)
+                after each chunk
+            chunk_size: Rows read and written per chunk
+
+        Returns:
+            Number of data rows written
+        """
         session_info = self.get_session_info(session_id)
-        data = self.get_session_data(session_id)
+        total_rows = self.get_data_point_count(session_id) if progress_callback else 0
 
-        with open(filepath, 'w', newline='') as csvfile:
+        if compress is None:
+            compress = filepath.endswith('.gz')
+        if compress:
+            output = gzip.open(filepath, 'wt', newline='', compresslevel=6)
+        else:
+            output = open(filepath, 'w', newline='', buffering=1024 * 1024)
+
+        rows_written = 0
+        with output as csvfile:
             writer = csv.writer(csvfile)
 
             # Write header with session info
@@ -260,47 +1610,307 @@ class DatabaseManager:
             writer.writerow(['Timestamp', 'Device Name', 'Parameter', 'Value', 'Unit'])
 
             # Write data points
-            for row in data:
-                writer.writerow(row)
+            for chunk in self.iter_session_data(session_id, chunk_size=chunk_size):
+                writer.writerows(chunk)
+                rows_written += len(chunk)
+                if progress_callback:
+                    progress_callback(rows_written, total_rows)
+
+        return rows_written
+
+    # Wide export formats by file extension
+    WIDE_FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow',
+                    '.ipc': 'arrow', '.npz': 'npz'}
+
+    def get_session_wide(self, session_id: int, align_seconds: Optional[float] = None,
+                         progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        Pivot a session into a time-aligned wide table with NumPy
+
+        Each series is read straight into arrays and scattered into its
+        column with searchsorted(), so the pivot never loops over rows in
+        Python. Readings are snapped to a grid of align_seconds anchored at
+        the session's first sample; the last reading in a cell wins and
+        cells without a reading are NaN.
+
+        Args:
+            session_id: Session to pivot
+            align_seconds: Grid spacing (default: the session's logging
+                interval; 0 keeps the exact timestamps)
+            progress_callback: Called as progress_callback(series_read, total_series)
 
-    def import_from_csv(self, filepath: str) -> int:
-        """Import session data from CSV file and return new session ID"""
-        import csv
-        from datetime import datetime
+        Returns:
+            (timestamps, values, columns): int64 epoch-microsecond array of
+            length n, float64 (n, m) array in column-major order, and a list
+            of m dictionaries with name, device_name, parameter and unit
+        """
+        import numpy as np
 
-        with open(filepath, 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
+        conn = self._reader_for(session_id)
+        if align_seconds is None:
+            row = conn.execute("SELECT interval_seconds FROM logging_sessions WHERE id = ?",
+                               (session_id,)).fetchone()
+            align_seconds = row[0] if row else 0
+        align_us = int(round((align_seconds or 0) * 1_000_000))
+
+        series = conn.execute("""
+            SELECT id, device_name, parameter, unit FROM series WHERE session_id = ? ORDER BY id
+        """, (session_id,)).fetchall()
+
+        columns = []
+        arrays = []
+        for index, (series_id, device_name, parameter, unit) in enumerate(series):
+            rows = conn.execute("SELECT ts, value FROM data_points WHERE series_id = ? ORDER BY ts",
+                                (series_id,)).fetchall()
+            if rows:
+                # Epoch microseconds stay exact in float64 (< 2**53)
+                data = np.array(rows, dtype=np.float64)
+                arrays.append((data[:, 0].astype(np.int64), data[:, 1]))
+                name = f"{device_name}: {parameter}" + (f" ({unit})" if unit else "")
+                columns.append({'name': name, 'device_name': device_name,
+                                'parameter': parameter, 'unit': unit})
+            if progress_callback:
+                progress_callback(index + 1, len(series))
+
+        if not arrays:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0)), []
+
+        if align_us > 0:
+            origin = min(ts[0] for ts, _ in arrays)
+            arrays = [(origin + (ts - origin) // align_us * align_us, values) for ts, values in arrays]
+
+        timestamps = np.unique(np.concatenate([ts for ts, _ in arrays]))
+        matrix = np.full((len(timestamps), len(arrays)), np.nan, order='F')
+        for column, (ts, values) in enumerate(arrays):
+            # Repeated cells keep the last assignment, i.e. the latest reading
+            matrix[np.searchsorted(timestamps, ts), column] = values
+
+        return timestamps, matrix, columns
+
+    def export_wide(self, session_id: int, filepath: str, fmt: Optional[str] = None,
+                    align_seconds: Optional[float] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Export a session as a wide table with one column per device/parameter
+
+        Parquet and Arrow IPC files hold a UTC 'timestamp' column followed by
+        one float64 column per series (units are kept in the field metadata),
+        so pandas.read_parquet() / pyarrow.ipc.open_file() load them directly.
+        NPZ files hold 'timestamp' (int64 epoch microseconds), 'values'
+        (rows x columns), and 'columns', 'devices', 'parameters' and 'units'
+        string arrays. Parquet and Arrow need pyarrow; NPZ only needs NumPy.
+
+        Args:
+            session_id: Session to export
+            filepath: Output file path
+            fmt: 'parquet', 'arrow' or 'npz' (default: from the file extension)
+            align_seconds: Time grid spacing, see get_session_wide()
+            progress_callback: Called as progress_callback(series_read, total_series)
+
+        Returns:
+            Number of rows written
+        """
+        import numpy as np
+
+        if fmt is None:
+            fmt = self.WIDE_FORMATS.get(os.path.splitext(filepath)[1].lower())
+        if fmt not in ('parquet', 'arrow', 'npz'):
+            raise ValueError(f"Unknown wide export format for {filepath}; use .parquet, .arrow or .npz")
+
+        if fmt != 'npz':
+            try:
+                import pyarrow as pa
+            except ImportError:
+                raise ImportError("pyarrow not installed. Run: pip install pyarrow (or export to .npz)")
+
+        timestamps, matrix, columns = self.get_session_wide(session_id, align_seconds, progress_callback)
+
+        if fmt == 'npz':
+            np.savez(filepath, timestamp=timestamps, values=matrix,
+                     columns=np.array([c['name'] for c in columns], dtype=str),
+                     devices=np.array([c['device_name'] for c in columns], dtype=str),
+                     parameters=np.array([c['parameter'] for c in columns], dtype=str),
+                     units=np.array([c['unit'] for c in columns], dtype=str))
+            return len(timestamps)
+
+        session_info = self.get_session_info(session_id) or {}
+        fields = [pa.field('timestamp', pa.timestamp('us', tz='UTC'), nullable=False)]
+        fields += [pa.field(c['name'], pa.float64(), metadata={
+            'device_name': c['device_name'], 'parameter': c['parameter'], 'unit': c['unit']})
+            for c in columns]
+        schema = pa.schema(fields, metadata={
+            'session_name': str(session_info.get('name', '')),
+            'start_time': str(session_info.get('start_time', '')),
+            'interval_seconds': str(session_info.get('interval_seconds', '')),
+        })
+
+        # Column-major matrix: each column is a contiguous slice, NaN marks missing
+        arrays = [pa.array(timestamps, type=pa.int64()).cast(pa.timestamp('us', tz='UTC'))]
+        arrays += [pa.array(matrix[:, column], from_pandas=True) for column in range(len(columns))]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, filepath, compression='zstd')
+        else:
+            with pa.OSFile(filepath, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table)
+
+        return len(timestamps)
+
+    def import_from_csv(self, filepath: str,
+                        progress_callback: Optional[Callable[[int, int], None]] = None,
+                        parse_workers: Optional[int] = None) -> int:
+        """
+        Import session data from CSV file and return new session ID
+
+        The file is read in blocks of whole lines. Each block is parsed into
+        (series_id, ts, value) rows, sorted into primary-key order and written
+        with one executemany() in its own short transaction, so the logger's
+        writes are never locked out for the whole import. Files larger than
+        PARALLEL_PARSE_BYTES are parsed in a process pool while the calling
+        thread writes. If anything fails, the partly imported session is
+        deleted again.
+
+        Args:
+            filepath: CSV file written by export_to_csv() (.gz files are decompressed)
+            progress_callback: Called as progress_callback(bytes_read, total_bytes)
+                after each block
+            parse_workers: Parser processes (default: automatic, by file size)
+
+        Returns:
+            ID of the new session
+        """
+        total_bytes = os.path.getsize(filepath)
+        encoding = _detect_encoding(filepath)
+
+        if parse_workers is None:
+            parse_workers = (min(4, os.cpu_count() or 1)
+                             if total_bytes >= self.PARALLEL_PARSE_BYTES else 1)
+
+        with open(filepath, 'rb') as raw:
+            # Gzip exports are decompressed on the fly; progress is measured on the file itself
+            csvfile = gzip.GzipFile(fileobj=raw) if filepath.endswith('.gz') else raw
 
             # Read session metadata
-            session_name = next(reader)[1]  # Session:, Name
-            start_time_str = next(reader)[1]  # Start Time:, value
-            end_time_str = next(reader)[1]  # End Time:, value
-            interval_seconds = int(next(reader)[1])  # Interval (seconds):, value
-            next(reader)  # Skip blank line
-            next(reader)  # Skip data header
+            header = [csvfile.readline().decode(encoding) for _ in range(6)]
+            metadata = list(csv.reader(header))
+            session_name = metadata[0][1]  # Session:, Name
+            start_time_str = metadata[1][1]  # Start Time:, value
+            end_time_str = metadata[2][1]  # End Time:, value
+            interval_seconds = int(metadata[3][1])  # Interval (seconds):, value
+            # metadata[4] is the blank line, metadata[5] the data header
 
             # Create new session
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._write_transaction() as conn:
+                cursor = conn.execute("""
+                    INSERT INTO logging_sessions (name, start_time, end_time, interval_seconds, status, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (session_name, start_time_str, end_time_str if end_time_str != 'In Progress' else None,
+                      interval_seconds, 'stopped', json.dumps({})))
+                session_id = cursor.lastrowid
 
-            cursor.execute("""
-                INSERT INTO logging_sessions (name, start_time, end_time, interval_seconds, status, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (session_name, start_time_str, end_time_str if end_time_str != 'In Progress' else None,
-                  interval_seconds, 'stopped', json.dumps({})))
+            def read_blocks():
+                while True:
+                    block = csvfile.read(self.IMPORT_BLOCK_BYTES)
+                    if not block:
+                        return
+                    # Finish the last line so no row is split between blocks
+                    yield block + csvfile.readline(), raw.tell()
 
-            session_id = cursor.lastrowid
+            try:
+                if parse_workers > 1:
+                    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+                        in_flight = []
+                        for block, position in read_blocks():
+                            in_flight.append((pool.submit(_parse_csv_block, block, encoding), position))
+                            # Bound memory to a couple of blocks per worker
+                            if len(in_flight) > parse_workers * 2:
+                                future, done = in_flight.pop(0)
+                                self._write_imported_rows(session_id, future.result())
+                                if progress_callback:
+                                    progress_callback(done, total_bytes)
+                        for future, done in in_flight:
+                            self._write_imported_rows(session_id, future.result())
+                            if progress_callback:
+                                progress_callback(done, total_bytes)
+                else:
+                    for block, position in read_blocks():
+                        self._write_imported_rows(session_id, _parse_csv_block(block, encoding))
+                        if progress_callback:
+                            progress_callback(position, total_bytes)
+            except Exception:
+                self.delete_session(session_id)
+                raise
 
-            # Read and insert data points
-            for row in reader:
-                timestamp, device_name, parameter, value, unit = row
+        return session_id
 
-                cursor.execute("""
-                    INSERT INTO data_points (session_id, timestamp, device_name, device_type, parameter, value, unit)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (session_id, timestamp, device_name, 'imported', parameter, float(value), unit))
+    def _write_imported_rows(self, session_id: int, rows: List[Tuple]):
+        """Insert one parsed block of imported (ts, device_name, parameter, value, unit) rows"""
+        if not rows:
+            return
 
-            conn.commit()
-            conn.close()
+        with self._write_transaction() as conn:
+            series_ids = {}
+            points = []
+            append = points.append
+            for ts, device_name, parameter, value, unit in rows:
+                key = (device_name, parameter, unit)
+                series_id = series_ids.get(key)
+                if series_id is None:
+                    series_id = series_ids[key] = self._get_series_id(
+                        conn, session_id, device_name, 'imported', parameter, unit)
+                append((series_id, ts, value))
+
+            # Primary-key order keeps the B-tree inserts append-mostly
+            points.sort()
+            conn.executemany("""
+                INSERT OR REPLACE INTO data_points (series_id, ts, value)
+                VALUES (?, ?, ?)
+            """, points)
+            self._update_rollups(conn, points)
+
+    def import_many_from_csv(self, filepaths: List[str],
+                             progress_callback: Optional[Callable[[int, int], None]] = None,
+                             max_workers: int = 4) -> Dict[str, object]:
+        """
+        Import several CSV files concurrently, each into its own session
+
+        Files are parsed in parallel; their writes interleave block by block
+        on the single writer connection.
+
+        Args:
+            filepaths: CSV files written by export_to_csv()
+            progress_callback: Called as progress_callback(bytes_read, total_bytes)
+                summed over all files
+            max_workers: Files imported at the same time
+
+        Returns:
+            Dictionary mapping each file path to its new session ID, or to the
+            exception that made its import fail
+        """
+        sizes = {filepath: os.path.getsize(filepath) for filepath in filepaths}
+        total_bytes = sum(sizes.values())
+        done_bytes = dict.fromkeys(filepaths, 0)
+        progress_lock = threading.Lock()
+
+        def import_one(filepath):
+            def on_progress(bytes_read, _total):
+                with progress_lock:
+                    done_bytes[filepath] = bytes_read
+                    done = sum(done_bytes.values())
+                if progress_callback:
+                    progress_callback(done, total_bytes)
+            return self.import_from_csv(filepath, progress_callback=on_progress)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(filepaths)))) as pool:
+            futures = {filepath: pool.submit(import_one, filepath) for filepath in filepaths}
+            for filepath, future in futures.items():
+                try:
+                    results[filepath] = future.result()
+                except Exception as e:
+                    print(f"Error importing {filepath}: {e}")
+                    results[filepath] = e
 
-            return session_id
+        return results
@@ -0,0 +1,194 @@
+"""
+Store-and-forward queue for ARChemedes
+Buffers MQTT messages on disk while the broker is unreachable and hands
+them back in order for a rate-limited drain once it is reachable again
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# What to do when the queue is full
+EVICTION_POLICIES = {
+    'drop_oldest': 'Drop the oldest messages',
+    'drop_newest': 'Reject new messages',
+    'latest_per_topic': 'Keep only the latest message per topic',
+}
+
+
+class PublishQueue:
+    """Bounded on-disk FIFO of (topic, payload, retain) messages"""
+
+    def __init__(self, db_path: str = "database/archemedes_queue.db", max_messages: int = 50000,
+                 max_bytes: int = 50 * 1024 * 1024, eviction: str = 'drop_oldest'):
+        """
+        Open (or create) the queue
+
+        Args:
+            db_path: SQLite file holding the queue; survives restarts
+            max_messages: Most messages kept
+            max_bytes: Most payload bytes kept
+            eviction: Policy from EVICTION_POLICIES applied when a limit is hit
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+
+        self.db_path = db_path
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    retain INTEGER NOT NULL,
+                    enqueued REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_queue_topic ON queue(topic)")
+
+        # Highest id handed out by take() and not yet acknowledged or rewound
+        self._cursor = 0
+
+        count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM queue").fetchone()
+        self.depth = count
+        self.bytes = size
+
+        # Statistics
+        self.enqueued = 0
+        self.dropped = 0
+        self.drained = 0
+
+    def configure(self, max_messages: int, max_bytes: int, eviction: str):
+        """
+        Change the limits and eviction policy of the open queue (thread-safe)
+
+        Messages beyond lower limits are dropped, oldest first. The take()
+        cursor is kept, so a drain in progress carries on.
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+
+        with self._lock, self._conn:
+            self.max_messages = max_messages
+            self.max_bytes = max_bytes
+            self.eviction = eviction
+            self._evict_oldest(0, 0)
+
+    def put(self, topic: str, payload, retain: bool = False) -> bool:
+        """
+        Add a message, applying the eviction policy if the queue is full
+
+        Returns:
+            False if the message was rejected (drop_newest on a full queue)
+        """
+        data = payload.encode('utf-8') if isinstance(payload, str) else bytes(payload)
+
+        with self._lock, self._conn:
+            if self.eviction == 'latest_per_topic':
+                # Only unsent copies can go; one already handed to the broker may be in flight
+                removed = self._conn.execute(
+                    "DELETE FROM queue WHERE topic = ? AND id > ? RETURNING LENGTH(payload)",
+                    (topic, self._cursor)).fetchall()
+                self._forget(removed)
+
+            if self.depth + 1 > self.max_messages or self.bytes + len(data) > self.max_bytes:
+                if self.eviction == 'drop_newest':
+                    self.dropped += 1
+                    return False
+                self._evict_oldest(1, len(data))
+
+            self._conn.execute("INSERT INTO queue (topic, payload, retain, enqueued) VALUES (?, ?, ?, ?)",
+                               (topic, data, int(retain), time.time()))
+            self.depth += 1
+            self.bytes += len(data)
+            self.enqueued += 1
+        return True
+
+    def _evict_oldest(self, messages: int, size: int):
+        """Drop the oldest messages until `messages` more of total `size` bytes fit (lock held)"""
+        while self.depth and (self.depth + messages > self.max_messages or self.bytes + size > self.max_bytes):
+            excess = max(1, self.depth + messages - self.max_messages)
+            removed = self._conn.execute("""
+                DELETE FROM queue WHERE id IN (SELECT id FROM queue ORDER BY id LIMIT ?)
+                RETURNING LENGTH(payload)
+            """, (excess,)).fetchall()
+            self._forget(removed)
+            self.dropped += len(removed)
+
+    def _forget(self, removed: List[Tuple[int]]):
+        """Account for deleted rows given their payload lengths"""
+        self.depth -= len(removed)
+        self.bytes -= sum(row[0] for row in removed)
+
+    def take(self, limit: int) -> List[Tuple[int, str, bytes, bool]]:
+        """
+        Get the next messages not yet handed out, oldest first
+
+        Taken messages stay in the queue until ack() so they survive a
+        crash or disconnect mid-drain.
+
+        Returns:
+            List of (id, topic, payload, retain)
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT id, topic, payload, retain FROM queue WHERE id > ? ORDER BY id LIMIT ?
+            """, (self._cursor, limit)).fetchall()
+            if rows:
+                self._cursor = rows[-1][0]
+        return [(row_id, topic, payload, bool(retain)) for row_id, topic, payload, retain in rows]
+
+    def ack(self, row_id: int):
+        """Remove a message once the broker has confirmed it"""
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM queue WHERE id = ? RETURNING LENGTH(payload)",
+                                         (row_id,)).fetchall()
+            self._forget(removed)
+            self.drained += len(removed)
+
+    def rewind(self, after: int = 0):
+        """
+        Hand out unacknowledged messages again, e.g. after the connection dropped mid-drain
+
+        Args:
+            after: Only messages with a higher id are handed out again;
+                those up to it are still awaiting their ack (0: all)
+        """
+        with self._lock:
+            self._cursor = min(self._cursor, after)
+
+    def oldest_age(self) -> Optional[float]:
+        """Seconds since the oldest queued message was enqueued"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(enqueued) FROM queue").fetchone()
+        return time.time() - row[0] if row and row[0] is not None else None
+
+    def get_stats(self) -> Dict:
+        """Queue depth, size and counters for backpressure monitoring"""
+        oldest = self.oldest_age()
+        return {
+            'depth': self.depth,
+            'bytes': self.bytes,
+            'fill': round(max(self.depth / self.max_messages, self.bytes / self.max_bytes), 4),
+            'oldest_age_s': round(oldest, 1) if oldest is not None else None,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'drained': self.drained,
+            'eviction': self.eviction,
+        }
+
+    def close(self):
+        """Close the queue database"""
+        with self._lock:
+            self._conn.close()
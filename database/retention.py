@@ -0,0 +1,164 @@
+"""
+Retention engine for ChemiSuite data logging
+Thins out, partitions, archives and vacuums old sessions in the background
+so the hot database stays small
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from database.db_manager import DatabaseManager
+
+# Default policy; retention_config.json overrides it for all sessions and a
+# session's metadata['retention'] overrides it for that session
+DEFAULT_POLICY = {
+    'downsample_after_days': None,   # Thin samples older than this (None: keep full resolution)
+    'downsample_seconds': 60,        # Resolution kept for thinned data
+    'partition_after_days': None,    # Move sessions that ended this long ago to their own file (None: never)
+    'partition_dir': 'database/partitions',
+    'archive_after_days': None,      # Archive sessions that ended this long ago (None: never)
+    'archive_dir': 'database/archive',
+    'vacuum_pages': 1000,            # Pages returned to the OS per incremental vacuum step
+    'check_interval_hours': 6,       # How often the background pass runs
+}
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'retention_config.json')
+
+
+def load_policy(config_file: str = CONFIG_FILE) -> Dict:
+    """Load the global retention policy, falling back to DEFAULT_POLICY"""
+    policy = dict(DEFAULT_POLICY)
+    try:
+        with open(config_file, 'r') as f:
+            policy.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading retention config: {e}")
+    return policy
+
+
+class RetentionManager:
+    """Applies the retention policy to stored sessions on a background thread"""
+
+    def __init__(self, db: DatabaseManager, policy: Optional[Dict] = None):
+        """
+        Initialize the retention manager
+
+        Args:
+            db: Database to maintain
+            policy: Global policy (default: load_policy())
+        """
+        self.db = db
+        self.policy = policy if policy is not None else load_policy()
+        self.last_run = None
+        self.last_report = {}
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._run_lock = threading.Lock()
+
+    def session_policy(self, session: Dict) -> Dict:
+        """Effective policy for one session (global policy plus its metadata overrides)"""
+        policy = dict(self.policy)
+        policy.update(session.get('metadata', {}).get('retention', {}))
+        return policy
+
+    def run_once(self, active_session_id: Optional[int] = None) -> Dict:
+        """
+        Run one retention pass over every session
+
+        Sessions whose end is older than archive_after_days are archived.
+        Every session that is not archived, including the one being logged,
+        has its samples older than downsample_after_days thinned, so a long
+        running session doesn't keep its first days at full resolution.
+        Stopped sessions that ended more than partition_after_days ago are
+        moved to their own partition file; finally free pages are vacuumed
+        away.
+
+        Args:
+            active_session_id: Session currently being logged (never archived or partitioned)
+
+        Returns:
+            Dictionary with archived, downsampled and partitioned session
+            ids, samples removed and pages freed
+        """
+        with self._run_lock:
+            now = datetime.now()
+            report = {'archived': [], 'downsampled': [], 'partitioned': [], 'samples_removed': 0, 'pages_freed': 0}
+
+            for session in self.db.get_all_sessions():
+                if self._stop_event.is_set():
+                    break
+                if session['status'] in ('archived', 'deleting'):
+                    continue
+
+                policy = self.session_policy(session)
+                try:
+                    if self._ended_before(session, policy['archive_after_days'], now) \
+                            and session['id'] != active_session_id:
+                        self.db.archive_session(session['id'], policy['archive_dir'], policy['partition_dir'])
+                        report['archived'].append(session['id'])
+                        continue
+
+                    if policy['downsample_after_days'] is not None:
+                        cutoff = now - timedelta(days=policy['downsample_after_days'])
+                        removed = self.db.downsample_session(session['id'], cutoff, policy['downsample_seconds'])
+                        if removed:
+                            report['downsampled'].append(session['id'])
+                            report['samples_removed'] += removed
+
+                    partitioned = session['metadata'].get('partition')
+                    if not partitioned and self._ended_before(session, policy['partition_after_days'], now) \
+                            and session['id'] != active_session_id:
+                        self.db.partition_session(session['id'], policy['partition_dir'])
+                        report['partitioned'].append(session['id'])
+                except Exception as e:
+                    print(f"Retention error for session {session['id']}: {e}")
+
+            if not self._stop_event.is_set():
+                report['pages_freed'] = self.db.incremental_vacuum(self.policy['vacuum_pages'])
+
+            self.last_run = now
+            self.last_report = report
+            return report
+
+    def _ended_before(self, session: Dict, days: Optional[float], now: datetime) -> bool:
+        """Check whether a stopped session ended more than `days` ago (never when days is None)"""
+        if days is None or session['status'] != 'stopped' or not session['end_time']:
+            return False
+        ended = datetime.fromisoformat(session['end_time'])
+        return ended < now - timedelta(days=days)
+
+    def start(self, active_session=None):
+        """
+        Run retention passes in the background every check_interval_hours
+
+        Args:
+            active_session: Optional callable returning the session being logged
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+
+        def loop():
+            while not self._stop_event.is_set():
+                try:
+                    self.run_once(active_session() if active_session else None)
+                except Exception as e:
+                    print(f"Retention pass failed: {e}")
+                self._stop_event.wait(self.policy['check_interval_hours'] * 3600)
+
+        self._thread = threading.Thread(target=loop, daemon=True, name="RetentionManager")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread after the current step"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
@@ -7,6 +7,15 @@ Each device module should provide:
 - show_wizard_fields(selected_device, com_ports): Shows device-specific wizard fields
 - validate_wizard_fields(selected_device): Validates the wizard fields
 - render_control_panel(device): Renders the device control panel
+
+Device modules may also provide:
+- get_loggable_parameters(): Returns dict of parameters the data logger can
+  record. Besides 'method', 'args', 'unit' and 'display_name', each entry may
+  set 'interval' (seconds, None = session interval), 'deadband' (only record
+  changes larger than this) and 'heartbeat' (record at least every N seconds);
+  both default to None, which records every reading. They can be turned on
+  per session on the Data Logging page (parameter_settings in
+  DataLogger.start_session())
 """
 
 from . import ika_stirrer
@@ -40,3 +49,21 @@ def get_device_module(device_type):
         if device_module.get_device_info()['type'] == device_type:
             return device_module
     return None
+
+def get_loggable_parameters(device_type):
+    """
+    Get the loggable parameters of a device type
+
+    Saved configurations don't store them, so devices loaded from one get
+    them from their module.
+
+    Args:
+        device_type: String identifier for the device type (e.g., 'ika_stirrer')
+
+    Returns:
+        Dict of loggable parameters, empty if the type has none
+    """
+    device_module = get_device_module(device_type)
+    if device_module and hasattr(device_module, 'get_loggable_parameters'):
+        return device_module.get_loggable_parameters()
+    return {}
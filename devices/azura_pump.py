@@ -7,6 +7,7 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), 'drivers'))
 from Azura_Pump_driver import AzuraPumpDriver
+from telemetry import telemetry
 
 
 def get_device_info():
@@ -28,19 +29,28 @@ def get_loggable_parameters():
             'method': 'get_flow',
             'unit': 'µL/min',
             'args': {},
-            'display_name': 'Flow Rate'
+            'display_name': 'Flow Rate',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         },
         'pressure': {
             'method': 'get_pressure',
             'unit': 'MPa',
             'args': {},
-            'display_name': 'Pressure'
+            'display_name': 'Pressure',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         },
         'motor_current': {
             'method': 'get_motor_current',
             'unit': '%',
             'args': {},
-            'display_name': 'Motor Current'
+            'display_name': 'Motor Current',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         }
     }
 
@@ -134,6 +144,9 @@ def render_control_panel(device, on_edit=None, on_remove=None):
 
     connection_state = device['connection_state']
 
+    # Commands go through the telemetry queue so they never collide with polling
+    commands = telemetry.commands(device)
+
     # Device header card
     with ui.card().style("background-color: #333333; padding: 20px; width: 100%; margin-bottom: 20px;"):
         with ui.row().style("width: 100%; justify-content: space-between; align-items: center;"):
@@ -181,13 +194,19 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                                 connection_state['connect_button'].set_text("Disconnect")
                                 ui.notify(f"Connected to {device['name']}", type='positive')
 
-                                # Enable remote mode
+                                # Enable remote mode, then hand the port over to telemetry
                                 driver.set_remote_mode()
+                                connection_state['head_type_ml'] = driver.get_head_type()
+                                telemetry.register(device)
                             else:
                                 ui.notify(f"Failed to connect to {device['name']}", type='negative')
                         else:
                             # Disconnect
-                            driver.stop()  # Stop pump before disconnecting
+                            try:
+                                commands.stop()  # Stop pump before disconnecting
+                            except Exception as e:
+                                print(f"Error stopping pump during disconnect: {e}")
+                            telemetry.unregister(device['name'])
                             driver.disconnect()
                             connection_state['connected'] = False
                             connection_state['status_label'].set_text("Disconnected")
@@ -223,21 +242,24 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                     """Update status labels"""
                     if connection_state['connected']:
                         try:
-                            status = driver.get_status()
+                            # Latest values from the shared telemetry poll - no serial I/O here
+                            flow = telemetry.get_value(device['name'], 'flow_rate')
+                            pressure = telemetry.get_value(device['name'], 'pressure')
+                            current = telemetry.get_value(device['name'], 'motor_current')
 
-                            if 'flow_ul_min' in status:
-                                status_labels['flow'].set_text(f"{status['flow_ul_min']:.1f} µL/min")
+                            if flow is not None:
+                                status_labels['flow'].set_text(f"{flow:.1f} µL/min")
 
-                            if 'pressure_mpa' in status:
-                                status_labels['pressure'].set_text(f"{status['pressure_mpa']:.2f} MPa")
+                            if pressure is not None:
+                                status_labels['pressure'].set_text(f"{pressure:.2f} MPa")
                             else:
                                 status_labels['pressure'].set_text("N/A (P 2.1S)")
 
-                            if 'motor_current' in status:
-                                status_labels['current'].set_text(f"{status['motor_current']}%")
+                            if current is not None:
+                                status_labels['current'].set_text(f"{current}%")
 
-                            if 'head_type_ml' in status:
-                                status_labels['head'].set_text(f"{status['head_type_ml']} mL")
+                            if connection_state.get('head_type_ml') is not None:
+                                status_labels['head'].set_text(f"{connection_state['head_type_ml']} mL")
 
                         except Exception as e:
                             print(f"Status update error: {e}")
@@ -263,7 +285,8 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                             return
 
                         head_value = 10 if '10' in head_select.value else 50
-                        if driver.set_head_type(head_value):
+                        if commands.set_head_type(head_value):
+                            connection_state['head_type_ml'] = head_value
                             ui.notify(f"Pump head set to {head_value} mL", type='positive')
                         else:
                             ui.notify("Failed to set pump head", type='negative')
@@ -284,7 +307,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                         flow_ml = flow_input.value
                         flow_ul = flow_ml * 1000
 
-                        if driver.set_flow(flow_ul):
+                        if commands.set_flow(flow_ul):
                             ui.notify(f"Flow rate set to {flow_ml} mL/min", type='positive')
                         else:
                             ui.notify("Failed to set flow rate", type='negative')
@@ -309,7 +332,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                             ui.notify("Not connected to pump", type='warning')
                             return
 
-                        if driver.start():
+                        if commands.start():
                             ui.notify("Pump started", type='positive')
                         else:
                             ui.notify("Failed to start pump", type='negative')
@@ -320,7 +343,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                             ui.notify("Not connected to pump", type='warning')
                             return
 
-                        if driver.stop():
+                        if commands.stop():
                             ui.notify("Pump stopped", type='info')
                         else:
                             ui.notify("Failed to stop pump", type='negative')
@@ -6,7 +6,9 @@ RS-232 specs: 9600 baud, 8 bit, 1 stop bit, no parity
 
 import serial
 import time
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from simulators import open_serial
 
 
 class AzuraPumpDriver:
@@ -15,21 +17,40 @@ class AzuraPumpDriver:
     HEAD_10ML = 10
     HEAD_50ML = 50
 
+    # Longest a single serial read blocks while waiting for a reply; the
+    # reply itself is returned as soon as its terminating CR arrives
+    READ_POLL_SECONDS = 0.05
+
+    # Queries that get_status() and read_many() can batch, keyed by method name
+    QUERIES: Dict[str, Tuple[str, Callable]] = {
+        'get_flow': ("FLOW?", float),
+        'get_pressure': ("PRESSURE?", lambda value: float(value) / 10.0),  # 0.1 MPa units
+        'get_motor_current': ("IMOTOR?", int),
+        'get_head_type': ("HEADTYPE?", int),
+    }
+
     def __init__(self, port: str, timeout: float = 1.0):
+        """
+        Args:
+            port: Serial port (e.g., 'COM4' on Windows, '/dev/ttyUSB0' on Linux,
+                'sim://azura/1' for a simulated pump)
+            timeout: Seconds to wait for each reply before giving up
+        """
         self.port = port
         self.timeout = timeout
         self.ser: Optional[serial.Serial] = None
+        self._rx_buffer = bytearray()
 
     def connect(self) -> bool:
         """Establish connection to pump"""
         try:
-            self.ser = serial.Serial(
-                port=self.port,
+            self.ser = open_serial(
+                self.port,
                 baudrate=9600,
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=self.timeout
+                timeout=self.READ_POLL_SECONDS
             )
             time.sleep(0.1)
             return True
@@ -46,22 +67,102 @@ class AzuraPumpDriver:
         return self.ser is not None and self.ser.is_open
 
     def _send_command(self, command: str) -> Optional[str]:
-        """Send command and return response"""
+        """Send command and return response (None if the pump didn't answer in time)"""
+        return self._send_commands([command])[0]
+
+    def _send_commands(self, commands: List[str], timeout: Optional[float] = None) -> List[Optional[str]]:
+        """
+        Send commands back-to-back and read one reply per command
+
+        The pump answers commands in the order it receives them, so writing
+        them all at once costs a single round trip instead of one per command.
+
+        Args:
+            commands: Command strings without terminator
+            timeout: Seconds to wait for all replies (default: timeout per command)
+
+        Returns:
+            One reply per command, None for replies that didn't arrive
+        """
         if not self.ser or not self.ser.is_open:
-            return None
+            return [None] * len(commands)
+
+        if timeout is None:
+            timeout = self.timeout * len(commands)
 
         try:
             self.ser.reset_input_buffer()
-            cmd = command.strip() + '\r'  # Use \r only, not \r\n
-            self.ser.write(cmd.encode('ascii'))
-            time.sleep(0.1)
-            # Read all available data instead of readline
-            if self.ser.in_waiting > 0:
-                response = self.ser.read(self.ser.in_waiting).decode('ascii', errors='ignore').strip()
-                return response
-            return None
+            self._rx_buffer.clear()
+            # Use \r only, not \r\n
+            self.ser.write(''.join(command.strip() + '\r' for command in commands).encode('ascii'))
+
+            deadline = time.monotonic() + timeout
+            return [self._read_reply(deadline) for _ in commands]
         except Exception:
-            return None
+            return [None] * len(commands)
+
+    def _read_reply(self, deadline: float) -> Optional[str]:
+        """Read up to the next CR, returning as soon as it arrives (None on deadline)"""
+        while True:
+            while b'\r' not in self._rx_buffer:
+                if time.monotonic() >= deadline:
+                    return None
+                # Blocks until at least one byte arrives (or READ_POLL_SECONDS)
+                self._rx_buffer += self.ser.read(self.ser.in_waiting or 1)
+
+            reply, _, rest = self._rx_buffer.partition(b'\r')
+            self._rx_buffer = bytearray(rest)
+            reply = reply.decode('ascii', errors='ignore').strip()
+            if reply:
+                return reply
+            # Skip blank lines (e.g. the LF of a CR LF pair)
+
+    @staticmethod
+    def _parse_field(response: Optional[str], command: str, convert: Callable) -> Optional[float]:
+        """
+        Convert the reply to a query such as "FLOW?"
+
+        Accepts "FLOW:2000" or a bare "2000". A reply naming a different field
+        (a late answer to an earlier command) is rejected rather than misread.
+        """
+        if response:
+            try:
+                if ':' in response:
+                    name, response = response.split(':', 1)
+                    if name.strip() != command.rstrip('?'):
+                        return None
+                return convert(response.replace('mL', '').strip())
+            except ValueError:
+                pass
+        return None
+
+    def _query(self, method_name: str):
+        """Run one of the QUERIES and parse its reply"""
+        command, convert = self.QUERIES[method_name]
+        return self._parse_field(self._send_command(command), command, convert)
+
+    def read_many(self, calls: List[Tuple[str, Dict]]) -> List[Optional[float]]:
+        """
+        Run several get_* reads in one back-to-back exchange
+
+        Args:
+            calls: (method name, kwargs) pairs, e.g. [('get_flow', {})]
+
+        Returns:
+            One value per call. Methods that aren't QUERIES are called one by one.
+        """
+        results = [None] * len(calls)
+        batched = [index for index, (method_name, _) in enumerate(calls) if method_name in self.QUERIES]
+
+        responses = self._send_commands([self.QUERIES[calls[index][0]][0] for index in batched]) if batched else []
+        for index, response in zip(batched, responses):
+            results[index] = self._parse_field(response, *self.QUERIES[calls[index][0]])
+
+        for index, (method_name, kwargs) in enumerate(calls):
+            if method_name not in self.QUERIES:
+                results[index] = getattr(self, method_name)(**kwargs)
+
+        return results
 
     def start(self) -> bool:
         """Start pump flow"""
@@ -80,29 +181,11 @@ class AzuraPumpDriver:
 
     def get_flow(self) -> Optional[float]:
         """Read current flow rate in µL/min"""
-        response = self._send_command("FLOW?")
-        if response:
-            try:
-                # Handle "FLOW:2000" format
-                if ':' in response:
-                    response = response.split(':')[1]
-                return float(response)
-            except ValueError:
-                pass
-        return None
+        return self._query('get_flow')
 
     def get_pressure(self) -> Optional[float]:
         """Read pressure in MPa (only for P 4.1S)"""
-        response = self._send_command("PRESSURE?")
-        if response:
-            try:
-                # Handle "PRESSURE:xxx" format
-                if ':' in response:
-                    response = response.split(':')[1]
-                return float(response) / 10.0  # Convert from 0.1 MPa units
-            except ValueError:
-                pass
-        return None
+        return self._query('get_pressure')
 
     def set_head_type(self, head_type: int) -> bool:
         """Set pump head type (10 or 50)"""
@@ -113,18 +196,7 @@ class AzuraPumpDriver:
 
     def get_head_type(self) -> Optional[int]:
         """Read current pump head type"""
-        response = self._send_command("HEADTYPE?")
-        if response:
-            try:
-                # Handle "HEADTYPE:10" format
-                if ':' in response:
-                    response = response.split(':')[1]
-                # Remove "mL" if present
-                response = response.replace('mL', '').strip()
-                return int(response)
-            except ValueError:
-                pass
-        return None
+        return self._query('get_head_type')
 
     def set_remote_mode(self) -> bool:
         """Enable remote control mode"""
@@ -136,39 +208,30 @@ class AzuraPumpDriver:
 
     def get_motor_current(self) -> Optional[int]:
         """Read motor current (0-100)"""
-        response = self._send_command("IMOTOR?")
-        if response:
-            try:
-                # Handle "IMOTOR:xx" format
-                if ':' in response:
-                    response = response.split(':')[1]
-                return int(response)
-            except ValueError:
-                pass
-        return None
+        return self._query('get_motor_current')
 
     def get_errors(self) -> Optional[str]:
         """Read last 5 error codes"""
         return self._send_command("ERRORS?")
 
     def get_status(self) -> dict:
-        """Get comprehensive pump status"""
+        """Get comprehensive pump status (FLOW?/PRESSURE?/IMOTOR?/HEADTYPE? in one exchange)"""
         status = {}
 
-        flow = self.get_flow()
+        flow, pressure, current, head = self.read_many([
+            ('get_flow', {}), ('get_pressure', {}), ('get_motor_current', {}), ('get_head_type', {})
+        ])
+
         if flow is not None:
             status['flow_ul_min'] = flow
             status['flow_ml_min'] = flow / 1000.0
 
-        pressure = self.get_pressure()
         if pressure is not None:
             status['pressure_mpa'] = pressure
 
-        current = self.get_motor_current()
         if current is not None:
             status['motor_current'] = current
 
-        head = self.get_head_type()
         if head is not None:
             status['head_type_ml'] = head
 
@@ -6,24 +6,46 @@ Compatible with ChemiSuite device architecture
 
 import serial
 import time
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
+
+from simulators import open_serial
 
 
 class IKAHotplateDriver:
     """Driver for IKA RET control-visc heated magnetic stirrer"""
 
-    def __init__(self, port: str, baudrate: int = 9600):
+    # Longest a single serial read blocks; replies are returned as soon as
+    # their CR LF arrives, this only bounds how often the deadline is checked
+    READ_POLL_SECONDS = 0.05
+
+    # Pause after setpoint/start/stop commands before the next write; kept
+    # from the original one-command-at-a-time timing
+    WRITE_GAP_SECONDS = 0.2
+
+    # Commands that can be batched by read_many(), keyed by driver method name
+    QUERY_COMMANDS = {
+        'get_temperature': lambda sensor_type=2: f'IN_PV_{sensor_type}',
+        'get_target_temperature': lambda sensor_type=2: f'IN_SP_{sensor_type}',
+        'get_speed': lambda: 'IN_PV_4',
+        'get_target_speed': lambda: 'IN_SP_4',
+    }
+
+    def __init__(self, port: str, baudrate: int = 9600, response_timeout: float = 1.0):
         """
         Initialize connection to IKA hotplate
 
         Args:
-            port: Serial port (e.g., 'COM3' on Windows, '/dev/ttyUSB0' on Linux)
+            port: Serial port (e.g., 'COM3' on Windows, '/dev/ttyUSB0' on Linux,
+                'sim://ika/1' for a simulated hotplate)
             baudrate: Communication speed (default 9600 as per manual)
+            response_timeout: Seconds to wait for each reply before giving up
         """
         self.port = port
         self.baudrate = baudrate
+        self.response_timeout = response_timeout
         self.ser = None
         self.connected = False
+        self._rx_buffer = bytearray()
 
     def connect(self) -> Tuple[bool, str]:
         """
@@ -33,13 +55,13 @@ class IKAHotplateDriver:
             Tuple of (success: bool, message: str)
         """
         try:
-            self.ser = serial.Serial(
-                port=self.port,
+            self.ser = open_serial(
+                self.port,
                 baudrate=self.baudrate,
                 bytesize=serial.SEVENBITS,
                 parity=serial.PARITY_EVEN,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=1
+                timeout=self.READ_POLL_SECONDS
             )
             time.sleep(0.5)  # Allow connection to stabilize
 
@@ -73,37 +95,159 @@ class IKAHotplateDriver:
             except:
                 pass
 
-    def _send_command(self, command: str) -> str:
+    def _send_command(self, command: str, timeout: Optional[float] = None,
+                      expect_response: bool = True) -> str:
         """
         Send command and receive response
 
         Args:
             command: NAMUR command string
+            timeout: Seconds to wait for the reply (default: response_timeout)
+            expect_response: False for setpoint/start/stop commands, which
+                the device doesn't always answer
 
         Returns:
-            Response from device
+            Response from device ("" on timeout or when no reply is expected)
         """
+        responses = self._exchange([command], timeout, expect_response)
+        return responses[0] if responses else ""
+
+    def query_many(self, commands: List[str], timeout: Optional[float] = None) -> List[str]:
+        """
+        Send several queries in one write and read their replies in order
+
+        The device answers NAMUR commands strictly in sequence, so pipelining
+        saves a full round trip per extra query.
+
+        Args:
+            commands: NAMUR query strings, e.g. ['IN_PV_2', 'IN_PV_4']
+            timeout: Seconds to wait for all replies (default: response_timeout
+                per command)
+
+        Returns:
+            One response per command ("" for replies that didn't arrive)
+        """
+        if timeout is None:
+            timeout = self.response_timeout * len(commands)
+        return self._exchange(commands, timeout)
+
+    def _exchange(self, commands: List[str], timeout: Optional[float] = None,
+                  expect_response: bool = True) -> List[str]:
+        """Write commands and collect one CR LF terminated reply per command"""
         if not self.connected or not self.ser:
-            return ""
+            return [""] * len(commands)
 
         try:
-            # Clear input buffer
+            # Drop stale replies (e.g. late answers to write-only commands)
             self.ser.reset_input_buffer()
-            time.sleep(0.05)
+            self._rx_buffer.clear()
 
-            # Send command with CR LF termination
-            cmd_bytes = (command + '\r\n').encode('ascii')
-            self.ser.write(cmd_bytes)
-            time.sleep(0.15)  # Give device time to respond
+            # Send commands with CR LF termination
+            self.ser.write(''.join(command + '\r\n' for command in commands).encode('ascii'))
 
-            # Read response
-            response = self.ser.readline().decode('ascii', errors='ignore').strip()
+            if not expect_response:
+                self.ser.flush()
+                time.sleep(self.WRITE_GAP_SECONDS)
+                return [""] * len(commands)
 
-            return response
+            deadline = time.monotonic() + (timeout if timeout is not None else self.response_timeout)
+            return [self._read_line(deadline) for _ in commands]
 
         except Exception as e:
             print(f"Communication error: {e}")
-            return ""
+            return [""] * len(commands)
+
+    def _read_line(self, deadline: float) -> str:
+        """
+        Read one reply, returning as soon as its line terminator arrives
+
+        Args:
+            deadline: time.monotonic() value after which to give up
+
+        Returns:
+            Reply without its CR LF, or "" if the deadline passed first
+        """
+        while b'\n' not in self._rx_buffer:
+            if time.monotonic() >= deadline:
+                return ""
+            # Blocks until at least one byte arrives (or READ_POLL_SECONDS)
+            self._rx_buffer += self.ser.read(self.ser.in_waiting or 1)
+
+        line, _, rest = self._rx_buffer.partition(b'\n')
+        self._rx_buffer = bytearray(rest)
+        return line.decode('ascii', errors='ignore').strip()
+
+    @staticmethod
+    def _parse_reply(response: str, command: str, in_order: bool = True) -> Optional[float]:
+        """
+        Extract the value from the reply to a query such as IN_PV_2
+
+        Replies echo the command ("IN_PV_2 25.5"), give the value and the
+        command's channel ("25.5 2") or just the value ("25.5"). Only an echo
+        names the query; the other forms are matched to it by position, which
+        is only reliable while no reply of the exchange went missing
+        (in_order). The channel digit rejects a reply for another channel but
+        can't tell IN_PV_n from IN_SP_n.
+
+        Returns:
+            The value, or None if the reply is missing or can't be matched
+        """
+        if command in response:
+            parts = response.replace(command, '').split()
+        elif not in_order:
+            return None
+        else:
+            parts = response.split()
+            channel = command.rsplit('_', 1)[-1]
+            if len(parts) > 2 or (len(parts) == 2 and parts[1] != channel):
+                return None
+
+        try:
+            return float(parts[0]) if parts else None
+        except ValueError:
+            return None
+
+    @classmethod
+    def _parse_value(cls, response: str, command: str, in_order: bool = True) -> float:
+        """Value of a query reply for the get_* methods (0.0 if it can't be read)"""
+        value = cls._parse_reply(response, command, in_order)
+        return value if value is not None else 0.0
+
+    def read_many(self, calls: List[Tuple[str, Dict]]) -> List[Optional[float]]:
+        """
+        Run several get_* reads in a single pipelined exchange
+
+        Args:
+            calls: (method name, kwargs) pairs, e.g. [('get_temperature',
+                {'sensor_type': 2}), ('get_speed', {})]
+
+        Returns:
+            One value per call. Replies are matched to queries in the order
+            they arrive; if any reply is missing, later ones may be shifted,
+            so only replies echoing their command are used and the rest give
+            None. Methods without a NAMUR query are called one by one.
+        """
+        results = [None] * len(calls)
+        batched = []
+
+        for index, (method_name, kwargs) in enumerate(calls):
+            if method_name in self.QUERY_COMMANDS:
+                batched.append((index, self.QUERY_COMMANDS[method_name](**kwargs)))
+            else:
+                results[index] = getattr(self, method_name)(**kwargs)
+
+        if batched:
+            responses = self.query_many([command for _, command in batched])
+            in_order = all(responses)
+            for (index, command), response in zip(batched, responses):
+                results[index] = self._parse_reply(response, command, in_order)
+
+        return results
+
+    def get_temperature_and_speed(self, sensor_type: int = 2) -> Tuple[Optional[float], Optional[float]]:
+        """Get current temperature (°C) and stirring speed (RPM) in one exchange (None if unread)"""
+        temp, speed = self.read_many([('get_temperature', {'sensor_type': sensor_type}), ('get_speed', {})])
+        return temp, speed
 
     def get_device_name(self) -> str:
         """Get device identification"""
@@ -133,7 +277,7 @@ class IKAHotplateDriver:
         if not 0 <= temp <= 340:
             return False
 
-        self._send_command(f'OUT_SP_{sensor_type} {temp}')
+        self._send_command(f'OUT_SP_{sensor_type} {temp}', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     def get_temperature(self, sensor_type: int = 2) -> float:
@@ -146,51 +290,22 @@ class IKAHotplateDriver:
         Returns:
             Current temperature in °C
         """
-        response = self._send_command(f'IN_PV_{sensor_type}')
-        try:
-            # Response format should be like "IN_PV_2 25.5" or just "25.5"
-            # Remove the command echo if present
-            response = response.replace(f'IN_PV_{sensor_type}', '').strip()
-
-            # Try to extract the numeric value
-            parts = response.split()
-            for part in parts:
-                try:
-                    value = float(part)
-                    return value
-                except ValueError:
-                    continue
-
-            return 0.0
-        except Exception:
-            return 0.0
+        command = f'IN_PV_{sensor_type}'
+        return self._parse_value(self._send_command(command), command)
 
     def get_target_temperature(self, sensor_type: int = 2) -> float:
         """Get target temperature setpoint"""
-        response = self._send_command(f'IN_SP_{sensor_type}')
-        try:
-            response = response.replace(f'IN_SP_{sensor_type}', '').strip()
-
-            parts = response.split()
-            for part in parts:
-                try:
-                    value = float(part)
-                    return value
-                except ValueError:
-                    continue
-
-            return 0.0
-        except Exception:
-            return 0.0
+        command = f'IN_SP_{sensor_type}'
+        return self._parse_value(self._send_command(command), command)
 
     def start_heating(self, sensor_type: int = 2) -> bool:
         """Start heating function"""
-        self._send_command(f'START_{sensor_type}')
+        self._send_command(f'START_{sensor_type}', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     def stop_heating(self, sensor_type: int = 2) -> bool:
         """Stop heating function"""
-        self._send_command(f'STOP_{sensor_type}')
+        self._send_command(f'STOP_{sensor_type}', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     # Stirring control (X=4)
@@ -208,53 +323,25 @@ class IKAHotplateDriver:
         if not 0 <= rpm <= 1700:
             return False
 
-        self._send_command(f'OUT_SP_4 {rpm}')
+        self._send_command(f'OUT_SP_4 {rpm}', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     def get_speed(self) -> float:
         """Get current stirring speed in RPM"""
-        response = self._send_command('IN_PV_4')
-        try:
-            response = response.replace('IN_PV_4', '').strip()
-
-            parts = response.split()
-            for part in parts:
-                try:
-                    value = float(part)
-                    return value
-                except ValueError:
-                    continue
-
-            return 0.0
-        except Exception:
-            return 0.0
+        return self._parse_value(self._send_command('IN_PV_4'), 'IN_PV_4')
 
     def get_target_speed(self) -> float:
         """Get target speed setpoint"""
-        response = self._send_command('IN_SP_4')
-        try:
-            response = response.replace('IN_SP_4', '').strip()
-
-            parts = response.split()
-            for part in parts:
-                try:
-                    value = float(part)
-                    return value
-                except ValueError:
-                    continue
-
-            return 0.0
-        except Exception:
-            return 0.0
+        return self._parse_value(self._send_command('IN_SP_4'), 'IN_SP_4')
 
     def start_stirring(self) -> bool:
         """Start stirring motor"""
-        self._send_command('START_4')
+        self._send_command('START_4', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     def stop_stirring(self) -> bool:
         """Stop stirring motor"""
-        self._send_command('STOP_4')
+        self._send_command('STOP_4', expect_response=False)
         return True  # Command was sent, device doesn't always respond
 
     # Safety and monitoring
@@ -266,9 +353,11 @@ class IKAHotplateDriver:
         Returns:
             Tuple of (temperature, speed, viscosity_trend)
         """
-        temp = self.get_temperature(2)  # Use hotplate temp
-        speed = self.get_speed()
-        visc_response = self._send_command('IN_PV_5')
+        # One pipelined exchange: hotplate temp, speed, viscosity trend
+        temp_response, speed_response, visc_response = self.query_many(['IN_PV_2', 'IN_PV_4', 'IN_PV_5'])
+        in_order = bool(temp_response and speed_response and visc_response)
+        temp = self._parse_value(temp_response, 'IN_PV_2', in_order)
+        speed = self._parse_value(speed_response, 'IN_PV_4', in_order)
         try:
             parts = visc_response.split()
             if len(parts) >= 2:
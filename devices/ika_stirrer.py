@@ -5,6 +5,7 @@ import sys
 import asyncio
 sys.path.append(os.path.join(os.path.dirname(__file__), 'drivers'))
 from IKA_Hotplate_driver import IKAHotplateDriver
+from telemetry import telemetry
 
 def render_device_webcam_section(device):
     """Render webcam monitoring section for a device"""
@@ -206,13 +207,19 @@ def get_loggable_parameters():
             'method': 'get_temperature',
             'unit': '°C',
             'args': {'sensor_type': 2},
-            'display_name': 'Temperature'
+            'display_name': 'Temperature',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         },
         'speed': {
             'method': 'get_speed',
             'unit': 'RPM',
             'args': {},
-            'display_name': 'Stirring Speed'
+            'display_name': 'Stirring Speed',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         }
     }
 
@@ -311,6 +318,9 @@ def render_control_panel(device, on_edit=None, on_remove=None):
         device['connection_state'] = {'connected': False, 'heating': False, 'stirring': False}
     connection_state = device['connection_state']
 
+    # Commands go through the telemetry queue so they never collide with polling
+    commands = telemetry.commands(device)
+
     with ui.column().style("width: 100%; gap: 0;"):
         # Sticky header with device name, COM port, and remove button
         with ui.row().style("position: sticky; top: 0; z-index: 10; width: 100%; justify-content: space-between; align-items: center; padding: 20px; background-color: #222222; border-bottom: 1px solid #444444;"):
@@ -339,16 +349,17 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                         if connection_state['connected']:
                             # Safety: Stop heating and stirring before disconnecting
                             try:
-                                driver.set_temperature(0, sensor_type=2)
-                                driver.stop_heating(sensor_type=2)
-                                driver.set_speed(0)
-                                driver.stop_stirring()
+                                commands.set_temperature(0, sensor_type=2)
+                                commands.stop_heating(sensor_type=2)
+                                commands.set_speed(0)
+                                commands.stop_stirring()
                                 connection_state['heating'] = False
                                 connection_state['stirring'] = False
                             except Exception as e:
                                 print(f"Error stopping device during disconnect: {e}")
 
                             # Disconnect
+                            telemetry.unregister(device['name'])
                             driver.disconnect()
                             connection_state['connected'] = False
                             connection_badge.set_text("Disconnected")
@@ -361,6 +372,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                             success, message = driver.connect()
                             if success:
                                 connection_state['connected'] = True
+                                telemetry.register(device)
                                 connection_badge.set_text("Connected")
                                 connection_badge.props(f"color=green")
                                 connect_btn.set_text("Disconnect")
@@ -399,8 +411,8 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                                     ui.notify("Please connect to device first", type='warning')
                                     return
 
-                                driver.set_temperature(0, sensor_type=2)
-                                driver.stop_heating(sensor_type=2)
+                                commands.set_temperature(0, sensor_type=2)
+                                commands.stop_heating(sensor_type=2)
                                 connection_state['heating'] = False
                                 ui.notify("Heating stopped", type='info')
 
@@ -419,8 +431,8 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                                     ui.notify("Please connect to device first", type='warning')
                                     return
 
-                                driver.set_speed(0)
-                                driver.stop_stirring()
+                                commands.set_speed(0)
+                                commands.stop_stirring()
                                 connection_state['stirring'] = False
                                 ui.notify("Stirring stopped", type='info')
 
@@ -440,11 +452,11 @@ def render_control_panel(device, on_edit=None, on_remove=None):
 
                         # Set temperature
                         temp_value = temp_slider.value
-                        temp_success = driver.set_temperature(temp_value, sensor_type=2)
+                        temp_success = commands.set_temperature(temp_value, sensor_type=2)
 
                         # Only start heating if temp > minimum (25°C), otherwise stop
                         if temp_value > 25:
-                            heat_success = driver.start_heating(sensor_type=2)
+                            heat_success = commands.start_heating(sensor_type=2)
                             if temp_success and heat_success:
                                 connection_state['heating'] = True
                                 ui.notify(f"Setting temperature to {temp_value}°C", type='positive')
@@ -452,7 +464,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                                 ui.notify("Failed to set temperature", type='negative')
                         else:
                             # Stop heating when at minimum temperature
-                            driver.stop_heating(sensor_type=2)
+                            commands.stop_heating(sensor_type=2)
                             connection_state['heating'] = False
                             ui.notify("Heating stopped", type='info')
 
@@ -470,11 +482,11 @@ def render_control_panel(device, on_edit=None, on_remove=None):
 
                         # Set speed
                         speed_value = int(speed_slider.value)
-                        speed_success = driver.set_speed(speed_value)
+                        speed_success = commands.set_speed(speed_value)
 
                         # Only start stirring if speed > 0, otherwise stop
                         if speed_value > 0:
-                            stir_success = driver.start_stirring()
+                            stir_success = commands.start_stirring()
                             if speed_success and stir_success:
                                 connection_state['stirring'] = True
                                 ui.notify(f"Setting stirrer speed to {speed_value} RPM", type='positive')
@@ -482,7 +494,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                                 ui.notify("Failed to set speed", type='negative')
                         else:
                             # Stop stirring when speed is 0
-                            driver.stop_stirring()
+                            commands.stop_stirring()
                             connection_state['stirring'] = False
                             ui.notify("Stirring stopped", type='info')
 
@@ -495,11 +507,12 @@ def render_control_panel(device, on_edit=None, on_remove=None):
     def update_readings():
         if connection_state['connected']:
             try:
-                temp = driver.get_temperature(sensor_type=2)
-                speed = driver.get_speed()
+                # Latest values from the shared telemetry poll - no serial I/O here
+                temp = telemetry.get_value(device['name'], 'temperature')
+                speed = telemetry.get_value(device['name'], 'speed')
 
-                temp_value_label.set_text(f"{temp:.1f}" if temp > 0 else "--")
-                speed_value_label.set_text(f"{speed:.0f}" if speed >= 0 else "--")
+                temp_value_label.set_text(f"{temp:.1f}" if temp is not None and temp > 0 else "--")
+                speed_value_label.set_text(f"{speed:.0f}" if speed is not None and speed >= 0 else "--")
             except Exception as e:
                 print(f"Error updating readings: {e}")
 
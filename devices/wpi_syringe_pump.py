@@ -4,6 +4,7 @@ WPI Syringe Pump device module for ChemiSuite
 """
 from nicegui import ui
 import os
+from telemetry import telemetry
 
 
 def get_device_info():
@@ -25,19 +26,28 @@ def get_loggable_parameters():
             'method': 'get_flow_rate',
             'unit': 'µL/min',
             'args': {},
-            'display_name': 'Flow Rate'
+            'display_name': 'Flow Rate',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         },
         'volume_dispensed': {
             'method': 'get_volume_dispensed',
             'unit': 'µL',
             'args': {},
-            'display_name': 'Volume Dispensed'
+            'display_name': 'Volume Dispensed',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         },
         'pump_status': {
             'method': 'get_pump_status',
             'unit': '',
             'args': {},
-            'display_name': 'Pump Status'
+            'display_name': 'Pump Status',
+            'interval': None,
+            'deadband': None,
+            'heartbeat': None
         }
     }
 
@@ -152,6 +162,8 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                         if not connection_state['connected']:
                             # Connect (placeholder)
                             connection_state['connected'] = True
+                            if device['driver'] is not None:
+                                telemetry.register(device)
                             connection_state['status_label'].set_text("Connected")
                             connection_state['status_label'].style("color: #66bb6a; font-weight: bold;")
                             connection_state['connect_button'].props("color=negative")
@@ -159,6 +171,7 @@ def render_control_panel(device, on_edit=None, on_remove=None):
                             ui.notify(f"Connected to {device['name']} (driver not implemented)", type='info')
                         else:
                             # Disconnect (placeholder)
+                            telemetry.unregister(device['name'])
                             connection_state['connected'] = False
                             connection_state['status_label'].set_text("Disconnected")
                             connection_state['status_label'].style("color: #ef5350; font-weight: bold;")
@@ -6,6 +6,7 @@ Shows all messages being broadcast by ChemiSuite
 
 import paho.mqtt.client as mqtt
 import json
+import zlib
 from datetime import datetime
 
 # Configuration - UPDATE THESE WITH YOUR HIVEMQ DETAILS
@@ -15,6 +16,45 @@ USERNAME = "chemisuite"  # Replace with your username
 PASSWORD = "arcLAB25"  # Replace with your password
 TOPIC_PREFIX = "chemisuite"  # Must match ChemiSuite configuration
 
+# Latest {prefix}/lab/schema message, needed to decode snapshot payloads
+lab_schema = {}
+
+def decode_snapshot(payload: bytes, schema: dict) -> dict:
+    """Decode a {prefix}/lab/snapshot payload into named fields using its schema"""
+    payload_format = schema.get('format', 'snapshot')
+    if payload_format == 'snapshot-msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack not installed. Run: pip install msgpack")
+        snapshot = msgpack.unpackb(payload)
+    elif payload_format == 'snapshot-zlib':
+        snapshot = json.loads(zlib.decompress(payload))
+    else:
+        snapshot = json.loads(payload)
+
+    devices = schema.get('devices', {})
+    return {
+        'timestamp': snapshot['t'],
+        'fume_hoods': {
+            hood_id: {**schema.get('hoods', {}).get(hood_id, {}), **dict(zip(schema['hood_fields'], values))}
+            for hood_id, values in snapshot['h'].items()
+        },
+        'devices': {
+            name: {
+                'type': devices.get(name, {}).get('type'),
+                'hoods': devices.get(name, {}).get('hoods', []),
+                **{f"{field} [{unit}]": value for field, unit, value
+                   in zip(devices.get(name, {}).get('fields', []), devices.get(name, {}).get('units', []), values)}
+            }
+            for name, values in snapshot['d'].items()
+        },
+        'motors': {
+            motor: dict(zip(schema['motor_fields'], values))
+            for motor, values in snapshot['m'].items()
+        },
+    }
+
 def on_connect(client, userdata, flags, rc):
     """Callback when connected to MQTT broker"""
     if rc == 0:
@@ -29,19 +69,29 @@ def on_connect(client, userdata, flags, rc):
 def on_message(client, userdata, msg):
     """Callback when a message is received"""
     try:
-        # Parse JSON data
-        data = json.loads(msg.payload.decode())
+        if msg.topic.endswith('/lab/schema'):
+            lab_schema.clear()
+            lab_schema.update(json.loads(msg.payload.decode()))
+            data = lab_schema
+        elif msg.topic.endswith('/lab/snapshot'):
+            if not lab_schema:
+                print(f"\n⏳ Snapshot on {msg.topic} ({len(msg.payload)} bytes) - waiting for schema")
+                return
+            data = decode_snapshot(msg.payload, lab_schema)
+        else:
+            # Parse JSON data
+            data = json.loads(msg.payload.decode())
 
         # Format timestamp
         timestamp = datetime.now().strftime("%H:%M:%S")
 
         # Print topic and data
-        print(f"\n[{timestamp}] 📨 Topic: {msg.topic}")
+        print(f"\n[{timestamp}] 📨 Topic: {msg.topic} ({len(msg.payload)} bytes)")
         print(f"Data: {json.dumps(data, indent=2)}")
         print("-" * 80)
 
     except json.JSONDecodeError:
-        print(f"\n❌ Invalid JSON on topic {msg.topic}: {msg.payload.decode()}")
+        print(f"\n❌ Invalid JSON on topic {msg.topic}: {msg.payload.decode(errors='replace')}")
     except Exception as e:
         print(f"\n❌ Error processing message: {e}")
 
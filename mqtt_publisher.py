@@ -0,0 +1,534 @@
+"""
+Asynchronous MQTT publisher for ChemiSuite
+Owns the broker connection on its own asyncio loop: reconnects with
+exponential backoff, bounds the QoS 1 messages awaiting PUBACK and
+rate-limits each topic, so callers only hand it messages
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Return codes, as in paho-mqtt
+MQTT_ERR_SUCCESS = 0
+MQTT_ERR_NO_CONN = 4
+MQTT_ERR_QUEUE_SIZE = 15
+
+CONNACK_ERRORS = {
+    1: "Incorrect protocol version",
+    2: "Invalid client identifier",
+    3: "Server unavailable",
+    4: "Bad username or password",
+    5: "Not authorized"
+}
+# Refusals that retrying won't fix
+PERMANENT_CONNACK_ERRORS = {1, 2, 4, 5}
+
+# A connection that lasted this long resets the reconnect backoff
+STABLE_CONNECTION_SECONDS = 10.0
+
+
+class BrokerRefused(ConnectionError):
+    """The broker answered CONNECT with a non-zero CONNACK code"""
+
+    def __init__(self, rc: int):
+        self.rc = rc
+        super().__init__(CONNACK_ERRORS.get(rc, f"Unknown error code {rc}"))
+
+
+class PublishHandle:
+    """Result of MQTTPublisher.publish(), shaped like paho's MQTTMessageInfo"""
+
+    def __init__(self, rc: int = MQTT_ERR_SUCCESS):
+        self.rc = rc
+        self.superseded = False  # Replaced by a newer message on the same topic before it was sent
+        self._done = threading.Event()
+
+    def is_published(self) -> bool:
+        """True once the broker acknowledged the message (QoS 1) or it was written out (QoS 0)"""
+        return self._done.is_set() and not self.superseded
+
+    def wait_for_publish(self, timeout: Optional[float] = None) -> bool:
+        """Block until the message is published or superseded"""
+        return self._done.wait(timeout) and not self.superseded
+
+
+class _Message:
+    """One message on its way to the broker"""
+    __slots__ = ('topic', 'payload', 'qos', 'retain', 'coalesce', 'handle', 'submitted')
+
+    def __init__(self, topic: str, payload, qos: int, retain: bool, coalesce: bool, handle: PublishHandle):
+        self.topic = topic
+        self.payload = payload
+        self.qos = qos
+        self.retain = retain
+        self.coalesce = coalesce
+        self.handle = handle
+        self.submitted = time.perf_counter()
+
+
+class PahoConnection:
+    """
+    Connection to a real broker (e.g. Mosquitto or HiveMQ) through paho-mqtt
+
+    Each instance is used for one connection attempt; MQTTPublisher asks
+    its factory for a new one after every disconnect.
+    """
+
+    def __init__(self, host: str, port: int = 1883, username: str = '', password: str = '', tls: bool = False,
+                 client_id: Optional[str] = None, keepalive: int = 60, timeout: float = 10.0):
+        """
+        Args:
+            host: Broker host name
+            port: Broker port
+            username: Optional user name
+            password: Optional password
+            tls: Connect over TLS with the system CA certificates
+            client_id: MQTT client id (default: chemisuite_<time>)
+            keepalive: Keepalive interval in seconds
+            timeout: Seconds to wait for the CONNACK
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.tls = tls
+        self.client_id = client_id or f"chemisuite_{int(time.time())}"
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._client = None
+
+    def connect(self, on_ack: Callable[[int], None], on_lost: Callable[[str], None]):
+        """
+        Connect and wait for the CONNACK (blocking)
+
+        Args:
+            on_ack: Called with the mid of every message the broker took
+            on_lost: Called with a reason when the connection drops
+
+        Raises:
+            BrokerRefused, TimeoutError or OSError if no connection was made
+        """
+        import paho.mqtt.client as mqtt
+
+        client = mqtt.Client(client_id=self.client_id)
+        if self.username and self.password:
+            client.username_pw_set(self.username, self.password)
+        if self.tls:
+            client.tls_set()
+
+        connack = {}
+        answered = threading.Event()
+
+        def on_connect(client, userdata, flags, rc):
+            connack['rc'] = rc
+            answered.set()
+
+        client.on_connect = on_connect
+        client.on_publish = lambda client, userdata, mid: on_ack(mid)
+        client.on_disconnect = lambda client, userdata, rc: on_lost(f"Disconnected (rc {rc})")
+
+        client.connect(self.host, self.port, self.keepalive)
+        client.loop_start()
+        self._client = client
+
+        if not answered.wait(self.timeout):
+            self.close()
+            raise TimeoutError(f"No answer from {self.host}:{self.port} within {self.timeout} s")
+        if connack['rc'] != 0:
+            self.close()
+            raise BrokerRefused(connack['rc'])
+
+    def publish(self, topic: str, payload, qos: int, retain: bool) -> int:
+        """Hand one message to paho and return its mid (raises ConnectionError if it can't be sent)"""
+        info = self._client.publish(topic, payload, qos=qos, retain=retain)
+        if info.rc != 0:
+            raise ConnectionError(f"Publish failed (rc {info.rc})")
+        return info.mid
+
+    def close(self):
+        """Disconnect and stop paho's network thread"""
+        if self._client is None:
+            return
+        try:
+            self._client.disconnect()
+            self._client.loop_stop()
+        except Exception:
+            pass
+        self._client = None
+
+
+class MQTTPublisher:
+    """
+    Publishes messages through one broker connection managed on an asyncio loop
+
+    publish() can be called from any thread. Messages wait in memory until
+    the connection is up and their topic may send again: a topic sends at
+    most topic_rate messages per second, and a newer message for a topic
+    still waiting replaces the older one. At most max_inflight QoS 1
+    messages await their PUBACK at once; those unacknowledged when the
+    connection drops are sent again after reconnecting. Reconnects wait
+    between backoff_initial and backoff_max seconds, doubling after each
+    failed attempt.
+    """
+
+    def __init__(self, connection_factory: Callable[[], object], max_inflight: int = 20, max_queue: int = 10000,
+                 topic_rate: Optional[float] = 10.0, backoff_initial: float = 1.0, backoff_max: float = 60.0,
+                 on_connect: Optional[Callable[[], None]] = None,
+                 on_disconnect: Optional[Callable[[str], None]] = None,
+                 on_connect_failed: Optional[Callable[[str, bool], None]] = None):
+        """
+        Args:
+            connection_factory: Returns a new, unconnected PahoConnection (or
+                another object with connect/publish/close, e.g. a FakeBroker
+                connection) for each attempt
+            max_inflight: Most QoS 1 messages awaiting PUBACK at once
+            max_queue: Most messages waiting to be sent; publish() refuses more
+            topic_rate: Most messages per second per topic (None: unlimited)
+            backoff_initial: Seconds before the first reconnect attempt
+            backoff_max: Longest wait between reconnect attempts
+            on_connect: Called on the publisher loop after each connect
+            on_disconnect: Called with the reason when an established connection drops
+            on_connect_failed: Called with the error and whether it is permanent
+                (e.g. bad credentials, after which no more attempts are made)
+        """
+        self.connection_factory = connection_factory
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.topic_rate = topic_rate
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.on_connect_failed = on_connect_failed
+
+        self.connected = False
+        self.last_error = None
+        self.next_attempt = None  # time.monotonic() of the next reconnect attempt while backing off
+
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._connection = None
+        self._generation = 0  # Bumped per connection so late callbacks from an old one are ignored
+
+        # Waiting messages, guarded by _lock: rate-limited topics keep only
+        # their latest message, scheduled in _schedule by when they may send;
+        # uncoalesced messages (e.g. replayed history) wait in _fifo
+        self._lock = threading.Lock()
+        self._pending = {}     # topic -> _Message
+        self._schedule = []    # heap of (send-at monotonic, sequence, topic)
+        self._fifo = deque()
+        self._sequence = itertools.count()
+        self._last_sent = {}   # topic -> time.monotonic() of its last send
+
+        # Sent messages awaiting the broker (publisher loop only)
+        self._inflight = {}    # mid -> _Message
+        self._inflight_qos = 0
+
+        # Statistics
+        self.published = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.resent = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.connect_failures = 0
+        self._latencies = deque(maxlen=1000)
+
+    def start(self):
+        """Start the publisher loop thread and connect"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),),
+                                        daemon=True, name="MQTT-Publisher")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Disconnect and stop the loop; messages still waiting are discarded"""
+        if self._thread is None:
+            return
+        if self._ready.wait(timeout):
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._thread = None
+        self.connected = False
+
+    def run_coroutine(self, coroutine):
+        """
+        Run a coroutine on the publisher loop (e.g. a periodic producer)
+
+        Returns:
+            concurrent.futures.Future of its result; cancel() stops it
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def publish(self, topic: str, payload, qos: int = 0, retain: bool = False, coalesce: bool = True) -> PublishHandle:
+        """
+        Queue a message for the broker (thread-safe)
+
+        Args:
+            topic: Full topic
+            payload: str or bytes
+            qos: 0 or 1
+            retain: Retain flag
+            coalesce: Apply the per-topic rate limit, replacing a message
+                still waiting on the same topic; False sends every message
+                in order (for replaying history)
+
+        Returns:
+            PublishHandle whose rc is MQTT_ERR_NO_CONN while disconnected and
+            MQTT_ERR_QUEUE_SIZE when max_queue messages are already waiting
+        """
+        if not self.connected:
+            return PublishHandle(MQTT_ERR_NO_CONN)
+
+        handle = PublishHandle()
+        message = _Message(topic, payload, qos, retain, coalesce, handle)
+        with self._lock:
+            previous = self._pending.get(topic) if coalesce else None
+            if previous is not None:
+                # Keeps the previous message's place in the schedule
+                previous.handle.superseded = True
+                previous.handle._done.set()
+                self._pending[topic] = message
+                self.coalesced += 1
+                return handle
+
+            if len(self._pending) + len(self._fifo) >= self.max_queue:
+                self.dropped += 1
+                return PublishHandle(MQTT_ERR_QUEUE_SIZE)
+
+            if coalesce:
+                self._pending[topic] = message
+                heapq.heappush(self._schedule, (self._send_at(topic), next(self._sequence), topic))
+            else:
+                self._fifo.append(message)
+
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+        return handle
+
+    def _send_at(self, topic: str) -> float:
+        """Earliest time.monotonic() at which topic may send again"""
+        if not self.topic_rate or topic not in self._last_sent:
+            return 0.0
+        return self._last_sent[topic] + 1.0 / self.topic_rate
+
+    def get_stats(self) -> Dict:
+        """Connection state, queue depth, drops and publish latency (submit to PUBACK for QoS 1)"""
+        with self._lock:
+            depth = len(self._pending) + len(self._fifo)
+        latencies = sorted(self._latencies)
+
+        def percentile(pct):
+            return round(latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))], 2) if latencies else None
+
+        return {
+            'connected': self.connected,
+            'reconnect_in_s': round(max(0.0, self.next_attempt - time.monotonic()), 1)
+            if self.next_attempt is not None else None,
+            'last_error': self.last_error,
+            'queue_depth': depth,
+            'inflight': self._inflight_qos,
+            'published': self.published,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'resent': self.resent,
+            'connects': self.connects,
+            'disconnects': self.disconnects,
+            'connect_failures': self.connect_failures,
+            'latency_ms': {
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'max': round(latencies[-1], 2) if latencies else None,
+            },
+        }
+
+    async def _run(self):
+        """Publisher loop: keep the connection up and send until stop()"""
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._up = asyncio.Event()
+        self._lost = asyncio.Event()
+        self._ready.set()
+
+        tasks = [asyncio.ensure_future(self._maintain_connection()), asyncio.ensure_future(self._send_messages())]
+        await self._stopping.wait()
+
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._close_connection()
+
+    async def _maintain_connection(self):
+        """Connect, wait for the connection to drop, back off and reconnect"""
+        loop = asyncio.get_running_loop()
+        delay = self.backoff_initial
+
+        while True:
+            self._generation += 1
+            generation = self._generation
+            connection = self.connection_factory()
+            try:
+                await loop.run_in_executor(None, connection.connect,
+                                           lambda mid: loop.call_soon_threadsafe(self._on_ack, generation, mid),
+                                           lambda reason: loop.call_soon_threadsafe(self._on_lost, generation, reason))
+            except asyncio.CancelledError:
+                connection.close()
+                raise
+            except Exception as e:
+                self.connect_failures += 1
+                self.last_error = str(e) or type(e).__name__
+                permanent = isinstance(e, ImportError) or \
+                    (isinstance(e, BrokerRefused) and e.rc in PERMANENT_CONNACK_ERRORS)
+                print(f"MQTT connection failed: {self.last_error}")
+                self._notify(self.on_connect_failed, self.last_error, permanent)
+                if permanent:
+                    return
+            else:
+                self._connection = connection
+                self._lost.clear()
+                self.connected = True
+                self.last_error = None
+                self.connects += 1
+                self._up.set()
+                self._notify(self.on_connect)
+                self._wakeup.set()
+
+                connected_at = time.monotonic()
+                await self._lost.wait()
+
+                self._up.clear()
+                self.connected = False
+                self.disconnects += 1
+                self._close_connection()
+                self._requeue_inflight()
+                self._notify(self.on_disconnect, self.last_error)
+                if time.monotonic() - connected_at >= STABLE_CONNECTION_SECONDS:
+                    delay = self.backoff_initial
+
+            # Full jitter keeps a lab of clients from reconnecting in lockstep
+            wait = random.uniform(delay / 2, delay)
+            self.next_attempt = time.monotonic() + wait
+            await asyncio.sleep(wait)
+            self.next_attempt = None
+            delay = min(delay * 2, self.backoff_max)
+
+    async def _send_messages(self):
+        """Send waiting messages whenever the connection, rate limits and in-flight window allow"""
+        while True:
+            await self._up.wait()
+            self._wakeup.clear()
+            message, wait = self._next_message()
+            if message is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                mid = self._connection.publish(message.topic, message.payload, message.qos, message.retain)
+            except Exception as e:
+                self._requeue([message])
+                self._on_lost(self._generation, str(e))
+                self._up.clear()
+                continue
+
+            self._last_sent[message.topic] = time.monotonic()
+            self._inflight[mid] = message
+            self._inflight_qos += message.qos > 0
+            # Let acks and publish() callers in between messages
+            await asyncio.sleep(0)
+
+    def _next_message(self) -> Tuple[Optional[_Message], Optional[float]]:
+        """
+        Take the next message that may be sent now
+
+        Returns:
+            (message, None), or (None, seconds until a rate-limited topic
+            may send) with None meaning until the next wakeup
+        """
+        window_open = self._inflight_qos < self.max_inflight
+        with self._lock:
+            if self._fifo and (window_open or not self._fifo[0].qos):
+                return self._fifo.popleft(), None
+
+            if self._schedule:
+                send_at, _, topic = self._schedule[0]
+                wait = send_at - time.monotonic()
+                if wait > 0:
+                    return None, wait
+                if self._pending[topic].qos and not window_open:
+                    return None, None
+                heapq.heappop(self._schedule)
+                return self._pending.pop(topic), None
+        return None, None
+
+    def _on_ack(self, generation: int, mid: int):
+        """The broker took message mid (publisher loop)"""
+        if generation != self._generation:
+            return
+        message = self._inflight.pop(mid, None)
+        if message is None:
+            return
+        if message.qos:
+            self._inflight_qos -= 1
+            self._wakeup.set()
+        self.published += 1
+        self._latencies.append((time.perf_counter() - message.submitted) * 1000)
+        message.handle._done.set()
+
+    def _on_lost(self, generation: int, reason: str):
+        """The connection dropped (publisher loop)"""
+        if generation == self._generation and self.connected and not self._lost.is_set():
+            self.last_error = reason
+            self._lost.set()
+
+    def _requeue_inflight(self):
+        """Put unacknowledged QoS 1 messages back in front of the queue; QoS 0 ones are gone"""
+        unacked = [message for message in self._inflight.values() if message.qos]
+        for message in self._inflight.values():
+            if not message.qos:
+                message.handle._done.set()
+        self._inflight = {}
+        self._inflight_qos = 0
+        self.resent += len(unacked)
+        self._requeue(unacked)
+
+    def _requeue(self, messages: List[_Message]):
+        """Return messages that were taken but not sent, oldest first, ahead of the waiting ones"""
+        with self._lock:
+            for message in reversed(messages):
+                if message.coalesce and message.topic in self._pending:
+                    # A newer message on the topic is already waiting
+                    message.handle.superseded = True
+                    message.handle._done.set()
+                    continue
+                self._fifo.appendleft(message)
+
+    def _close_connection(self):
+        """Close the current connection, if any"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _notify(self, callback: Optional[Callable], *args):
+        """Run a user callback without letting it break the loop"""
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"MQTT publisher callback error: {e}")
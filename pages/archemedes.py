@@ -3,9 +3,37 @@
 from nicegui import ui
 import json
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import time
-import threading
+import asyncio
+import zlib
+from telemetry import telemetry
+from database.publish_queue import PublishQueue, EVICTION_POLICIES
+from mqtt_publisher import MQTTPublisher, PahoConnection
+
+# Device values are published once per cycle; sash and motor state is
+# checked in between so their changes go out without waiting for a cycle
+PUBLISH_INTERVAL_SECONDS = 2.0
+EVENT_POLL_SECONDS = 0.1
+
+# Delta mode: how far a payload field must move before its topic is
+# republished. Fields not listed republish on any change; pressure is a
+# fraction of the last published value since it spans decades under vacuum
+DEFAULT_DELTA_THRESHOLDS = {'temperature': 0.2, 'stir_speed': 5.0, 'pressure': 0.02, 'angle': 1.0}
+RELATIVE_THRESHOLDS = {'pressure'}
+
+# Payload formats: one JSON message per topic, or one snapshot of the whole
+# lab per cycle on {prefix}/lab/snapshot (described by {prefix}/lab/schema)
+PAYLOAD_FORMATS = {
+    'json': 'JSON per topic',
+    'snapshot': 'Lab snapshot (JSON)',
+    'snapshot-zlib': 'Lab snapshot (compressed JSON)',
+    'snapshot-msgpack': 'Lab snapshot (MessagePack)',
+}
+
+# Offline queue: where it lives and how fast it is drained after a reconnect
+QUEUE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'archemedes_queue.db')
+DRAIN_MAX_INFLIGHT = 20  # Queued messages awaiting PUBACK at once
 
 # Global state
 archemedes_state = {
@@ -16,10 +44,38 @@ archemedes_state = {
     'username': '',
     'password': '',
     'topic_prefix': 'chemisuite',
+    'publish_mode': 'delta',  # 'delta': changed topics plus heartbeats, 'full': every topic every cycle
+    'heartbeat_seconds': 30,
+    'delta_thresholds': dict(DEFAULT_DELTA_THRESHOLDS),
+    'last_published': {},  # topic -> (payload, time.monotonic() when sent)
+    'payload_format': 'json',
+    'last_schema': None,  # Last schema JSON sent in snapshot formats
+    'queue_enabled': True,  # Buffer messages on disk while the broker is unreachable
+    'queue_max_messages': 50000,
+    'queue_max_mb': 50,
+    'queue_eviction': 'drop_oldest',
+    'drain_rate': 20,  # Queued messages sent per second after reconnecting
+    'topic_rate': 10,  # Most messages per second on any one topic
+    'queue': None,
+    'inflight': {},  # Queue row id -> MQTTMessageInfo of drained messages awaiting PUBACK
+    'drain_tokens': 0.0,
+    'drain_time': None,
+    'resync': False,  # Set on (re)connect; the publish thread then resends everything
     'publish_timer': None,
-    'publish_thread': None,
-    'stop_publishing_event': None,
+    'publish_task': None,  # Future of publish_loop() running on the MQTT publisher loop
     'status_label': None,
+    # Publish-cycle latency and volume, updated by publish_data()
+    'publish_stats': {
+        'cycles': 0,
+        'messages': 0,
+        'skipped': 0,
+        'events': 0,
+        'bytes': 0,
+        'last_cycle_ms': None,
+        'max_cycle_ms': 0.0,
+        'total_cycle_ms': 0.0,
+        'max_reading_age_s': None,
+    },
     'config_file': os.path.join(os.path.dirname(os.path.dirname(__file__)), 'archemedes_config.json')
 }
 
@@ -34,6 +90,21 @@ def load_config():
                 archemedes_state['username'] = config.get('username', '')
                 archemedes_state['password'] = config.get('password', '')
                 archemedes_state['topic_prefix'] = config.get('topic_prefix', 'chemisuite')
+                archemedes_state['publish_mode'] = config.get('publish_mode', 'delta')
+                archemedes_state['heartbeat_seconds'] = config.get('heartbeat_seconds', 30)
+                archemedes_state['payload_format'] = config.get('payload_format', 'json')
+                error = payload_format_error(archemedes_state['payload_format'])
+                if error:
+                    print(f"ARChemedes payload format: {error}; using JSON snapshots")
+                    archemedes_state['payload_format'] = 'snapshot'
+                archemedes_state['queue_enabled'] = config.get('queue_enabled', True)
+                archemedes_state['queue_max_messages'] = config.get('queue_max_messages', 50000)
+                archemedes_state['queue_max_mb'] = config.get('queue_max_mb', 50)
+                archemedes_state['queue_eviction'] = config.get('queue_eviction', 'drop_oldest')
+                archemedes_state['drain_rate'] = config.get('drain_rate', 20)
+                archemedes_state['topic_rate'] = config.get('topic_rate', 10)
+                archemedes_state['delta_thresholds'] = {**DEFAULT_DELTA_THRESHOLDS,
+                                                        **config.get('delta_thresholds', {})}
                 return True
     except Exception as e:
         print(f"Error loading ARChemedes config: {e}")
@@ -47,7 +118,17 @@ def save_config():
             'broker_port': archemedes_state['broker_port'],
             'username': archemedes_state['username'],
             'password': archemedes_state['password'],
-            'topic_prefix': archemedes_state['topic_prefix']
+            'topic_prefix': archemedes_state['topic_prefix'],
+            'publish_mode': archemedes_state['publish_mode'],
+            'heartbeat_seconds': archemedes_state['heartbeat_seconds'],
+            'payload_format': archemedes_state['payload_format'],
+            'queue_enabled': archemedes_state['queue_enabled'],
+            'queue_max_messages': archemedes_state['queue_max_messages'],
+            'queue_max_mb': archemedes_state['queue_max_mb'],
+            'queue_eviction': archemedes_state['queue_eviction'],
+            'drain_rate': archemedes_state['drain_rate'],
+            'topic_rate': archemedes_state['topic_rate'],
+            'delta_thresholds': archemedes_state['delta_thresholds']
         }
         with open(archemedes_state['config_file'], 'w') as f:
             json.dump(config, f, indent=2)
@@ -56,87 +137,163 @@ def save_config():
         print(f"Error saving ARChemedes config: {e}")
         return False
 
-def on_connect(client, userdata, flags, rc):
-    """Callback when connected to MQTT broker"""
-    if rc == 0:
-        archemedes_state['connected'] = True
-        archemedes_state['connection_message'] = 'success'
-        print("✅ Successfully connected to MQTT broker!")
-
-        # Publish connection status message
-        try:
-            connection_msg = {
-                'status': 'connected',
-                'client': 'ChemiSuite',
-                'timestamp': time.time()
-            }
-            client.publish(
-                f"{archemedes_state['topic_prefix']}/system/status",
-                json.dumps(connection_msg),
-                retain=True
-            )
-        except:
-            pass
-    else:
-        archemedes_state['connected'] = False
-        error_messages = {
-            1: "Incorrect protocol version",
-            2: "Invalid client identifier",
-            3: "Server unavailable",
-            4: "Bad username or password",
-            5: "Not authorized"
-        }
-        error_msg = error_messages.get(rc, f"Unknown error code {rc}")
-        archemedes_state['connection_message'] = f'failed:{error_msg}'
-        print(f"❌ Connection failed: {error_msg}")
+def on_connect():
+    """Called by the MQTT publisher after every (re)connect"""
+    archemedes_state['connected'] = True
+    archemedes_state['connection_message'] = 'success'
+    archemedes_state['resync'] = True
+    print("✅ Successfully connected to MQTT broker!")
+    if archemedes_state['status_label']:
+        archemedes_state['status_label'].set_text("● Connected")
+        archemedes_state['status_label'].style("color: #00d26a; font-size: 14px; font-weight: bold;")
+
+    # Publish connection status message
+    connection_msg = {
+        'status': 'connected',
+        'client': 'ChemiSuite',
+        'timestamp': time.time()
+    }
+    archemedes_state['client'].publish(
+        f"{archemedes_state['topic_prefix']}/system/status",
+        json.dumps(connection_msg),
+        retain=True
+    )
+
+def on_connect_failed(error: str, permanent: bool):
+    """Called by the MQTT publisher when a connection attempt fails"""
+    archemedes_state['connected'] = False
+    archemedes_state['connection_message'] = f'failed:{error}'
+    print(f"❌ Connection failed: {error}" + ("" if permanent else " (retrying)"))
 
-def on_disconnect(client, userdata, rc):
-    """Callback when disconnected from MQTT broker"""
+def on_disconnect(reason: str):
+    """Called by the MQTT publisher when the broker connection drops; it reconnects with backoff"""
     archemedes_state['connected'] = False
+    print(f"⚠️ MQTT connection lost ({reason}), reconnecting")
     if archemedes_state['status_label']:
-        archemedes_state['status_label'].set_text("● Disconnected")
-        archemedes_state['status_label'].style("color: #ff4757; font-size: 14px; font-weight: bold;")
+        archemedes_state['status_label'].set_text("● Reconnecting")
+        archemedes_state['status_label'].style("color: #ffa502; font-size: 14px; font-weight: bold;")
+
+def get_queue() -> Optional[PublishQueue]:
+    """Get the offline queue, opening it with the configured limits (None when disabled)"""
+    if not archemedes_state['queue_enabled']:
+        return None
+    if archemedes_state['queue'] is None:
+        archemedes_state['queue'] = PublishQueue(
+            QUEUE_FILE,
+            max_messages=int(archemedes_state['queue_max_messages']),
+            max_bytes=int(archemedes_state['queue_max_mb'] * 1024 * 1024),
+            eviction=archemedes_state['queue_eviction']
+        )
+    return archemedes_state['queue']
+
+def configure_queue():
+    """
+    Apply the configured limits to the open offline queue
+
+    The queue stays open, since the publish thread may be using it, and
+    messages already drained and awaiting PUBACK stay in flight.
+    """
+    if archemedes_state['queue'] is not None:
+        archemedes_state['queue'].configure(
+            max_messages=int(archemedes_state['queue_max_messages']),
+            max_bytes=int(archemedes_state['queue_max_mb'] * 1024 * 1024),
+            eviction=archemedes_state['queue_eviction']
+        )
+
+def send_message(topic: str, data, retain: bool = True) -> bool:
+    """
+    Publish one message now, or queue it if the broker can't take it
+
+    Args:
+        topic: Full topic including the prefix
+        data: Encoded payload
+        retain: Retain flag for the live message
+
+    Returns:
+        True if it was handed to the client, False if it was queued or dropped
+    """
+    if archemedes_state['connected']:
+        info = archemedes_state['client'].publish(topic, data, retain=retain)
+        if info.rc == 0:
+            return True
+
+    queue = get_queue()
+    if queue is not None:
+        queue.put(topic, data, retain)
+    return False
+
+def drain_queue():
+    """
+    Resend queued messages at up to drain_rate per second with QoS 1
+
+    Drained messages are history, so they go out without the retain flag
+    and never replace the live retained values. Each one stays queued
+    until the broker acknowledges it.
+    """
+    queue = archemedes_state['queue']
+    if queue is None or not archemedes_state['connected']:
+        archemedes_state['drain_time'] = None
+        return
+
+    now = time.monotonic()
+    last = archemedes_state['drain_time'] or now
+    rate = archemedes_state['drain_rate']
+    archemedes_state['drain_tokens'] = min(float(rate), archemedes_state['drain_tokens'] + (now - last) * rate)
+    archemedes_state['drain_time'] = now
+
+    # Confirmed messages leave the queue
+    inflight = archemedes_state['inflight']
+    for row_id, info in list(inflight.items()):
+        if info.is_published():
+            queue.ack(row_id)
+            del inflight[row_id]
+
+    budget = min(int(archemedes_state['drain_tokens']), DRAIN_MAX_INFLIGHT - len(inflight))
+    if budget <= 0 or not queue.depth:
+        return
+
+    for row_id, topic, payload, _ in queue.take(budget):
+        info = archemedes_state['client'].publish(topic, payload, qos=1, retain=False, coalesce=False)
+        if info.rc != 0:
+            # Hand this and the rest of the batch out again; the ones before it are in flight
+            queue.rewind(after=row_id - 1)
+            break
+        inflight[row_id] = info
+        archemedes_state['drain_tokens'] -= 1
 
 def connect_to_broker():
-    """Connect to MQTT broker"""
+    """Start the MQTT publisher for the configured broker"""
     if not archemedes_state['broker_url']:
         ui.notify("Please configure broker URL first", type='warning')
         return False
 
     try:
-        # Import paho-mqtt (will need to be installed)
-        import paho.mqtt.client as mqtt
+        # paho-mqtt does the network I/O (will need to be installed)
+        import paho.mqtt.client
 
         ui.notify(f"Connecting to {archemedes_state['broker_url']}...", type='info')
 
-        # Create MQTT client
-        client = mqtt.Client(client_id=f"chemisuite_{int(time.time())}")
-
-        # Set credentials if provided
-        if archemedes_state['username'] and archemedes_state['password']:
-            client.username_pw_set(archemedes_state['username'], archemedes_state['password'])
-            ui.notify("Credentials set", type='info')
-
-        # Enable TLS for secure connection (required for HiveMQ)
-        try:
-            client.tls_set()
-            ui.notify("TLS/SSL enabled", type='info')
-        except Exception as e:
-            ui.notify(f"TLS setup failed: {str(e)}", type='negative')
-            return False
-
-        # Set callbacks
-        client.on_connect = on_connect
-        client.on_disconnect = on_disconnect
-
-        # Connect to broker
-        ui.notify("Attempting connection...", type='info')
-        client.connect(archemedes_state['broker_url'], archemedes_state['broker_port'], 60)
+        # One connection per attempt; TLS is required for HiveMQ
+        def new_connection():
+            return PahoConnection(
+                archemedes_state['broker_url'],
+                archemedes_state['broker_port'],
+                archemedes_state['username'],
+                archemedes_state['password'],
+                tls=True
+            )
 
-        # Start network loop in background thread
-        client.loop_start()
+        publisher = MQTTPublisher(
+            new_connection,
+            max_inflight=DRAIN_MAX_INFLIGHT,
+            topic_rate=archemedes_state['topic_rate'] or None,
+            on_connect=on_connect,
+            on_disconnect=on_disconnect,
+            on_connect_failed=on_connect_failed
+        )
+        archemedes_state['client'] = publisher
+        publisher.start()
 
-        archemedes_state['client'] = client
         ui.notify("Connection initiated, waiting for broker response...", type='info')
         return True
 
@@ -147,194 +304,382 @@ def connect_to_broker():
         ui.notify(f"Connection error: {str(e)}", type='negative')
         return False
 
-def disconnect_from_broker():
-    """Disconnect from MQTT broker"""
+def disconnect_from_broker(notify: bool = True):
+    """Stop the MQTT publisher and disconnect from the broker"""
     if archemedes_state['client']:
-        try:
-            archemedes_state['client'].loop_stop()
-            archemedes_state['client'].disconnect()
-        except:
-            pass
+        archemedes_state['client'].stop()
         archemedes_state['client'] = None
         archemedes_state['connected'] = False
-        ui.notify("Disconnected from MQTT broker", type='info')
-
-def publish_data():
-    """Publish ChemiSuite data to MQTT broker"""
-    if not archemedes_state['connected'] or not archemedes_state['client']:
-        print("⚠️ Skipping publish - not connected or no client")
-        return
-
-    print(f"\n📡 Publishing data at {time.strftime('%H:%M:%S')}...")
+        # Messages the publisher had not confirmed are drained again next time
+        archemedes_state['inflight'] = {}
+        if archemedes_state['queue'] is not None:
+            archemedes_state['queue'].rewind()
+        if notify:
+            ui.notify("Disconnected from MQTT broker", type='info')
+
+# Telemetry parameters published for each device type: (parameter, payload key, unit, decimals)
+IKA_FIELDS = [('temperature', 'temperature', '°C', 1), ('speed', 'stir_speed', 'RPM', 0)]
+DEVICE_FIELDS = {
+    'IKA RCT Digital': IKA_FIELDS,
+    'ika_stirrer': IKA_FIELDS,
+    'Edwards TIC': [('pressure', 'pressure', 'mbar', None)],
+}
+# Driver calls for devices that aren't registered with telemetry: parameter -> (method, kwargs)
+DRIVER_READS = {
+    'temperature': ('get_temperature', {'sensor_type': 2}),
+    'speed': ('get_speed', {}),
+    'pressure': ('get_pressure', {}),
+}
 
+def read_from_driver(device: Dict, param_name: str) -> Optional[float]:
+    """Read one parameter straight from a device driver (None if it has no driver or the read fails)"""
+    method_name, kwargs = DRIVER_READS[param_name]
+    method = getattr(device.get('driver'), method_name, None)
+    if method is None:
+        return None
     try:
-        # Import data sources
-        from pages import fume_hood as fume_hood_page
-        from pages import roboschlenk as roboschlenk_page
-        from pages import devices as devices_page
-
-        topic_prefix = archemedes_state['topic_prefix']
-
-        # Publish fume hood sash status
-        fume_hoods = fume_hood_page.fume_hoods
-        for hood in fume_hoods:
-            hood_id = hood.get('id', 'unknown')
-
-            # Only publish sash status (relevant safety data)
-            sash_data = {
-                'name': hood.get('name', 'Unknown'),
-                'sash_open': hood.get('sash_open', False),
-                'location': hood.get('location', ''),
-                'timestamp': time.time()
-            }
-            archemedes_state['client'].publish(
-                f"{topic_prefix}/fumehood/{hood_id}/sash",
-                json.dumps(sash_data),
-                retain=True
-            )
-
-            # Publish device sensor data for devices assigned to this hood
-            if hood.get('assigned_devices'):
-                for assigned_device in hood.get('assigned_devices', []):
-                    device_name = assigned_device.get('name', 'unknown')
-
-                    # Find the actual device object in devices list to get current state
-                    actual_device = None
-                    for dev in devices_page.devices:
-                        if dev.get('name') == device_name:
-                            actual_device = dev
-                            break
-
-                    # Skip if device not found or not connected
-                    if not actual_device or not actual_device.get('connection_state', {}).get('connected', False):
-                        continue
-
-                    device_type = actual_device.get('type', 'unknown')
-                    device_data = {
-                        'name': device_name,
-                        'type': device_type,
-                        'timestamp': time.time()
-                    }
-
-                    # Get real-time sensor data based on device type
-                    try:
-                        driver = actual_device.get('driver')
-                        if driver:
-                            # IKA Stirrer/Hotplate - temperature and stir speed
-                            if device_type in ['IKA RCT Digital', 'ika_stirrer']:
-                                try:
-                                    temp = driver.get_temperature(sensor_type=2)
-                                    device_data['temperature'] = round(temp, 1)
-                                    device_data['temperature_unit'] = '°C'
-                                except Exception as e:
-                                    device_data['temperature'] = None
-                                    print(f"    ✗ Error reading temp from {device_name}: {e}")
-
-                                try:
-                                    speed = driver.get_speed()
-                                    device_data['stir_speed'] = round(speed, 0)
-                                    device_data['stir_speed_unit'] = 'RPM'
-                                except Exception as e:
-                                    device_data['stir_speed'] = None
-                                    print(f"    ✗ Error reading speed from {device_name}: {e}")
-                            # Edwards TIC - pressure
-                            elif device_type == 'Edwards TIC':
-                                try:
-                                    pressure = driver.get_pressure()
-                                    device_data['pressure'] = pressure
-                                    device_data['pressure_unit'] = 'mbar'
-                                except Exception as e:
-                                    device_data['pressure'] = None
-                                    print(f"    ✗ Error reading pressure from {device_name}: {e}")
-                    except Exception as e:
-                        print(f"  ERROR reading device {device_name}: {e}")
-                        import traceback
-                        traceback.print_exc()
-
-                    # Publish device data
-                    archemedes_state['client'].publish(
-                        f"{topic_prefix}/device/{hood_id}/{device_name}",
-                        json.dumps(device_data),
-                        retain=True
-                    )
-
-        # Publish standalone devices (not assigned to fume hoods)
-        for device in devices_page.devices:
-            if device.get('connection_state', {}).get('connected', False):
-                device_name = device.get('name', 'unknown')
-                device_type = device.get('type', 'unknown')
+        return method(**kwargs)
+    except Exception as e:
+        print(f"    ✗ Error reading {param_name} from {device.get('name', 'unknown')}: {e}")
+        return None
+
+def build_device_payload(device: Dict, readings: Optional[Dict[str, Dict]], now: float) -> Dict:
+    """
+    Build the published payload of one device
+
+    Values come from the device's cached telemetry readings. A device that
+    isn't registered with telemetry (readings is None) is read through its
+    driver instead; without a driver its fields are left out.
+
+    Args:
+        device: Device dict from the devices page
+        readings: The device's entry in telemetry.snapshot(), or None if unregistered
+        now: Timestamp stamped on the payload
+    """
+    device_type = device.get('type', 'unknown')
+    device_data = {
+        'name': device.get('name', 'unknown'),
+        'type': device_type,
+        'timestamp': now
+    }
+
+    for param_name, key, unit, decimals in DEVICE_FIELDS.get(device_type, []):
+        if readings is not None:
+            reading = readings.get(param_name)
+            value = reading['value'] if reading else None
+        elif device.get('driver') is not None:
+            value = read_from_driver(device, param_name)
+        else:
+            continue
+        if value is not None and decimals is not None:
+            value = round(value, decimals)
+        device_data[key] = value
+        if value is not None:
+            device_data[f"{key}_unit"] = unit
+
+    return device_data
+
+def collect_event_messages(now: float) -> List[Tuple[str, Dict]]:
+    """
+    Build the sash and RoboSchlenk motor messages
+
+    Both come from in-memory state kept current by their own serial
+    threads, so they are cheap enough to check many times per cycle.
+
+    Args:
+        now: Timestamp stamped on the payloads
+
+    Returns:
+        List of (topic without prefix, payload) pairs
+    """
+    from pages import fume_hood as fume_hood_page
+    from pages import roboschlenk as roboschlenk_page
+
+    messages = []
+    for hood in fume_hood_page.fume_hoods:
+        messages.append((f"fumehood/{hood.get('id', 'unknown')}/sash", {
+            'name': hood.get('name', 'Unknown'),
+            'sash_open': hood.get('sash_open', False),
+            'location': hood.get('location', ''),
+            'timestamp': now
+        }))
+
+    if roboschlenk_page.roboschlenk_state.get('connected'):
+        controller = roboschlenk_page.roboschlenk_state.get('controller')
+        if controller:
+            statuses = controller.get_all_statuses()
+            for motor_name in ['A', 'B', 'C', 'D']:
+                status = statuses.get(motor_name)
+                if status:
+                    messages.append((f"roboschlenk/motor/{motor_name}", {
+                        'motor': motor_name,
+                        'angle': round(status.angle, 1),
+                        'moving': status.moving,
+                        'position': determine_position(status.angle, status.moving),
+                        'timestamp': now
+                    }))
+
+    return messages
+
+def collect_messages() -> List[Tuple[str, Dict]]:
+    """
+    Build every ARChemedes message for one publish cycle
+
+    Device values come from the telemetry cache (one snapshot per cycle,
+    so a device on several topics is looked up once), hood state from the
+    fume hood page and motor state from the RoboSchlenk controller's status
+    cache. Only devices with a driver that isn't registered with telemetry
+    are read over serial, once per cycle.
+
+    Returns:
+        List of (topic without prefix, payload) pairs
+    """
+    from pages import fume_hood as fume_hood_page
+    from pages import devices as devices_page
+
+    now = time.time()
+    readings = telemetry.snapshot()
+    connected = {
+        device.get('name', 'unknown'): device
+        for device in devices_page.devices
+        if device.get('connection_state', {}).get('connected', False)
+    }
+
+    payloads = {}
+
+    def device_payload(device_name):
+        if device_name not in payloads:
+            payloads[device_name] = build_device_payload(connected[device_name], readings.get(device_name), now)
+        return payloads[device_name]
+
+    messages = collect_event_messages(now)
+
+    # Devices assigned to each hood
+    for hood in fume_hood_page.fume_hoods:
+        hood_id = hood.get('id', 'unknown')
+        for assigned_device in hood.get('assigned_devices', []):
+            device_name = assigned_device.get('name', 'unknown')
+            if device_name in connected:
+                messages.append((f"device/{hood_id}/{device_name}", device_payload(device_name)))
+
+    # Every connected device also goes out on its standalone topic
+    for device_name in connected:
+        messages.append((f"device/standalone/{device_name}", device_payload(device_name)))
+
+    # Age of the oldest device value in this cycle, for the latency metric
+    ages = [reading['age'] for name in payloads for reading in readings.get(name, {}).values() if reading]
+    archemedes_state['publish_stats']['max_reading_age_s'] = round(max(ages), 2) if ages else None
+
+    return messages
+
+def has_changed(previous: Dict, payload: Dict, thresholds: Dict[str, float]) -> bool:
+    """
+    Check whether a payload differs from the last published one
+
+    Numeric fields with a threshold must move by at least that much; every other field
+    counts on any change. Timestamps are ignored.
+    """
+    for key, value in payload.items():
+        if key == 'timestamp':
+            continue
+        old = previous.get(key)
+        threshold = thresholds.get(key)
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (value, old))
+        if threshold is not None and numeric:
+            if key in RELATIVE_THRESHOLDS:
+                threshold *= abs(old)
+            # Small tolerance so a step of exactly the threshold counts despite float rounding
+            if abs(value - old) >= threshold - 1e-9:
+                return True
+        elif value != old:
+            return True
+    return False
 
-                device_data = {
-                    'name': device_name,
-                    'type': device_type,
-                    'timestamp': time.time()
-                }
+def payload_format_error(payload_format: str) -> Optional[str]:
+    """Check that a payload format can be encoded here (an error message, or None if it can)"""
+    if payload_format not in PAYLOAD_FORMATS:
+        return f"Unknown payload format: {payload_format}"
+    if payload_format == 'snapshot-msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            return "msgpack not installed. Run: pip install msgpack"
+    return None
+
+def encode_snapshot(snapshot: Dict, payload_format: str) -> bytes:
+    """
+    Encode a lab snapshot for the given payload format
+
+    Args:
+        snapshot: Snapshot built by build_snapshot()
+        payload_format: 'snapshot', 'snapshot-zlib' or 'snapshot-msgpack'
+    """
+    if payload_format == 'snapshot-msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack not installed. Run: pip install msgpack")
+        return msgpack.packb(snapshot)
+
+    data = json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+    if payload_format == 'snapshot-zlib':
+        return zlib.compress(data, 6)
+    return data
+
+def build_snapshot(payloads: Dict[str, Dict], now: float) -> Tuple[Dict, Dict]:
+    """
+    Fold per-topic payloads into one compact lab snapshot and its schema
+
+    The snapshot holds only values, as arrays in the field order given by
+    the schema; names, locations, device types, hood assignments and units
+    go in the schema, which only changes when the lab setup does.
+
+    Args:
+        payloads: topic (without prefix) -> payload, as built by collect_messages()
+        now: Timestamp of the snapshot
+
+    Returns:
+        (schema, snapshot) dictionaries
+    """
+    schema = {
+        'version': 1,
+        'format': archemedes_state['payload_format'],
+        'hood_fields': ['sash_open'],
+        'motor_fields': ['angle', 'moving', 'position'],
+        'hoods': {},
+        'devices': {},
+    }
+    snapshot = {'t': round(now, 3), 'h': {}, 'd': {}, 'm': {}}
+
+    for topic, payload in sorted(payloads.items()):
+        kind, group, name = topic.split('/', 2)
+
+        if kind == 'fumehood':
+            schema['hoods'][group] = {'name': payload['name'], 'location': payload['location']}
+            snapshot['h'][group] = [payload['sash_open']]
+
+        elif kind == 'device':
+            fields = DEVICE_FIELDS.get(payload['type'], [])
+            device_schema = schema['devices'].setdefault(name, {
+                'type': payload['type'],
+                'hoods': [],
+                'fields': [key for _, key, _, _ in fields],
+                'units': [unit for _, _, unit, _ in fields],
+            })
+            if group != 'standalone':
+                device_schema['hoods'].append(group)
+            snapshot['d'][name] = [payload.get(key) for key in device_schema['fields']]
+
+        elif kind == 'roboschlenk':
+            snapshot['m'][name] = [payload['angle'], payload['moving'], payload['position']]
+
+    return schema, snapshot
+
+def publish_data(events_only: bool = False):
+    """
+    Publish ChemiSuite data to MQTT broker
+
+    In delta mode a topic is only sent when has_changed() says so or its
+    heartbeat is due; in full mode every topic goes out each cycle. With a
+    snapshot payload format, the topics are folded into one retained
+    snapshot message (sent whenever any topic is due) plus a retained
+    schema message that is only resent when it changes.
+
+    Args:
+        events_only: Only check the sash and motor topics and send the ones
+            that changed (used between full cycles)
+    """
+    if not archemedes_state['client'] or (not archemedes_state['connected'] and get_queue() is None):
+        if not events_only:
+            print("⚠️ Skipping publish - not connected or no client")
+        return
 
-                # Get real-time sensor data
-                try:
-                    driver = device.get('driver')
-                    if driver:
-                        # IKA Stirrer/Hotplate
-                        if device_type in ['IKA RCT Digital', 'ika_stirrer']:
-                            try:
-                                temp = driver.get_temperature(sensor_type=2)
-                                device_data['temperature'] = round(temp, 1)
-                                device_data['temperature_unit'] = '°C'
-                            except Exception as e:
-                                device_data['temperature'] = None
-                                print(f"    ✗ Error reading temp from {device_name}: {e}")
-
-                            try:
-                                speed = driver.get_speed()
-                                device_data['stir_speed'] = round(speed, 0)
-                                device_data['stir_speed_unit'] = 'RPM'
-                            except Exception as e:
-                                device_data['stir_speed'] = None
-                                print(f"    ✗ Error reading speed from {device_name}: {e}")
-
-                        # Edwards TIC
-                        elif device_type == 'Edwards TIC':
-                            try:
-                                pressure = driver.get_pressure()
-                                device_data['pressure'] = pressure
-                                device_data['pressure_unit'] = 'mbar'
-                            except Exception as e:
-                                device_data['pressure'] = None
-                                print(f"    ✗ Error reading pressure from {device_name}: {e}")
-                except Exception as e:
-                    print(f"  ERROR reading {device_name}: {e}")
-                    import traceback
-                    traceback.print_exc()
-
-                # Publish standalone device data
-                archemedes_state['client'].publish(
-                    f"{topic_prefix}/device/standalone/{device_name}",
-                    json.dumps(device_data),
-                    retain=True
-                )
+    if archemedes_state['resync']:
+        # Fresh connection: resend every topic live
+        archemedes_state['resync'] = False
+        archemedes_state['last_published'] = {}
+        archemedes_state['last_schema'] = None
 
-        # Publish RoboSchlenk data (tap positions and angles)
-        if roboschlenk_page.roboschlenk_state.get('connected'):
-            controller = roboschlenk_page.roboschlenk_state.get('controller')
-            if controller:
-                for motor_name in ['A', 'B', 'C', 'D']:
-                    status = controller.get_motor_status(motor_name)
-                    if status:
-                        motor_data = {
-                            'motor': motor_name,
-                            'angle': round(status.angle, 1),
-                            'moving': status.moving,
-                            'position': determine_position(status.angle, status.moving),
-                            'timestamp': time.time()
-                        }
-                        archemedes_state['client'].publish(
-                            f"{topic_prefix}/roboschlenk/motor/{motor_name}",
-                            json.dumps(motor_data),
-                            retain=True
-                        )
+    cycle_start = time.perf_counter()
+    topic_prefix = archemedes_state['topic_prefix']
+    stats = archemedes_state['publish_stats']
+    last_published = archemedes_state['last_published']
+    thresholds = archemedes_state['delta_thresholds']
+    delta = events_only or archemedes_state['publish_mode'] == 'delta'
+    compact = archemedes_state['payload_format'] != 'json'
 
+    try:
+        messages = collect_event_messages(time.time()) if events_only else collect_messages()
+        now = time.monotonic()
+
+        due = []
+        for topic, payload in messages:
+            previous = last_published.get(topic)
+            if delta and previous is not None and not has_changed(previous[0], payload, thresholds):
+                # Unchanged: only full cycles resend it, once its heartbeat is due
+                if events_only or now - previous[1] < archemedes_state['heartbeat_seconds']:
+                    stats['skipped'] += not events_only
+                    continue
+            due.append((topic, payload))
+
+        if not events_only:
+            # Forget topics that are gone (e.g. a disconnected device)
+            current = {topic for topic, _ in messages}
+            for topic in [topic for topic in last_published if topic not in current]:
+                del last_published[topic]
+
+        if compact:
+            if due:
+                current = {topic: entry[0] for topic, entry in last_published.items()}
+                current.update(due)
+                schema, snapshot = build_snapshot(current, time.time())
+                schema_json = json.dumps(schema, separators=(',', ':'))
+                # Encode first: if that fails nothing counts as sent and the next cycle retries
+                data = encode_snapshot(snapshot, archemedes_state['payload_format'])
+
+                if schema_json != archemedes_state['last_schema']:
+                    send_message(f"{topic_prefix}/lab/schema", schema_json)
+                    archemedes_state['last_schema'] = schema_json
+                    stats['messages'] += 1
+                    stats['bytes'] += len(schema_json)
+
+                send_message(f"{topic_prefix}/lab/snapshot", data)
+                stats['messages'] += 1
+                stats['events'] += events_only
+                stats['bytes'] += len(data)
+
+                # The snapshot carries every topic, so all of them are fresh again
+                for topic, payload in current.items():
+                    last_published[topic] = (payload, now)
+        else:
+            for topic, payload in due:
+                data = json.dumps(payload)
+                send_message(f"{topic_prefix}/{topic}", data)
+                last_published[topic] = (payload, now)
+                stats['messages'] += 1
+                stats['events'] += events_only
+                stats['bytes'] += len(data)
     except Exception as e:
         print(f"Error publishing data: {e}")
+        return
+
+    if events_only:
+        return
+
+    cycle_ms = (time.perf_counter() - cycle_start) * 1000
+    stats['cycles'] += 1
+    stats['last_cycle_ms'] = round(cycle_ms, 2)
+    stats['max_cycle_ms'] = round(max(stats['max_cycle_ms'], cycle_ms), 2)
+    stats['total_cycle_ms'] += cycle_ms
+
+def get_publish_stats() -> Dict:
+    """Get publish-cycle statistics, including the mean cycle time"""
+    stats = dict(archemedes_state['publish_stats'])
+    stats['avg_cycle_ms'] = round(stats['total_cycle_ms'] / stats['cycles'], 2) if stats['cycles'] else None
+    queue = archemedes_state['queue']
+    stats['queue'] = dict(queue.get_stats(), inflight=len(archemedes_state['inflight'])) if queue else None
+    stats['mqtt'] = archemedes_state['client'].get_stats() if archemedes_state['client'] else None
+    return stats
 
 def determine_position(angle, moving):
     """Determine position name from angle"""
@@ -349,62 +694,70 @@ def determine_position(angle, moving):
     else:
         return "MOVING"
 
-def start_publishing():
-    """Start publishing data at regular intervals using background thread"""
-    # Check if already publishing
-    if archemedes_state['publish_thread'] and archemedes_state['publish_thread'].is_alive():
-        print("Already publishing, skipping duplicate thread creation")
-        return
-
-    # Create stop event
-    archemedes_state['stop_publishing_event'] = threading.Event()
+async def publish_loop():
+    """
+    Runs on the MQTT publisher loop: a full publish cycle every
+    PUBLISH_INTERVAL_SECONDS, sash/motor changes checked every
+    EVENT_POLL_SECONDS in between, and the offline queue drained each time
+    """
+    print("📡 Publishing task started")
+    loop = asyncio.get_running_loop()
+    next_cycle = time.monotonic()
 
-    def publish_loop():
-        """Background thread that publishes data every 2 seconds"""
-        print("📡 Publishing thread started")
+    def tick(events_only: bool):
+        publish_data(events_only)
+        drain_queue()
 
-        # Publish immediately
-        try:
-            publish_data()
-        except Exception as e:
-            print(f"Error in initial publish: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # Continue publishing every 2 seconds until stopped
-        while not archemedes_state['stop_publishing_event'].is_set():
+    try:
+        while True:
             try:
-                # Wait 2 seconds, but check stop event every 0.1s for responsiveness
-                if archemedes_state['stop_publishing_event'].wait(timeout=2.0):
-                    break  # Stop event was set
-
-                publish_data()
+                # Telemetry reads and queue writes block, so they run off the loop
+                if time.monotonic() >= next_cycle:
+                    await loop.run_in_executor(None, tick, False)
+                    next_cycle = max(next_cycle + PUBLISH_INTERVAL_SECONDS, time.monotonic())
+                else:
+                    await loop.run_in_executor(None, tick, True)
             except Exception as e:
                 print(f"Error in publish loop: {e}")
                 import traceback
                 traceback.print_exc()
                 # Continue publishing even on error
+                next_cycle = time.monotonic() + PUBLISH_INTERVAL_SECONDS
+
+            await asyncio.sleep(max(0.0, min(EVENT_POLL_SECONDS, next_cycle - time.monotonic())))
+    finally:
+        print("📡 Publishing task stopped")
+
+def start_publishing():
+    """Start publishing data at regular intervals on the MQTT publisher loop"""
+    if not archemedes_state['client']:
+        ui.notify("Connect to a broker first", type='warning')
+        return
 
-        print("📡 Publishing thread stopped")
+    # Check if already publishing
+    if archemedes_state['publish_task'] and not archemedes_state['publish_task'].done():
+        print("Already publishing, skipping duplicate task creation")
+        return
 
-    # Start background thread
-    archemedes_state['publish_thread'] = threading.Thread(target=publish_loop, daemon=True, name="ARChemedes-Publisher")
-    archemedes_state['publish_thread'].start()
+    archemedes_state['publish_stats'].update(cycles=0, messages=0, skipped=0, events=0, bytes=0, last_cycle_ms=None,
+                                             max_cycle_ms=0.0, total_cycle_ms=0.0, max_reading_age_s=None)
+    archemedes_state['last_published'] = {}
+    archemedes_state['last_schema'] = None
+
+    archemedes_state['publish_task'] = archemedes_state['client'].run_coroutine(publish_loop())
 
     ui.notify("📡 Starting data broadcast...", type='info')
-    ui.notify("✅ Broadcasting ChemiSuite data every 2 seconds", type='positive')
-    print(f"✅ Publishing thread started: {archemedes_state['publish_thread'].name}")
+    if archemedes_state['publish_mode'] == 'delta':
+        ui.notify(f"✅ Broadcasting ChemiSuite data on change (heartbeat every "
+                  f"{archemedes_state['heartbeat_seconds']} s)", type='positive')
+    else:
+        ui.notify("✅ Broadcasting ChemiSuite data every 2 seconds", type='positive')
 
 def stop_publishing():
     """Stop publishing data"""
-    if archemedes_state['stop_publishing_event']:
-        archemedes_state['stop_publishing_event'].set()
-
-    if archemedes_state['publish_thread']:
-        # Wait for thread to finish (with timeout)
-        archemedes_state['publish_thread'].join(timeout=3.0)
-        archemedes_state['publish_thread'] = None
-        archemedes_state['stop_publishing_event'] = None
+    if archemedes_state['publish_task']:
+        archemedes_state['publish_task'].cancel()
+        archemedes_state['publish_task'] = None
 
     ui.notify("⏸️ Stopped broadcasting data", type='info')
     print("⏸️ Publishing stopped")
@@ -418,6 +771,7 @@ def generate_viewer():
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ChemiSuite Remote Viewer - ARChemedes</title>
     <script src="https://unpkg.com/mqtt/dist/mqtt.min.js"></script>
+    <script src="https://unpkg.com/@msgpack/msgpack"></script>
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body {
@@ -583,6 +937,9 @@ def generate_viewer():
         let client = null;
         let fumeHoods = {};
         let motors = {};
+        let labSchema = null;
+        let pendingSnapshot = null;
+        let latestSnapshotTime = 0;
 
         function connectToMQTT() {
             const broker = document.getElementById('brokerUrl').value;
@@ -614,10 +971,27 @@ def generate_viewer():
                 client.subscribe(`${prefix}/fumehood/+/sash`);
                 client.subscribe(`${prefix}/fumehood/+/devices`);
                 client.subscribe(`${prefix}/roboschlenk/motor/+`);
+                client.subscribe(`${prefix}/lab/schema`);
+                client.subscribe(`${prefix}/lab/snapshot`);
             });
 
             client.on('message', function(topic, message) {
                 try {
+                    // Snapshot payload formats: the schema says how to decode the snapshot
+                    if (topic.endsWith('/lab/schema')) {
+                        labSchema = JSON.parse(message.toString());
+                        if (pendingSnapshot) {
+                            const raw = pendingSnapshot;
+                            pendingSnapshot = null;
+                            handleSnapshot(raw);
+                        }
+                        return;
+                    }
+                    if (topic.endsWith('/lab/snapshot')) {
+                        handleSnapshot(message);
+                        return;
+                    }
+
                     const data = JSON.parse(message.toString());
 
                     if (topic.includes('/fumehood/')) {
@@ -651,14 +1025,69 @@ def generate_viewer():
             }
 
             if (topic.endsWith('/sash')) {
+                if (isOlder(data, fumeHoods[hoodId].sash)) return;
                 fumeHoods[hoodId].sash = data;
             } else if (topic.endsWith('/devices')) {
                 fumeHoods[hoodId].devices = data;
             }
         }
 
+        async function decodeSnapshot(raw) {
+            if (labSchema.format === 'snapshot-msgpack') {
+                return MessagePack.decode(raw);
+            }
+            if (labSchema.format === 'snapshot-zlib') {
+                const stream = new Blob([raw]).stream().pipeThrough(new DecompressionStream('deflate'));
+                return JSON.parse(await new Response(stream).text());
+            }
+            return JSON.parse(new TextDecoder().decode(raw));
+        }
+
+        function fieldsToObject(fields, values) {
+            const result = {};
+            fields.forEach((field, index) => { result[field] = values[index]; });
+            return result;
+        }
+
+        function handleSnapshot(raw) {
+            if (!labSchema) {
+                pendingSnapshot = raw;  // Wait for the schema
+                return;
+            }
+
+            decodeSnapshot(raw).then(function(snapshot) {
+                if (snapshot.t < latestSnapshotTime) return;  // Late message from the offline queue
+                latestSnapshotTime = snapshot.t;
+                for (const [hoodId, values] of Object.entries(snapshot.h)) {
+                    const info = labSchema.hoods[hoodId] || {};
+                    if (!fumeHoods[hoodId]) {
+                        fumeHoods[hoodId] = {};
+                    }
+                    fumeHoods[hoodId].sash = Object.assign(
+                        {name: info.name, location: info.location, timestamp: snapshot.t},
+                        fieldsToObject(labSchema.hood_fields, values)
+                    );
+                }
+                for (const [motorName, values] of Object.entries(snapshot.m)) {
+                    motors[motorName] = Object.assign(
+                        {motor: motorName, timestamp: snapshot.t},
+                        fieldsToObject(labSchema.motor_fields, values)
+                    );
+                }
+                updateDisplay();
+            }).catch(function(e) {
+                console.error('Error decoding snapshot:', e);
+            });
+        }
+
+        // Messages queued during an outage arrive late; never let them replace newer values
+        function isOlder(data, current) {
+            return current && data.timestamp < current.timestamp;
+        }
+
         function handleMotorData(topic, data) {
             const motorName = data.motor;
+            if (isOlder(data, motors[motorName])) return;
             motors[motorName] = data;
         }
 
@@ -765,15 +1194,43 @@ def render():
                 ui.label("ARChemedes").style("color: white; font-size: 32px; font-weight: bold;")
                 ui.label("Remote Monitoring System").style("color: #888888; font-size: 16px;")
 
-            # Status indicator - set initial state based on connection status
-            if is_currently_connected:
-                archemedes_state['status_label'] = ui.label("● Connected").style(
-                    "color: #00d26a; font-size: 14px; font-weight: bold;"
-                )
-            else:
-                archemedes_state['status_label'] = ui.label("● Disconnected").style(
-                    "color: #ff4757; font-size: 14px; font-weight: bold;"
-                )
+            with ui.column().style("gap: 2px; align-items: flex-end;"):
+                # Status indicator - set initial state based on connection status
+                if is_currently_connected:
+                    archemedes_state['status_label'] = ui.label("● Connected").style(
+                        "color: #00d26a; font-size: 14px; font-weight: bold;"
+                    )
+                else:
+                    archemedes_state['status_label'] = ui.label("● Disconnected").style(
+                        "color: #ff4757; font-size: 14px; font-weight: bold;"
+                    )
+
+                # Publish-cycle latency
+                latency_label = ui.label("").style("color: #888888; font-size: 12px;")
+
+                def update_latency_label():
+                    stats = get_publish_stats()
+                    if stats['last_cycle_ms'] is None:
+                        latency_label.set_text("")
+                        return
+                    age = f", data age {stats['max_reading_age_s']} s" if stats['max_reading_age_s'] is not None else ""
+                    queued = ""
+                    if stats['queue'] and stats['queue']['depth']:
+                        queued = (f" | {stats['queue']['depth']} queued (oldest {stats['queue']['oldest_age_s']} s, "
+                                  f"{stats['queue']['dropped']} dropped)")
+                    broker = ""
+                    if stats['mqtt']:
+                        if stats['mqtt']['reconnect_in_s'] is not None:
+                            broker = f" | reconnecting in {stats['mqtt']['reconnect_in_s']} s"
+                        elif stats['mqtt']['latency_ms']['p95'] is not None:
+                            broker = (f" | broker ack p95 {stats['mqtt']['latency_ms']['p95']} ms, "
+                                      f"{stats['mqtt']['inflight']} in flight")
+                    latency_label.set_text(
+                        f"Publish cycle {stats['last_cycle_ms']} ms (avg {stats['avg_cycle_ms']}, "
+                        f"max {stats['max_cycle_ms']}){age}{queued}{broker}"
+                    )
+
+                ui.timer(2.0, update_latency_label)
 
         ui.separator().style("background-color: #444444;")
 
@@ -843,6 +1300,64 @@ def render():
                     "color: #888888; font-size: 12px; align-self: center; margin-left: 10px;"
                 )
 
+            # Publish mode
+            with ui.row().style("width: 100%; margin-top: 10px; gap: 20px;"):
+                mode_select = ui.select(
+                    {'delta': 'Changes only (with heartbeat)', 'full': 'Everything every 2 s'},
+                    label="Publish Mode",
+                    value=archemedes_state['publish_mode']
+                ).style("flex: 1;").props("dark outlined")
+
+                heartbeat_input = ui.number(
+                    label="Heartbeat (s)",
+                    value=archemedes_state['heartbeat_seconds'],
+                    min=2,
+                    max=3600
+                ).style("width: 160px;").props("dark outlined")
+
+                topic_rate_input = ui.number(
+                    label="Per-Topic Limit (msg/s)",
+                    value=archemedes_state['topic_rate'],
+                    min=0,
+                    max=1000
+                ).style("width: 190px;").props("dark outlined")
+
+                def check_payload_format(e):
+                    error = payload_format_error(e.value)
+                    if error:
+                        ui.notify(error, type='warning')
+
+                format_select = ui.select(
+                    PAYLOAD_FORMATS,
+                    label="Payload Format",
+                    value=archemedes_state['payload_format'],
+                    on_change=check_payload_format
+                ).style("flex: 1;").props("dark outlined")
+
+            # Offline queue
+            with ui.row().style("width: 100%; margin-top: 10px; gap: 20px; align-items: center;"):
+                queue_switch = ui.switch("Queue while offline", value=archemedes_state['queue_enabled']).props("dark")
+
+                queue_size_input = ui.number(
+                    label="Max Queued Messages",
+                    value=archemedes_state['queue_max_messages'],
+                    min=100,
+                    max=10000000
+                ).style("width: 200px;").props("dark outlined")
+
+                eviction_select = ui.select(
+                    EVICTION_POLICIES,
+                    label="When Full",
+                    value=archemedes_state['queue_eviction']
+                ).style("flex: 1;").props("dark outlined")
+
+                drain_rate_input = ui.number(
+                    label="Drain Rate (msg/s)",
+                    value=archemedes_state['drain_rate'],
+                    min=1,
+                    max=1000
+                ).style("width: 180px;").props("dark outlined")
+
             # Buttons
             with ui.row().style("width: 100%; justify-content: flex-end; gap: 10px; margin-top: 20px;"):
                 def save_settings():
@@ -851,6 +1366,20 @@ def render():
                     archemedes_state['username'] = username_input.value
                     archemedes_state['password'] = password_input.value
                     archemedes_state['topic_prefix'] = topic_input.value
+                    archemedes_state['publish_mode'] = mode_select.value
+                    archemedes_state['heartbeat_seconds'] = int(heartbeat_input.value)
+                    error = payload_format_error(format_select.value)
+                    if error:
+                        # Keep the format that works rather than failing every publish cycle
+                        ui.notify(error, type='negative')
+                        format_select.value = archemedes_state['payload_format']
+                    archemedes_state['payload_format'] = format_select.value
+                    archemedes_state['queue_enabled'] = queue_switch.value
+                    archemedes_state['queue_max_messages'] = int(queue_size_input.value)
+                    archemedes_state['queue_eviction'] = eviction_select.value
+                    archemedes_state['drain_rate'] = int(drain_rate_input.value)
+                    archemedes_state['topic_rate'] = float(topic_rate_input.value or 0)
+                    configure_queue()
 
                     if save_config():
                         ui.notify("Configuration saved", type='positive')
@@ -870,7 +1399,8 @@ def render():
                     ).props("icon=broadcast")
 
                 def toggle_connection():
-                    if archemedes_state['connected']:
+                    # A publisher that is reconnecting counts as broadcasting
+                    if archemedes_state['client']:
                         stop_publishing()
                         disconnect_from_broker()
                         connect_button.text = "Connect & Start Broadcasting"
@@ -893,14 +1423,15 @@ def render():
                                     start_publishing()
                                     connect_button.text = "Stop Broadcasting"
                                     connect_button.props("color=negative icon=broadcast_on_personal")
-                                elif archemedes_state.get('connection_message', '').startswith('failed:'):
+                                elif (archemedes_state.get('connection_message') or '').startswith('failed:'):
                                     error_msg = archemedes_state['connection_message'].replace('failed:', '')
                                     ui.notify(f"❌ Connection failed: {error_msg}", type='negative')
+                                    disconnect_from_broker(notify=False)
                                     if archemedes_state['status_label']:
                                         archemedes_state['status_label'].set_text("● Disconnected")
                                         archemedes_state['status_label'].style("color: #ff4757; font-size: 14px; font-weight: bold;")
                                     archemedes_state['connection_message'] = None
-                                elif archemedes_state.get('connection_message') is not None:
+                                elif archemedes_state['client']:
                                     # Still waiting, check again
                                     ui.timer(0.1, check_connection_status, once=True)
 
@@ -929,6 +1460,11 @@ def render():
                     ui.label("• {prefix}/roboschlenk/motor/C - Motor C status").style("color: #cccccc; font-size: 13px; font-family: monospace;")
                     ui.label("• {prefix}/roboschlenk/motor/D - Motor D status").style("color: #cccccc; font-size: 13px; font-family: monospace;")
 
+                with ui.card().style("background-color: #333333; padding: 15px;"):
+                    ui.label("Snapshot Payload Formats:").style("color: white; font-weight: bold; margin-bottom: 5px;")
+                    ui.label("• {prefix}/lab/snapshot - All values in one message per cycle").style("color: #cccccc; font-size: 13px; font-family: monospace;")
+                    ui.label("• {prefix}/lab/schema - Names, units and field order (JSON, sent on change)").style("color: #cccccc; font-size: 13px; font-family: monospace;")
+
         # Remote Viewer section
         with ui.card().style("background-color: #444444; padding: 25px; width: 100%;"):
             ui.label("Remote Viewer").style("color: white; font-size: 20px; font-weight: bold; margin-bottom: 15px;")
@@ -4,9 +4,199 @@ Data Logging Page - Monitor and record device data over time
 
 from nicegui import ui
 from data_logger import data_logger
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+import asyncio
+import json
 import os
 
+
+async def run_with_progress(title: str, task: Callable, unit: str = "rows", scale: float = 1):
+    """
+    Run a long data task off the UI thread and show its progress in a dialog
+
+    Args:
+        title: Text shown above the progress bar
+        task: Function taking a progress_callback(done, total) argument; it
+            runs in a worker thread
+        unit: Unit shown after the progress counts
+        scale: Divisor applied to the counts before display (e.g. 1e6 for MB)
+
+    Returns:
+        Whatever task returns (exceptions are re-raised)
+    """
+    progress = {'done': 0, 'total': 0}
+
+    def progress_callback(done, total):
+        # Called from the worker thread; the timer below pushes it to the UI
+        progress['done'] = done
+        progress['total'] = total
+
+    with ui.dialog().props("persistent") as progress_dialog, ui.card().style("background-color: #333333; padding: 20px; min-width: 400px;"):
+        ui.label(title).style("color: white; font-size: 16px; font-weight: bold; margin-bottom: 10px;")
+        progress_bar = ui.linear_progress(value=0, show_value=False).props("color=primary")
+        progress_label = ui.label("Starting...").style("color: #888888; font-size: 12px;")
+
+        def fmt(count):
+            return f"{count / scale:,.1f}" if scale != 1 else f"{count:,}"
+
+        def update_progress():
+            if progress['total']:
+                progress_bar.set_value(min(1.0, progress['done'] / progress['total']))
+                progress_label.set_text(f"{fmt(progress['done'])} / {fmt(progress['total'])} {unit}")
+            elif progress['done']:
+                progress_label.set_text(f"{fmt(progress['done'])} {unit}")
+
+        progress_timer = ui.timer(0.25, update_progress)
+
+    progress_dialog.open()
+    try:
+        return await asyncio.get_event_loop().run_in_executor(None, task, progress_callback)
+    finally:
+        progress_timer.cancel()
+        progress_dialog.close()
+
+
+# Minutes of history shown on the live chart
+CHART_WINDOW_MINUTES = 10
+
+
+def _extend_chart_js(plot_id: int, extend: dict, indices: List[int], new_traces: List[dict], cutoff: str) -> str:
+    """
+    Build the JavaScript that updates a live chart in place
+
+    Points older than cutoff are trimmed from every trace, then the new
+    points are appended with Plotly.extendTraces and new series are added
+    with Plotly.addTraces, so a tick only sends the points logged since the
+    previous one.
+
+    Args:
+        plot_id: ID of the ui.plotly element
+        extend: {'x': [...], 'y': [...]} lists of new points, one per index
+        indices: Trace indices the extend lists belong to
+        new_traces: Trace dictionaries for series that have no trace yet
+        cutoff: Timestamp string; points before it are dropped
+    """
+    return f"""
+    (() => {{
+        const chart = getElement({plot_id});
+        const Plotly = (chart && chart.Plotly) || window.Plotly;
+        const plot = chart && chart.$el;
+        if (!Plotly || !plot || !plot.data) return;
+
+        const cutoff = {json.dumps(cutoff)};
+        let trimmed = false;
+        for (const trace of plot.data) {{
+            let old = 0;
+            while (old < trace.x.length && trace.x[old] < cutoff) old++;
+            if (old) {{
+                trace.x.splice(0, old);
+                trace.y.splice(0, old);
+                trimmed = true;
+            }}
+        }}
+
+        const indices = {json.dumps(indices)};
+        if (indices.length) Plotly.extendTraces(plot, {json.dumps(extend)}, indices);
+        const newTraces = {json.dumps(new_traces)};
+        if (newTraces.length) Plotly.addTraces(plot, newTraces);
+        if (trimmed && !indices.length && !newTraces.length) Plotly.redraw(plot);
+    }})();
+    """
+
+
+# Points per series sent to the session viewer, for the full session or a zoomed-in range
+VIEWER_MAX_POINTS = 2000
+
+
+def _session_figure(series: List[dict]):
+    """Build the session viewer figure from get_downsampled_data() output"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for item in series:
+        unit = f" ({item['unit']})" if item['unit'] else ""
+        fig.add_trace(go.Scatter(
+            x=item['timestamps'],
+            y=item['values'],
+            mode='lines',
+            name=f"{item['device_name']} - {item['parameter']}{unit}",
+            line=dict(width=2)
+        ))
+
+    fig.update_layout(
+        template='plotly_dark',
+        plot_bgcolor='#333333',
+        paper_bgcolor='#333333',
+        font=dict(color='white'),
+        xaxis_title='Time',
+        yaxis_title='Value',
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(l=50, r=20, t=40, b=50),
+        height=550,
+        uirevision='session'  # keep zoom and legend state when the data is swapped
+    )
+    return fig
+
+
+async def show_session_viewer(session_id: int, session_name: str):
+    """
+    Plot a stored session, refetching a finer slice whenever the user zooms
+
+    Args:
+        session_id: Session to show
+        session_name: Title for the dialog
+    """
+    loop = asyncio.get_event_loop()
+
+    def fetch(start=None, end=None):
+        return data_logger.get_downsampled_data(session_id, start, end, max_points=VIEWER_MAX_POINTS)
+
+    series = await loop.run_in_executor(None, fetch)
+    if not series:
+        ui.notify("No data recorded in this session", type='info')
+        return
+
+    with ui.dialog() as viewer_dialog, ui.card().style("background-color: #333333; padding: 20px; width: 90vw; max-width: 90vw;"):
+        with ui.row().style("width: 100%; justify-content: space-between; align-items: center;"):
+            ui.label(session_name).style("color: white; font-size: 18px; font-weight: bold;")
+            detail_label = ui.label("").style("color: #888888; font-size: 12px;")
+            ui.button(icon="close", on_click=viewer_dialog.close).props("flat dense color=white")
+
+        plot = ui.plotly(_session_figure(series)).classes('w-full')
+
+        def show_detail(series):
+            raw = sum(item['raw_points'] for item in series)
+            shown = sum(len(item['values']) for item in series)
+            detail_label.set_text(f"Showing {shown:,} of {raw:,} points")
+
+        async def on_relayout(e):
+            """Fetch a higher-resolution slice for the zoomed range (or the whole session on reset)"""
+            args = e.args or {}
+            if 'xaxis.range[0]' in args and 'xaxis.range[1]' in args:
+                start, end = args['xaxis.range[0]'], args['xaxis.range[1]']
+            elif args.get('xaxis.autorange'):
+                start, end = None, None
+            else:
+                return
+
+            try:
+                zoomed = await loop.run_in_executor(None, fetch, start, end)
+            except ValueError:
+                return
+            if zoomed:
+                plot.figure = _session_figure(zoomed)
+                plot.update()
+                show_detail(zoomed)
+
+        plot.on('plotly_relayout', on_relayout)
+        show_detail(series)
+
+    viewer_dialog.open()
+
+
 def render():
     """Render the data logging page"""
 
@@ -21,12 +211,14 @@ def render():
         'chart_container': None,
         'device_checkboxes': {},
         'parameter_checkboxes': {},
+        'parameter_settings': {},  # device_name -> {param_name: {'interval', 'deadband', 'heartbeat'} inputs}
         'start_button': None,
         'stop_button': None,
         'pause_button': None,
         'session_name_input': None,
         'interval_input': None,
-        'sessions_container': None
+        'sessions_container': None,
+        'export_gzip': None
     }
 
     with ui.column().style("padding: 20px; width: 100%; gap: 20px; height: calc(100vh - 80px); overflow-y: auto;"):
@@ -84,14 +276,45 @@ def render():
 
                                             with param_container:
                                                 ui_refs['parameter_checkboxes'][device['name']] = {}
+                                                ui_refs['parameter_settings'][device['name']] = {}
 
                                                 for param_name, param_config in device['loggable_parameters'].items():
-                                                    param_checkbox = ui.checkbox(
-                                                        text=f"{param_config['display_name']} ({param_config['unit']})",
-                                                        value=True
-                                                    ).props("dark color=secondary dense")
+                                                    with ui.row().style("align-items: center; gap: 10px;"):
+                                                        param_checkbox = ui.checkbox(
+                                                            text=f"{param_config['display_name']} ({param_config['unit']})",
+                                                            value=True
+                                                        ).props("dark color=secondary dense")
+
+                                                        # Optional per-parameter interval (blank = session interval)
+                                                        param_interval = ui.number(
+                                                            label="Every (s)",
+                                                            value=param_config.get('interval'),
+                                                            min=0.1,
+                                                            max=3600
+                                                        ).props("dark outlined dense").style("width: 100px;")
+
+                                                        # Optional deadband: only record changes larger than this,
+                                                        # plus a heartbeat record every N seconds (blank = every reading)
+                                                        param_deadband = ui.number(
+                                                            label=f"Deadband ({param_config['unit']})",
+                                                            value=param_config.get('deadband'),
+                                                            min=0
+                                                        ).props("dark outlined dense").style("width: 120px;")
+
+                                                        param_heartbeat = ui.number(
+                                                            label="Heartbeat (s)",
+                                                            value=param_config.get('heartbeat'),
+                                                            min=1,
+                                                            max=86400
+                                                        ).props("dark outlined dense").style("width: 110px;").tooltip(
+                                                            "Record at least this often while the deadband holds back readings")
 
                                                     ui_refs['parameter_checkboxes'][device['name']][param_name] = param_checkbox
+                                                    ui_refs['parameter_settings'][device['name']][param_name] = {
+                                                        'interval': param_interval,
+                                                        'deadband': param_deadband,
+                                                        'heartbeat': param_heartbeat
+                                                    }
 
                                             # Show/hide parameters based on device selection
                                             def toggle_params(e, container=param_container, checkbox=device_checkbox):
@@ -111,6 +334,7 @@ def render():
                             # Get selected devices and parameters
                             selected_devices = []
                             selected_parameters = {}
+                            parameter_settings = {}
 
                             for device in devices_page.devices:
                                 device_name = device['name']
@@ -125,6 +349,13 @@ def render():
                                                 if checkbox.value:
                                                     params.append(param_name)
 
+                                                    # Blank inputs fall back to the device defaults
+                                                    inputs = ui_refs['parameter_settings'][device_name][param_name]
+                                                    settings = {key: float(field.value) for key, field in inputs.items()
+                                                                if field.value is not None and field.value != ''}
+                                                    if settings:
+                                                        parameter_settings.setdefault(device_name, {})[param_name] = settings
+
                                         selected_parameters[device_name] = params
 
                             if not selected_devices:
@@ -145,7 +376,8 @@ def render():
                                     session_name=session_name,
                                     devices=selected_devices,
                                     parameters=selected_parameters,
-                                    interval_seconds=interval
+                                    interval_seconds=interval,
+                                    parameter_settings=parameter_settings
                                 )
 
                                 ui.notify(f"Started logging session: {session_name}", type='positive')
@@ -203,18 +435,16 @@ def render():
                         ui.label("Previous Sessions").style("color: white; font-size: 18px; font-weight: bold;")
 
                         def show_import_dialog():
-                            """Show file picker dialog to import CSV"""
-                            selected_file = {'path': None}
+                            """Show file picker dialog to import one or more CSV files"""
+                            selected_files = []
 
                             with ui.dialog() as import_dialog, ui.card().style("background-color: #333333; padding: 20px; min-width: 500px;"):
-                                ui.label("Import Session from CSV").style("color: white; font-size: 18px; font-weight: bold; margin-bottom: 15px;")
+                                ui.label("Import Sessions from CSV").style("color: white; font-size: 18px; font-weight: bold; margin-bottom: 15px;")
 
                                 file_label = ui.label("No file selected").style("color: #888888; font-size: 14px; margin-bottom: 15px;")
 
                                 def handle_upload(e):
                                     """Handle file upload"""
-                                    import shutil
-
                                     # Save uploaded file temporarily
                                     upload_path = f"data/logs/temp_import_{e.name}"
                                     os.makedirs('data/logs', exist_ok=True)
@@ -223,60 +453,82 @@ def render():
                                     with open(upload_path, 'wb') as f:
                                         f.write(e.content.read())
 
-                                    selected_file['path'] = upload_path
-                                    file_label.set_text(f"Selected: {e.name}")
+                                    if upload_path not in selected_files:
+                                        selected_files.append(upload_path)
+                                    names = [os.path.basename(path).replace('temp_import_', '', 1) for path in selected_files]
+                                    file_label.set_text(f"Selected: {', '.join(names)}")
                                     file_label.style("color: #66bb6a;")
                                     ui.notify(f"Loaded: {e.name}", type='positive')
 
                                 ui.upload(
-                                    label="Choose CSV File",
+                                    label="Choose CSV Files",
                                     on_upload=handle_upload,
-                                    auto_upload=True
-                                ).props("accept=.csv color=primary").style("width: 100%; margin-bottom: 15px;")
+                                    auto_upload=True,
+                                    multiple=True
+                                ).props("accept=.csv,.gz color=primary").style("width: 100%; margin-bottom: 15px;")
 
                                 ui.separator().style("margin-bottom: 15px;")
-                                ui.label("Or enter file path manually:").style("color: white; font-size: 14px; margin-bottom: 10px;")
+                                ui.label("Or enter file paths manually (one per line):").style("color: white; font-size: 14px; margin-bottom: 10px;")
 
-                                file_path_input = ui.input(
-                                    label="CSV File Path",
+                                file_path_input = ui.textarea(
+                                    label="CSV File Paths",
                                     placeholder="data/logs/Example_Hotplate_Test.csv"
-                                ).props("dark outlined").style("width: 100%; margin-bottom: 15px;")
+                                ).props("dark outlined autogrow").style("width: 100%; margin-bottom: 15px;")
 
                                 with ui.row().style("gap: 10px; width: 100%; justify-content: flex-end;"):
                                     ui.button("Cancel", on_click=import_dialog.close).props("flat color=white")
 
-                                    def do_import():
-                                        """Import the CSV file"""
-                                        # Use uploaded file if available, otherwise use manual path
-                                        filepath = selected_file['path'] if selected_file['path'] else file_path_input.value
+                                    async def do_import():
+                                        """Import the CSV files, each into its own session"""
+                                        # Use uploaded files if available, otherwise use manual paths
+                                        filepaths = list(selected_files) or [
+                                            line.strip() for line in (file_path_input.value or '').splitlines() if line.strip()
+                                        ]
 
-                                        if not filepath:
+                                        if not filepaths:
                                             ui.notify("Please select a file or enter a path", type='warning')
                                             return
 
+                                        missing = [path for path in filepaths if not os.path.isfile(path)]
+                                        if missing:
+                                            ui.notify(f"File not found: {', '.join(missing)}", type='negative')
+                                            return
+
                                         try:
-                                            session_id = data_logger.import_session_from_csv(filepath)
-                                            ui.notify(f"Successfully imported session (ID: {session_id})", type='positive')
-
-                                            # Clean up temp file if it was uploaded
-                                            if selected_file['path'] and 'temp_import_' in selected_file['path']:
-                                                try:
-                                                    os.remove(selected_file['path'])
-                                                except:
-                                                    pass
-
-                                            import_dialog.close()
-                                            refresh_sessions_list()
-                                        except FileNotFoundError:
-                                            ui.notify(f"File not found: {filepath}", type='negative')
+                                            results = await run_with_progress(
+                                                f"Importing {len(filepaths)} file(s)...",
+                                                lambda progress_callback: data_logger.import_sessions_from_csv(
+                                                    filepaths, progress_callback=progress_callback),
+                                                unit="MB", scale=1e6
+                                            )
                                         except Exception as e:
                                             ui.notify(f"Import error: {str(e)}", type='negative')
+                                            return
+
+                                        for filepath, result in results.items():
+                                            name = os.path.basename(filepath).replace('temp_import_', '', 1)
+                                            if isinstance(result, Exception):
+                                                ui.notify(f"Import error ({name}): {str(result)}", type='negative')
+                                            else:
+                                                ui.notify(f"Successfully imported {name} (ID: {result})", type='positive')
+
+                                        # Clean up temp files that were uploaded
+                                        for filepath in selected_files:
+                                            try:
+                                                os.remove(filepath)
+                                            except OSError:
+                                                pass
+
+                                        import_dialog.close()
+                                        refresh_sessions_list()
 
                                     ui.button("Import", icon="upload", on_click=do_import).props("color=primary")
 
                             import_dialog.open()
 
-                        ui.button("Import CSV", icon="upload_file", on_click=show_import_dialog).props("color=primary size=sm")
+                        with ui.row().style("gap: 10px; align-items: center;"):
+                            ui_refs['export_gzip'] = ui.checkbox("Gzip exports").props("dark dense").style("color: #888888; font-size: 12px;")
+                            ui.button("Import CSV", icon="upload_file", on_click=show_import_dialog).props("color=primary size=sm")
 
                     ui_refs['sessions_container'] = ui.column().style("gap: 10px; width: 100%;")
 
@@ -294,12 +546,13 @@ def render():
                                             with ui.column().style("flex: 1;"):
                                                 ui.label(session['name']).style("color: white; font-size: 14px; font-weight: bold;")
                                                 ui.label(f"Started: {session['start_time']}").style("color: #888888; font-size: 12px;")
+                                                ui.label(f"Data points: {session['data_points']:,}").style("color: #888888; font-size: 12px;")
 
-                                                status_color = "#66bb6a" if session['status'] == 'stopped' else "#ffa726"
+                                                status_color = {"stopped": "#66bb6a", "archived": "#888888"}.get(session['status'], "#ffa726")
                                                 ui.label(f"Status: {session['status']}").style(f"color: {status_color}; font-size: 12px;")
 
                                             with ui.row().style("gap: 5px;"):
-                                                def export_csv(sid=session['id'], sname=session['name']):
+                                                async def export_csv(sid=session['id'], sname=session['name']):
                                                     """Export session to CSV"""
                                                     try:
                                                         # Create exports directory if it doesn't exist
@@ -307,16 +560,38 @@ def render():
 
                                                         # Generate filename
                                                         filename = f"data/logs/{sname.replace(' ', '_')}_{sid}.csv"
+                                                        if ui_refs['export_gzip'].value:
+                                                            filename += ".gz"
+
+                                                        # Export in the background, streaming rows to disk
+                                                        rows = await run_with_progress(
+                                                            f"Exporting {sname}...",
+                                                            lambda progress_callback: data_logger.export_session_to_csv(
+                                                                sid, filename, progress_callback=progress_callback)
+                                                        )
+                                                        ui.notify(f"Exported {rows:,} rows to {filename}", type='positive')
+                                                    except Exception as e:
+                                                        ui.notify(f"Export error: {str(e)}", type='negative')
 
-                                                        # Export
-                                                        data_logger.export_session_to_csv(sid, filename)
-                                                        ui.notify(f"Exported to {filename}", type='positive')
+                                                async def export_wide(extension, sid=session['id'], sname=session['name']):
+                                                    """Export session as a wide table (one column per parameter)"""
+                                                    try:
+                                                        os.makedirs('data/logs', exist_ok=True)
+                                                        filename = f"data/logs/{sname.replace(' ', '_')}_{sid}{extension}"
+
+                                                        rows = await run_with_progress(
+                                                            f"Exporting {sname}...",
+                                                            lambda progress_callback: data_logger.export_session_wide(
+                                                                sid, filename, progress_callback=progress_callback),
+                                                            unit="series"
+                                                        )
+                                                        ui.notify(f"Exported {rows:,} rows to {filename}", type='positive')
                                                     except Exception as e:
                                                         ui.notify(f"Export error: {str(e)}", type='negative')
 
-                                                def view_session(sid=session['id']):
-                                                    """View session data"""
-                                                    ui.notify("Session viewer coming soon", type='info')
+                                                async def view_session(sid=session['id'], sname=session['name']):
+                                                    """View session data, downsampled to what the chart can show"""
+                                                    await show_session_viewer(sid, sname)
 
                                                 def delete_session_confirm(sid=session['id'], sname=session['name']):
                                                     """Delete session with confirmation"""
@@ -327,11 +602,14 @@ def render():
                                                         with ui.row().style("gap: 10px; width: 100%; justify-content: flex-end;"):
                                                             ui.button("Cancel", on_click=confirm_dialog.close).props("flat color=white")
 
-                                                            def do_delete():
+                                                            async def do_delete():
                                                                 try:
-                                                                    data_logger.delete_session(sid)
-                                                                    ui.notify(f"Deleted session: {sname}", type='info')
+                                                                    # Chunked delete runs off the UI thread
                                                                     confirm_dialog.close()
+                                                                    ui.notify(f"Deleting session: {sname}...", type='info')
+                                                                    await asyncio.get_event_loop().run_in_executor(
+                                                                        None, data_logger.delete_session, sid)
+                                                                    ui.notify(f"Deleted session: {sname}", type='info')
                                                                     refresh_sessions_list()
                                                                 except Exception as e:
                                                                     ui.notify(f"Error deleting: {str(e)}", type='negative')
@@ -340,8 +618,40 @@ def render():
 
                                                     confirm_dialog.open()
 
-                                                ui.button(icon="download", on_click=export_csv).props("flat dense color=primary").tooltip("Export to CSV")
-                                                ui.button(icon="visibility", on_click=view_session).props("flat dense color=white").tooltip("View Data")
+                                                async def archive_session(sid=session['id'], sname=session['name']):
+                                                    """Move the session's data to a compressed archive file"""
+                                                    try:
+                                                        ui.notify(f"Archiving {sname}...", type='info')
+                                                        path = await asyncio.get_event_loop().run_in_executor(
+                                                            None, data_logger.archive_session, sid)
+                                                        ui.notify(f"Archived {sname} to {path}", type='positive')
+                                                        refresh_sessions_list()
+                                                    except Exception as e:
+                                                        ui.notify(f"Archive error: {str(e)}", type='negative')
+
+                                                async def restore_session(sid=session['id'], sname=session['name']):
+                                                    """Bring an archived session back into the database"""
+                                                    try:
+                                                        ui.notify(f"Restoring {sname}...", type='info')
+                                                        await asyncio.get_event_loop().run_in_executor(
+                                                            None, data_logger.restore_session, sid)
+                                                        ui.notify(f"Restored {sname}", type='positive')
+                                                        refresh_sessions_list()
+                                                    except Exception as e:
+                                                        ui.notify(f"Restore error: {str(e)}", type='negative')
+
+                                                if session['status'] == 'archived':
+                                                    ui.button(icon="unarchive", on_click=restore_session).props("flat dense color=primary").tooltip("Restore from Archive")
+                                                else:
+                                                    ui.button(icon="download", on_click=export_csv).props("flat dense color=primary").tooltip("Export to CSV")
+                                                    with ui.button(icon="table_chart").props("flat dense color=primary").tooltip("Export wide table"):
+                                                        with ui.menu():
+                                                            ui.menu_item("Parquet", on_click=lambda _, export=export_wide: export('.parquet'))
+                                                            ui.menu_item("Arrow IPC", on_click=lambda _, export=export_wide: export('.arrow'))
+                                                            ui.menu_item("NumPy (.npz)", on_click=lambda _, export=export_wide: export('.npz'))
+                                                    ui.button(icon="visibility", on_click=view_session).props("flat dense color=white").tooltip("View Data")
+                                                    if session['status'] == 'stopped':
+                                                        ui.button(icon="archive", on_click=archive_session).props("flat dense color=white").tooltip("Archive Session")
                                                 ui.button(icon="delete", on_click=delete_session_confirm).props("flat dense color=negative").tooltip("Delete Session")
                             else:
                                 ui.label("No previous sessions").style("color: #888888; font-size: 14px;")
@@ -382,7 +692,7 @@ def render():
                     ui_refs['pause_button'].props("icon=pause")
 
                 # Update chart
-                update_chart()
+                update_chart(status)
             else:
                 # No active session
                 ui_refs['status_label'].set_text("Not logging")
@@ -395,71 +705,102 @@ def render():
                 ui_refs['stop_button'].style("display: none;")
                 ui_refs['pause_button'].style("display: none;")
 
-        def update_chart():
-            """Update the live data chart"""
-            status = data_logger.get_session_status()
-
+        # Live chart state: the plot element, which (device, parameter)
+        # feeds which trace, and the last timestamp already sent for each
+        chart_state = {
+            'session_id': None,
+            'plot': None,
+            'traces': {},
+            'cursors': {},
+        }
+
+        def make_trace(update):
+            """Build the Plotly trace dictionary for one series"""
+            import plotly.graph_objects as go
+
+            return go.Scatter(
+                x=update['x'],
+                y=update['values'],
+                mode='lines+markers',
+                name=f"{update['device_name']} - {update['parameter']}",
+                line=dict(width=2),
+                marker=dict(size=4)
+            ).to_plotly_json()
+
+        def update_chart(status: Dict):
+            """
+            Update the live data chart with points logged since the last tick
+
+            Args:
+                status: This tick's get_session_status(), shared with update_status()
+            """
             if not status['active']:
                 return
 
-            # Get recent data (last 10 minutes)
-            recent_data = data_logger.get_recent_data(status['session_id'], minutes=10)
-
-            if not recent_data:
+            # A new session starts a new chart
+            if chart_state['session_id'] != status['session_id']:
+                chart_state.update(session_id=status['session_id'], plot=None, traces={}, cursors={})
+
+            # Read from the logger's in-memory buffer rather than the database
+            updates = data_logger.get_live_snapshot(chart_state['cursors'])
+            for update in updates:
+                update['key'] = (update['device_name'], update['parameter'])
+                update['x'] = [datetime.fromtimestamp(ts).isoformat(sep=' ') for ts in update['timestamps']]
+
+            if chart_state['plot'] is None:
+                if not updates:
+                    return
+
+                # First data: send the whole window once
+                import plotly.graph_objects as go
+
+                fig = go.Figure()
+                for update in updates:
+                    chart_state['traces'][update['key']] = len(fig.data)
+                    fig.add_trace(make_trace(update))
+
+                fig.update_layout(
+                    template='plotly_dark',
+                    plot_bgcolor='#333333',
+                    paper_bgcolor='#333333',
+                    font=dict(color='white'),
+                    xaxis_title='Time',
+                    yaxis_title='Value',
+                    hovermode='x unified',
+                    showlegend=True,
+                    legend=dict(
+                        orientation="h",
+                        yanchor="bottom",
+                        y=1.02,
+                        xanchor="right",
+                        x=1
+                    ),
+                    margin=dict(l=50, r=20, t=40, b=50),
+                    height=450
+                )
+
+                ui_refs['chart_container'].clear()
+                with ui_refs['chart_container']:
+                    chart_state['plot'] = ui.plotly(fig).classes('w-full h-full')
                 return
 
-            # Organize data by parameter
-            data_by_param = {}
-            for timestamp, device_name, parameter, value, unit in recent_data:
-                key = f"{device_name} - {parameter}"
-                if key not in data_by_param:
-                    data_by_param[key] = {'timestamps': [], 'values': [], 'unit': unit}
-
-                data_by_param[key]['timestamps'].append(timestamp)
-                data_by_param[key]['values'].append(value)
-
-            # Create Plotly chart
-            ui_refs['chart_container'].clear()
-
-            with ui_refs['chart_container']:
-                if data_by_param:
-                    import plotly.graph_objects as go
-
-                    fig = go.Figure()
-
-                    for param_key, param_data in data_by_param.items():
-                        fig.add_trace(go.Scatter(
-                            x=param_data['timestamps'],
-                            y=param_data['values'],
-                            mode='lines+markers',
-                            name=param_key,
-                            line=dict(width=2),
-                            marker=dict(size=4)
-                        ))
-
-                    fig.update_layout(
-                        template='plotly_dark',
-                        plot_bgcolor='#333333',
-                        paper_bgcolor='#333333',
-                        font=dict(color='white'),
-                        xaxis_title='Time',
-                        yaxis_title='Value',
-                        hovermode='x unified',
-                        showlegend=True,
-                        legend=dict(
-                            orientation="h",
-                            yanchor="bottom",
-                            y=1.02,
-                            xanchor="right",
-                            x=1
-                        ),
-                        margin=dict(l=50, r=20, t=40, b=50),
-                        height=450
-                    )
-
-                    ui.plotly(fig).classes('w-full h-full')
+            # Later ticks: append only the new points in the browser and drop
+            # points that have left the window there too
+            new_traces = []
+            extend = {'x': [], 'y': []}
+            indices = []
+            for update in updates:
+                index = chart_state['traces'].get(update['key'])
+                if index is None:
+                    chart_state['traces'][update['key']] = len(chart_state['traces'])
+                    new_traces.append(make_trace(update))
                 else:
-                    ui.label("Waiting for data...").style("color: #888888; font-size: 14px; text-align: center; margin-top: 200px;")
+                    extend['x'].append(update['x'])
+                    extend['y'].append(update['values'])
+                    indices.append(index)
+
+            cutoff = (datetime.now() - timedelta(minutes=CHART_WINDOW_MINUTES)).strftime('%Y-%m-%d %H:%M:%S')
+            ui.run_javascript(_extend_chart_js(chart_state['plot'].id, extend, indices, new_traces, cutoff))
 
         # Update every 2 seconds
         ui.timer(2.0, update_status)
@@ -4,6 +4,7 @@ import cv2
 import asyncio
 import serial
 import serial.tools.list_ports
+from simulators import open_serial
 import threading
 from typing import Optional
 
@@ -93,7 +94,7 @@ def connect_arduino(fume_hood):
 
     try:
         # Open serial connection
-        ser = serial.Serial(arduino_port, 9600, timeout=1)
+        ser = open_serial(arduino_port, baudrate=9600, timeout=1)
 
         # Wait for Arduino to initialize
         import time
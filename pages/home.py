@@ -9,6 +9,7 @@ from pages import devices as devices_page
 from pages import fume_hood as fume_hood_page
 from pages import bench as bench_page
 import data_manager
+from telemetry import telemetry
 
 def render_dashboard_content():
     """Render the dashboard content (devices, fume hoods, benches)"""
@@ -157,6 +158,7 @@ def render():
                                     bench_page.benches.clear()
 
                                     # Load devices
+                                    import devices as device_modules
                                     for device_data in devices_data:
                                         device = {
                                             'name': device_data['name'],
@@ -164,7 +166,9 @@ def render():
                                             'com_port': device_data.get('com_port', ''),
                                             'show_on_dashboard': device_data.get('show_on_dashboard', False),
                                             'icon': device_data.get('icon', ''),
-                                            'webcams': device_data.get('webcams', [])  # Load webcams list
+                                            'webcams': device_data.get('webcams', []),  # Load webcams list
+                                            # Not saved; the data logger and telemetry need them
+                                            'loggable_parameters': device_modules.get_loggable_parameters(device_data['type'])
                                         }
                                         devices_page.devices.append(device)
 
@@ -280,7 +284,7 @@ def render_ika_stirrer_data(device):
             ui.label("Temperature").style("color: white; font-size: 12px; font-weight: bold;")
             if 'driver' in device and device.get('connection_state', {}).get('connected', False):
                 try:
-                    temp = device['driver'].get_temperature(sensor_type=2)
+                    temp = telemetry.get_value(device['name'], 'temperature')
                     temp_label = ui.label(f"{temp:.1f} °C").style("color: #ef5350; font-size: 24px; font-weight: bold;")
                 except:
                     temp_label = ui.label("-- °C").style("color: #ef5350; font-size: 24px; font-weight: bold;")
@@ -292,7 +296,7 @@ def render_ika_stirrer_data(device):
             ui.label("Stirrer Speed").style("color: white; font-size: 12px; font-weight: bold;")
             if 'driver' in device and device.get('connection_state', {}).get('connected', False):
                 try:
-                    speed = device['driver'].get_speed()
+                    speed = telemetry.get_value(device['name'], 'speed')
                     speed_label = ui.label(f"{speed:.0f} RPM").style("color: #42a5f5; font-size: 24px; font-weight: bold;")
                 except:
                     speed_label = ui.label("-- RPM").style("color: #42a5f5; font-size: 24px; font-weight: bold;")
@@ -304,12 +308,12 @@ def render_ika_stirrer_data(device):
         def update_standalone_device_data():
             if device.get('connection_state', {}).get('connected', False):
                 try:
-                    temp = device['driver'].get_temperature(sensor_type=2)
+                    temp = telemetry.get_value(device['name'], 'temperature')
                     temp_label.set_text(f"{temp:.1f} °C")
                 except:
                     temp_label.set_text("-- °C")
                 try:
-                    speed = device['driver'].get_speed()
+                    speed = telemetry.get_value(device['name'], 'speed')
                     speed_label.set_text(f"{speed:.0f} RPM")
                 except:
                     speed_label.set_text("-- RPM")
@@ -525,12 +529,12 @@ def render_fume_hood_card(fume_hood):
                                                 if 'driver' in device and device.get('connection_state', {}).get('connected', False):
                                                     # Create updateable labels
                                                     try:
-                                                        temp = device['driver'].get_temperature(sensor_type=2)
+                                                        temp = telemetry.get_value(device['name'], 'temperature')
                                                         temp_label = ui.label(f"🌡 {temp:.1f}°C").style("color: #ef5350; font-size: 12px; font-weight: bold;")
                                                     except:
                                                         temp_label = ui.label("🌡 --°C").style("color: #ef5350; font-size: 12px;")
                                                     try:
-                                                        speed = device['driver'].get_speed()
+                                                        speed = telemetry.get_value(device['name'], 'speed')
                                                         speed_label = ui.label(f"⚙ {speed:.0f} RPM").style("color: #42a5f5; font-size: 12px; font-weight: bold;")
                                                     except:
                                                         speed_label = ui.label("⚙ -- RPM").style("color: #42a5f5; font-size: 12px;")
@@ -539,12 +543,12 @@ def render_fume_hood_card(fume_hood):
                                                     def update_dashboard_device_data():
                                                         if device.get('connection_state', {}).get('connected', False):
                                                             try:
-                                                                temp = device['driver'].get_temperature(sensor_type=2)
+                                                                temp = telemetry.get_value(device['name'], 'temperature')
                                                                 temp_label.set_text(f"🌡 {temp:.1f}°C")
                                                             except:
                                                                 temp_label.set_text("🌡 --°C")
                                                             try:
-                                                                speed = device['driver'].get_speed()
+                                                                speed = telemetry.get_value(device['name'], 'speed')
                                                                 speed_label.set_text(f"⚙ {speed:.0f} RPM")
                                                             except:
                                                                 speed_label.set_text("⚙ -- RPM")
@@ -641,12 +645,12 @@ def render_bench_card(bench):
                                                 if 'driver' in device and device.get('connection_state', {}).get('connected', False):
                                                     # Create updateable labels
                                                     try:
-                                                        temp = device['driver'].get_temperature(sensor_type=2)
+                                                        temp = telemetry.get_value(device['name'], 'temperature')
                                                         temp_label = ui.label(f"🌡 {temp:.1f}°C").style("color: #ef5350; font-size: 12px; font-weight: bold;")
                                                     except:
                                                         temp_label = ui.label("🌡 --°C").style("color: #ef5350; font-size: 12px;")
                                                     try:
-                                                        speed = device['driver'].get_speed()
+                                                        speed = telemetry.get_value(device['name'], 'speed')
                                                         speed_label = ui.label(f"⚙ {speed:.0f} RPM").style("color: #42a5f5; font-size: 12px; font-weight: bold;")
                                                     except:
                                                         speed_label = ui.label("⚙ -- RPM").style("color: #42a5f5; font-size: 12px;")
@@ -655,12 +659,12 @@ def render_bench_card(bench):
                                                     def update_dashboard_device_data():
                                                         if device.get('connection_state', {}).get('connected', False):
                                                             try:
-                                                                temp = device['driver'].get_temperature(sensor_type=2)
+                                                                temp = telemetry.get_value(device['name'], 'temperature')
                                                                 temp_label.set_text(f"🌡 {temp:.1f}°C")
                                                             except:
                                                                 temp_label.set_text("🌡 --°C")
                                                             try:
-                                                                speed = device['driver'].get_speed()
+                                                                speed = telemetry.get_value(device['name'], 'speed')
                                                                 speed_label.set_text(f"⚙ {speed:.0f} RPM")
                                                             except:
                                                                 speed_label.set_text("⚙ -- RPM")
@@ -4,6 +4,12 @@ import threading
 from typing import Optional, Dict, Callable
 from dataclasses import dataclass
 
+try:
+    from simulators import open_serial
+except ImportError:
+    # Standalone use (controlGUI.py) outside ChemiSuite: real ports only
+    open_serial = serial.Serial
+
 @dataclass
 class MotorStatus:
     """Represents the current status of a motor"""
@@ -53,8 +59,8 @@ class MotorController:
     def connect(self) -> bool:
         """Establish serial connection to Arduino"""
         try:
-            self.serial = serial.Serial(
-                port=self.port,
+            self.serial = open_serial(
+                self.port,
                 baudrate=self.baudrate,
                 timeout=self.timeout
             )
@@ -0,0 +1,23 @@
+# simulators/__init__.py
+"""
+Simulated serial devices for ChemiSuite
+
+Drivers open their ports through open_serial(), which returns a real
+serial.Serial for names like 'COM3' and an in-process simulator for
+sim:// URLs, so the logger, dashboard and ARChemedes can be load tested
+without hardware:
+
+- sim://ika/<id>          IKA hotplate (NAMUR)
+- sim://azura/<id>        AZURA pump
+- sim://roboschlenk/<id>  RoboSchlenk motor controller
+- sim://fumehood/<id>     Fume hood sash sensor Arduino (option: period)
+
+All simulators accept latency, jitter, error_rate and seed query options,
+e.g. sim://ika/7?latency=0.03&jitter=0.01&error_rate=0.02
+
+simulators.mqtt_broker.FakeBroker stands in for the MQTT broker that
+ARChemedes publishes to.
+"""
+
+from .transport import SIMULATORS, SimulatedSerial, is_simulated, open_serial, register_simulator
+from . import devices
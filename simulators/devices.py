@@ -0,0 +1,234 @@
+"""
+Simulated instruments for ChemiSuite load testing
+Each class speaks the serial protocol of one real device
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from .transport import SimulatedSerial, register_simulator
+
+
+@register_simulator('ika')
+class IKAHotplateSimulator(SimulatedSerial):
+    """
+    IKA RET control-visc hotplate speaking NAMUR (CR LF terminated)
+
+    Temperature approaches the setpoint exponentially while heating and
+    falls back to ambient otherwise; stirring speed ramps linearly.
+    Setpoint, START and STOP commands are not answered, as on the hardware.
+    """
+
+    TERMINATOR = b'\r\n'
+
+    AMBIENT = 22.0
+    HEAT_TIME_CONSTANT = 120.0  # seconds
+    SPEED_RAMP = 200.0  # RPM per second
+
+    def __init__(self, port: str, **options):
+        super().__init__(port, **options)
+        self.setpoints = {1: 25.0, 2: 25.0, 4: 0.0}
+        self.running = {2: False, 4: False}
+        self.temperature = self.AMBIENT
+        self.speed = 0.0
+        self._updated = None
+
+    def _update(self, now: float):
+        """Advance temperature and speed to time now"""
+        if self._updated is not None and now > self._updated:
+            dt = now - self._updated
+
+            target = self.setpoints[2] if self.running[2] else self.AMBIENT
+            self.temperature = target + (self.temperature - target) * math.exp(-dt / self.HEAT_TIME_CONSTANT)
+
+            target = self.setpoints[4] if self.running[4] else 0.0
+            step = self.SPEED_RAMP * dt
+            self.speed = min(target, self.speed + step) if self.speed < target else max(target, self.speed - step)
+        self._updated = now if self._updated is None else max(self._updated, now)
+
+    def handle_command(self, command: str, now: float) -> Optional[str]:
+        self._update(now)
+        name, _, argument = command.partition(' ')
+
+        if name == 'IN_NAME':
+            return 'RET control-visc'
+        if name == 'IN_TYPE':
+            return 'IKA RET'
+        if name == 'IN_SOFTWARE_ID':
+            return '1.0 SIM'
+        if name.startswith('IN_PV_'):
+            channel = int(name[6:])
+            value = {4: self.speed, 5: 0.0}.get(channel, self.temperature)
+            return f"{value:.1f} {channel}"
+        if name.startswith('IN_SP_'):
+            channel = int(name[6:])
+            return f"{self.setpoints.get(channel, 0.0):.1f} {channel}"
+        if name.startswith('OUT_SP_') and '@' not in name:
+            self.setpoints[int(name[7:])] = float(argument)
+            return None
+        if name.startswith('START_') or name.startswith('STOP_'):
+            channel = int(name.split('_')[1])
+            if channel in (1, 2):
+                channel = 2
+            self.running[channel] = name.startswith('START_')
+            return None
+        if name == 'RESET':
+            self.running = {2: False, 4: False}
+            return 'RESET'
+        # Watchdog and safety limits are acknowledged with an echo
+        return command
+
+
+@register_simulator('azura')
+class AzuraPumpSimulator(SimulatedSerial):
+    """
+    AZURA P 4.1S pump (CR terminated, "NAME:value" replies)
+
+    Pressure follows flow rate while the pump runs; motor current follows
+    pressure. Every command is answered, settings with "OK".
+    """
+
+    TERMINATOR = b'\r'
+
+    def __init__(self, port: str, **options):
+        super().__init__(port, **options)
+        self.flow = 0  # µL/min
+        self.head_type = 10
+        self.pumping = False
+
+    def handle_command(self, command: str, now: float) -> Optional[str]:
+        if command == 'FLOW?':
+            return f"FLOW:{self.flow}"
+        if command == 'PRESSURE?':
+            # 0.1 MPa units, roughly 1 MPa per 5 mL/min plus a little noise
+            pressure = self.flow / 500.0 if self.pumping else 0.0
+            return f"PRESSURE:{max(0, int(pressure + self.random.uniform(-1, 1)))}"
+        if command == 'IMOTOR?':
+            return f"IMOTOR:{min(100, int(self.flow / 500)) if self.pumping else 0}"
+        if command == 'HEADTYPE?':
+            return f"HEADTYPE:{self.head_type}"
+        if command == 'ERRORS?':
+            return "ERRORS:0,0,0,0,0"
+        if command.startswith('FLOW:'):
+            self.flow = int(command[5:])
+            return "OK"
+        if command.startswith('HEADTYPE:'):
+            self.head_type = int(command[9:])
+            return "OK"
+        if command in ('ON', 'OFF'):
+            self.pumping = command == 'ON'
+            return "OK"
+        if command in ('REMOTE', 'LOCAL'):
+            return "OK"
+        return "ERROR:UNKNOWN"
+
+
+@register_simulator('roboschlenk')
+class RoboSchlenkSimulator(SimulatedSerial):
+    """
+    RoboSchlenk four-motor Arduino (newline terminated)
+
+    Answers motor commands with RESPONSE|<motor>|OK|<message>|END and the
+    STATUS command with STATUS|A,<angle>,<moving>,<enabled>|...|END. Motors
+    turn towards their target at DEGREES_PER_SECOND.
+    """
+
+    MOTORS = ('A', 'B', 'C', 'D')
+    POSITIONS = {'CLOSED': 0.0, 'GAS': 90.0, 'VACUUM': 270.0}
+    DEGREES_PER_SECOND = 90.0
+
+    def __init__(self, port: str, **options):
+        super().__init__(port, **options)
+        self.angles = {motor: 0.0 for motor in self.MOTORS}
+        self.targets = dict(self.angles)
+        self.enabled = {motor: True for motor in self.MOTORS}
+        self._updated = None
+        self._greeted = False
+
+    def _update(self, now: float):
+        """Advance every motor towards its target"""
+        if self._updated is not None and now > self._updated:
+            step = self.DEGREES_PER_SECOND * (now - self._updated)
+            for motor in self.MOTORS:
+                if not self.enabled[motor]:
+                    continue
+                angle, target = self.angles[motor], self.targets[motor]
+                self.angles[motor] = min(target, angle + step) if angle < target else max(target, angle - step)
+        self._updated = now if self._updated is None else max(self._updated, now)
+
+    def poll(self, now: float) -> List[Tuple[float, str]]:
+        # The Arduino announces itself once after opening the port
+        if not self._greeted:
+            self._greeted = True
+            return [(now, 'READY|RoboSchlenk SIM')]
+        return []
+
+    def handle_command(self, command: str, now: float) -> Optional[str]:
+        self._update(now)
+
+        if command == 'STATUS':
+            fields = [
+                f"{motor},{self.angles[motor]:.2f},{int(self.angles[motor] != self.targets[motor])},{int(self.enabled[motor])}"
+                for motor in self.MOTORS
+            ]
+            return f"STATUS|{'|'.join(fields)}|END"
+
+        parts = command.split()
+        motor = parts[0] if parts else ''
+        if motor not in self.MOTORS or len(parts) < 2:
+            return f"RESPONSE|{motor or '?'}|ERROR|Unknown command|END"
+
+        action = parts[1]
+        if action == 'ANGLE' and len(parts) == 3:
+            self.targets[motor] = float(parts[2])
+            message = f"Moving to {self.targets[motor]:.2f} degrees"
+        elif action in self.POSITIONS:
+            self.targets[motor] = self.POSITIONS[action]
+            message = f"Moving to {action}"
+        elif action in ('ENABLE', 'DISABLE'):
+            self.enabled[motor] = action == 'ENABLE'
+            message = f"Motor {action.lower()}d"
+        elif action == 'STOP':
+            self.targets[motor] = self.angles[motor]
+            message = "Stopped"
+        else:
+            return f"RESPONSE|{motor}|ERROR|Unknown command|END"
+        return f"RESPONSE|{motor}|OK|{message}|END"
+
+
+@register_simulator('fumehood')
+class FumeHoodSimulator(SimulatedSerial):
+    """
+    Fume hood sash sensor Arduino (fume_hood_controller.ino)
+
+    Prints "Window Sensor Initialized" on start, then "Window OPEN" /
+    "Window CLOSED" whenever the simulated sash moves, every `period` seconds.
+    """
+
+    TERMINATOR = b'\r\n'
+
+    def __init__(self, port: str, period: float = 30.0, **options):
+        """
+        Args:
+            period: Seconds between sash movements
+        """
+        super().__init__(port, **options)
+        self.period = period
+        self.sash_open = False
+        self._next_event = None
+
+    def poll(self, now: float) -> List[Tuple[float, str]]:
+        messages = []
+        if self._next_event is None:
+            messages = [(now, 'Window Sensor Initialized'), (now, 'Window CLOSED')]
+            self._next_event = now + self.period
+
+        while self._next_event <= now:
+            self.sash_open = not self.sash_open
+            messages.append((self._next_event, 'Window OPEN' if self.sash_open else 'Window CLOSED'))
+            self._next_event += self.period
+        return messages
+
+    def handle_command(self, command: str, now: float) -> Optional[str]:
+        # The sketch doesn't read serial input
+        return None
@@ -0,0 +1,147 @@
+"""
+In-process MQTT broker stand-in for ChemiSuite load testing
+Accepts MQTTPublisher connections without a network and acknowledges
+messages after a simulated round trip, so hundreds of topics and broker
+outages can be exercised without Mosquitto
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from mqtt_publisher import BrokerRefused
+
+
+class FakeBroker:
+    """
+    Broker that records what it receives and acks after latency (+/- jitter) seconds
+
+    Acks are delivered from one broker thread, like paho's network thread.
+    go_offline() drops every connection (losing the acks not yet delivered)
+    and refuses new ones until go_online().
+    """
+
+    def __init__(self, latency: float = 0.005, jitter: float = 0.0, refuse_rc: int = 0, seed: Optional[int] = None):
+        """
+        Args:
+            latency: Seconds from publish to ack
+            jitter: Random +/- variation of the latency
+            refuse_rc: CONNACK code returned to new connections (0 accepts them)
+            seed: Random seed for the jitter
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.refuse_rc = refuse_rc
+        self.online = True
+        self._random = random.Random(seed)
+
+        self.received = 0
+        self.bytes = 0
+        self.topics = {}      # topic -> messages received
+        self.retained = {}    # topic -> last retained payload
+        self.connections = 0
+
+        self._connection = None
+        self._acks = []       # heap of (due time.monotonic(), sequence, connection, mid)
+        self._sequence = itertools.count()
+        self._lock = threading.Condition()
+        self._thread = threading.Thread(target=self._deliver_acks, daemon=True, name="FakeBroker")
+        self._thread.start()
+
+    def connection(self) -> 'FakeBrokerConnection':
+        """New unconnected client connection (pass as MQTTPublisher's connection_factory)"""
+        return FakeBrokerConnection(self)
+
+    def go_offline(self):
+        """Drop the current connection and refuse new ones"""
+        with self._lock:
+            self.online = False
+            connection, self._connection = self._connection, None
+            self._acks = []
+        if connection is not None:
+            connection._drop("Broker went offline")
+
+    def go_online(self):
+        """Accept connections again"""
+        self.online = True
+
+    def get_stats(self) -> Dict:
+        """Messages and bytes received, distinct and retained topics and connections made"""
+        return {
+            'received': self.received,
+            'bytes': self.bytes,
+            'topics': len(self.topics),
+            'retained': len(self.retained),
+            'connections': self.connections,
+        }
+
+    def _accept(self, connection: 'FakeBrokerConnection'):
+        """Register a connecting client, raising like a real broker would"""
+        if not self.online:
+            raise ConnectionRefusedError("Broker unreachable")
+        if self.refuse_rc:
+            raise BrokerRefused(self.refuse_rc)
+        with self._lock:
+            self._connection = connection
+            self.connections += 1
+
+    def _receive(self, connection: 'FakeBrokerConnection', mid: int, topic: str, payload, retain: bool):
+        """Take one message and schedule its ack"""
+        with self._lock:
+            if connection is not self._connection:
+                raise ConnectionError("Not connected")
+            self.received += 1
+            self.bytes += len(payload)
+            self.topics[topic] = self.topics.get(topic, 0) + 1
+            if retain:
+                self.retained[topic] = payload
+
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            heapq.heappush(self._acks, (time.monotonic() + delay, next(self._sequence), connection, mid))
+            self._lock.notify()
+
+    def _deliver_acks(self):
+        """Broker thread: call on_ack for every ack that is due"""
+        while True:
+            with self._lock:
+                while not self._acks or self._acks[0][0] > time.monotonic():
+                    self._lock.wait(self._acks[0][0] - time.monotonic() if self._acks else None)
+                _, _, connection, mid = heapq.heappop(self._acks)
+            connection._on_ack(mid)
+
+
+class FakeBrokerConnection:
+    """One client connection to a FakeBroker, with the interface of PahoConnection"""
+
+    def __init__(self, broker: FakeBroker):
+        self.broker = broker
+        self._mids = itertools.count(1)
+        self._on_ack = None
+        self._on_lost = None
+
+    def connect(self, on_ack: Callable[[int], None], on_lost: Callable[[str], None]):
+        """Connect to the broker (raises if it is offline or refusing)"""
+        self._on_ack = on_ack
+        self._on_lost = on_lost
+        self.broker._accept(self)
+
+    def publish(self, topic: str, payload, qos: int, retain: bool) -> int:
+        """Send one message and return its mid"""
+        mid = next(self._mids)
+        data = payload.encode('utf-8') if isinstance(payload, str) else payload
+        self.broker._receive(self, mid, topic, data, retain)
+        return mid
+
+    def close(self):
+        """Disconnect from the broker"""
+        with self.broker._lock:
+            if self.broker._connection is self:
+                self.broker._connection = None
+
+    def _drop(self, reason: str):
+        """The broker closed the connection"""
+        if self._on_lost is not None:
+            self._on_lost(reason)
@@ -0,0 +1,238 @@
+"""
+Serial transport layer for ChemiSuite drivers
+Opens real serial ports or in-process device simulators behind the same interface
+"""
+
+import bisect
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import serial
+
+SIM_SCHEME = 'sim://'
+
+# Simulator classes by device kind, filled in by @register_simulator
+SIMULATORS = {}
+
+
+def register_simulator(kind: str):
+    """Class decorator registering a SimulatedSerial subclass as sim://<kind>"""
+    def decorator(cls):
+        SIMULATORS[kind] = cls
+        return cls
+    return decorator
+
+
+def is_simulated(port: Optional[str]) -> bool:
+    """Check whether a port name refers to a simulated device"""
+    return bool(port) and port.startswith(SIM_SCHEME)
+
+
+def open_serial(port: str, **serial_kwargs):
+    """
+    Open a serial port, or a simulated device for sim:// URLs
+
+    Simulated ports look like sim://<kind>[/<id>][?latency=0.02&jitter=0.005&error_rate=0.01&seed=1]
+    where kind is one of SIMULATORS (e.g. sim://ika/3). The id only tells
+    otherwise identical devices apart; the query sets the simulator options.
+
+    Args:
+        port: Serial port name (e.g. 'COM3', '/dev/ttyUSB0') or sim:// URL
+        **serial_kwargs: serial.Serial arguments (baudrate, timeout, ...)
+
+    Returns:
+        serial.Serial or a SimulatedSerial with the same read/write interface
+    """
+    if not is_simulated(port):
+        return serial.Serial(port=port, **serial_kwargs)
+
+    url = urlsplit(port)
+    if url.netloc not in SIMULATORS:
+        raise serial.SerialException(f"Unknown simulated device '{url.netloc}' in {port}")
+
+    options = {}
+    for key, value in parse_qsl(url.query):
+        for convert in (int, float, str):
+            try:
+                options[key] = convert(value)
+                break
+            except ValueError:
+                continue
+
+    return SIMULATORS[url.netloc](port, timeout=serial_kwargs.get('timeout'), **options)
+
+
+class SimulatedSerial:
+    """
+    In-process stand-in for serial.Serial that plays a device protocol
+
+    Subclasses set TERMINATOR and implement handle_command(); they may also
+    override poll() to emit unsolicited lines. The simulation is lazy: replies
+    are scheduled when a command is written and become readable once their
+    delivery time has passed, so no thread is needed per simulated device.
+
+    Like a real instrument, the device handles one command at a time: each
+    reply is delivered latency (+/- jitter) seconds after the previous one.
+    """
+
+    TERMINATOR = b'\n'
+
+    def __init__(self, port: str, timeout: Optional[float] = None, latency: float = 0.02,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            port: The sim:// URL the device was opened with
+            timeout: Read timeout in seconds (None blocks, 0 doesn't wait)
+            latency: Mean seconds the device takes to answer a command
+            jitter: Maximum random deviation from latency, in seconds
+            error_rate: Probability (0-1) that a reply is lost
+            seed: Random seed, for reproducible runs
+        """
+        self.port = port
+        self.timeout = timeout
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.is_open = True
+
+        self._rx = bytearray()  # Delivered, not yet read
+        self._pending: List[Tuple[float, int, bytes]] = []  # (deliver_at, seq, data), sorted
+        self._sequence = 0
+        self._tx = bytearray()  # Written, not yet a complete command
+        self._busy_until = 0.0
+        self._cond = threading.Condition()
+
+        # Statistics
+        self.commands_received = 0
+        self.replies_dropped = 0
+
+    # --- Device behaviour (subclasses) ---
+
+    def handle_command(self, command: str, now: float) -> Optional[str]:
+        """Process one command and return the reply line (None for no reply)"""
+        raise NotImplementedError
+
+    def poll(self, now: float) -> List[Tuple[float, str]]:
+        """Return unsolicited (time, line) messages due up to now"""
+        return []
+
+    # --- Scheduling ---
+
+    def _delay(self) -> float:
+        """One command's processing time"""
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def _schedule(self, deliver_at: float, line: str):
+        """Queue a line for delivery (caller holds _cond)"""
+        self._sequence += 1
+        bisect.insort(self._pending, (deliver_at, self._sequence, line.encode('ascii') + self.TERMINATOR))
+
+    def _deliver(self, now: float):
+        """Move due replies into the receive buffer (caller holds _cond)"""
+        for at, line in self.poll(now):
+            self._schedule(at, line)
+
+        delivered = 0
+        for deliver_at, _, data in self._pending:
+            if deliver_at > now:
+                break
+            self._rx += data
+            delivered += 1
+        del self._pending[:delivered]
+
+    # --- serial.Serial interface ---
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cond:
+            self._deliver(time.monotonic())
+            return len(self._rx)
+
+    def write(self, data: bytes) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+
+        with self._cond:
+            self._tx += data
+            while self.TERMINATOR in self._tx:
+                raw, _, rest = self._tx.partition(self.TERMINATOR)
+                self._tx = bytearray(rest)
+                command = raw.decode('ascii', errors='ignore').strip()
+                if not command:
+                    continue
+
+                now = time.monotonic()
+                self._busy_until = max(now, self._busy_until) + self._delay()
+                self.commands_received += 1
+                reply = self.handle_command(command, self._busy_until)
+
+                if reply is not None:
+                    if self.random.random() < self.error_rate:
+                        self.replies_dropped += 1
+                    else:
+                        self._schedule(self._busy_until, reply)
+            self._cond.notify_all()
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._deliver(now)
+                if len(self._rx) >= size:
+                    break
+                if deadline is not None and now >= deadline:
+                    break
+
+                # Sleep until the next reply is due, the deadline or a write,
+                # waking at least every 50 ms to let poll() emit messages
+                waits = [0.05] + [at - now for at, _, _ in self._pending[:1]]
+                if deadline is not None:
+                    waits.append(deadline - now)
+                self._cond.wait(min(waits))
+
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+            return data
+
+    def read_until(self, expected: bytes = b'\n', size: Optional[int] = None) -> bytes:
+        line = bytearray()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            c = self.read(1)
+            if not c:
+                break
+            line += c
+            if line.endswith(expected) or (size is not None and len(line) >= size):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        return bytes(line)
+
+    def readline(self, size: Optional[int] = None) -> bytes:
+        return self.read_until(b'\n', size)
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._deliver(time.monotonic())
+            self._rx.clear()
+
+    def reset_output_buffer(self):
+        with self._cond:
+            self._tx.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
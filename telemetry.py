@@ -0,0 +1,343 @@
+"""
+Shared device telemetry service for ChemiSuite
+Owns device I/O so the UI, data logger and ARChemedes share one set of readings
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+
+class DeviceTelemetry:
+    """
+    Polls one device driver and serializes every command sent to it
+
+    A single worker thread does all I/O for the device: it reads the
+    device's loggable parameters once per poll interval and executes queued
+    commands (set temperature, start pump, ...) in between, so requests from
+    different parts of the app never interleave on the serial port.
+    """
+
+    def __init__(self, device: Dict, poll_interval: float = 2.0):
+        """
+        Args:
+            device: Device dict with 'name', 'driver' and 'loggable_parameters'
+            poll_interval: Seconds between background reads of all parameters
+        """
+        self.device = device
+        self.name = device['name']
+        self.driver = device['driver']
+        self.parameters = device.get('loggable_parameters', {})
+        self.poll_interval = poll_interval
+        self.default_poll_interval = poll_interval
+
+        # Latest readings: parameter -> (value, time.time() of the read)
+        self.readings = {}
+        self._readings_lock = threading.Lock()
+
+        self._commands = queue.Queue()
+        self._running = False
+        self._thread = None
+
+        # Statistics
+        self.read_count = 0
+        self.command_count = 0
+        self.error_count = 0
+
+    def start(self):
+        """Start the device worker thread"""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"Telemetry-{self.name}")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker once the commands already queued have run"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._commands.put(None)  # Wake the worker
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self):
+        """Worker loop: run queued commands, poll parameters when due"""
+        next_poll = time.monotonic()
+        last_poll = None
+
+        while True:
+            if last_poll is not None:
+                # Pick up a shorter poll_interval without waiting out the old one
+                next_poll = min(next_poll, last_poll + self.poll_interval)
+
+            try:
+                command = self._commands.get(timeout=max(0.0, next_poll - time.monotonic()))
+            except queue.Empty:
+                command = None
+
+            if command is not None:
+                self._execute(*command)
+                continue
+
+            if not self._running:
+                break
+
+            now = time.monotonic()
+            if self._running and now >= next_poll:
+                last_poll = now
+                self._poll_all()
+
+                # Fixed-rate schedule; skip polls missed while busy
+                next_poll += self.poll_interval
+                if next_poll <= now:
+                    next_poll = now + self.poll_interval
+
+        # Fail anything still queued so callers don't wait forever
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            if command is not None:
+                command[-1].set_exception(RuntimeError(f"{self.name} telemetry stopped"))
+
+    def set_poll_interval(self, poll_interval: Optional[float]):
+        """Change how often the device is polled (None: back to the registered interval)"""
+        self.poll_interval = poll_interval or self.default_poll_interval
+        self._commands.put(None)  # Wake the worker to reschedule
+
+    def _execute(self, method_name: str, args: tuple, kwargs: Dict, future: Future):
+        """Run one queued command on the driver"""
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            if method_name == 'read_parameter':
+                result = self._read_parameter(*args)
+            else:
+                result = getattr(self.driver, method_name)(*args, **kwargs)
+                self.command_count += 1
+            future.set_result(result)
+        except Exception as e:
+            self.error_count += 1
+            future.set_exception(e)
+
+    def _poll_all(self):
+        """
+        Read every loggable parameter once
+
+        Drivers that provide read_many(calls) get all parameters in a single
+        pipelined exchange; others are read one parameter at a time.
+        """
+        if hasattr(self.driver, 'read_many'):
+            param_names = list(self.parameters)
+            calls = [(self.parameters[name]['method'], self.parameters[name].get('args', {}))
+                     for name in param_names]
+            try:
+                values = self.driver.read_many(calls)
+                self.read_count += len(calls)
+            except Exception as e:
+                self.error_count += 1
+                print(f"Telemetry error reading {self.name}: {e}")
+                return
+
+            now = time.time()
+            with self._readings_lock:
+                for param_name, value in zip(param_names, values):
+                    if value is not None:
+                        self.readings[param_name] = (value, now)
+            return
+
+        for param_name in self.parameters:
+            try:
+                self._read_parameter(param_name)
+            except Exception as e:
+                self.error_count += 1
+                print(f"Telemetry error reading {self.name}.{param_name}: {e}")
+
+    def _read_parameter(self, param_name: str) -> Optional[float]:
+        """Read one parameter from the driver and cache it"""
+        param_config = self.parameters[param_name]
+        method = getattr(self.driver, param_config['method'], None)
+        if method is None:
+            return None
+
+        value = method(**param_config.get('args', {}))
+        self.read_count += 1
+
+        if value is not None:
+            with self._readings_lock:
+                self.readings[param_name] = (value, time.time())
+        return value
+
+    def submit(self, method_name: str, *args, **kwargs) -> Future:
+        """Queue a driver method call and return a Future for its result"""
+        future = Future()
+        if not self._running:
+            future.set_exception(RuntimeError(f"{self.name} telemetry is not running"))
+            return future
+
+        self._commands.put((method_name, args, kwargs, future))
+        return future
+
+    def get_readings(self) -> Dict[str, Dict]:
+        """Get the latest cached reading of every parameter read so far"""
+        with self._readings_lock:
+            param_names = list(self.readings)
+        return {param_name: self.get_reading(param_name) for param_name in param_names}
+
+    def get_reading(self, param_name: str) -> Optional[Dict]:
+        """
+        Get the latest cached reading of a parameter
+
+        Returns:
+            Dict with 'value', 'timestamp', 'age' and 'stale', or None if the
+            parameter has never been read
+        """
+        with self._readings_lock:
+            reading = self.readings.get(param_name)
+
+        if reading is None:
+            return None
+
+        value, timestamp = reading
+        age = time.time() - timestamp
+        return {
+            'value': value,
+            'timestamp': timestamp,
+            'age': age,
+            'stale': age > 3 * self.poll_interval
+        }
+
+    def read(self, param_name: str, max_age: float, timeout: float = 5.0) -> Optional[float]:
+        """
+        Get a parameter value no older than max_age seconds
+
+        Serves the cached reading when it is fresh enough, otherwise queues a
+        read on the worker and waits for it.
+        """
+        reading = self.get_reading(param_name)
+        if reading is not None and reading['age'] <= max_age:
+            return reading['value']
+
+        return self.submit('read_parameter', param_name).result(timeout=timeout)
+
+
+class DeviceCommands:
+    """
+    Driver-like proxy that routes method calls through the telemetry queue
+
+    Falls back to calling the driver directly when the device isn't
+    registered (e.g. before it is connected).
+    """
+
+    def __init__(self, service: 'TelemetryService', device: Dict, timeout: float = 5.0):
+        self._service = service
+        self._device = device
+        self._timeout = timeout
+
+    def __getattr__(self, method_name: str):
+        def call(*args, **kwargs):
+            return self._service.call(self._device, method_name, *args, timeout=self._timeout, **kwargs)
+        return call
+
+
+class TelemetryService:
+    """Registry of per-device telemetry workers shared by all consumers"""
+
+    def __init__(self, default_poll_interval: float = 2.0):
+        """
+        Args:
+            default_poll_interval: Seconds between reads for devices registered
+                without an explicit interval
+        """
+        self.default_poll_interval = default_poll_interval
+        self._devices = {}  # device_name -> DeviceTelemetry
+        self._lock = threading.Lock()
+
+    def register(self, device: Dict, poll_interval: Optional[float] = None) -> DeviceTelemetry:
+        """
+        Start polling a connected device (replaces a stale registration)
+
+        Devices without 'loggable_parameters' (e.g. loaded from a saved
+        configuration) get the defaults of their device type.
+        """
+        if 'loggable_parameters' not in device:
+            # Imported here: device modules import this module
+            import devices as device_modules
+            device['loggable_parameters'] = device_modules.get_loggable_parameters(device.get('type'))
+
+        with self._lock:
+            existing = self._devices.get(device['name'])
+            if existing is not None and existing.driver is device.get('driver'):
+                return existing
+
+        if existing is not None:
+            self.unregister(device['name'])
+
+        telemetry = DeviceTelemetry(device, poll_interval or self.default_poll_interval)
+        telemetry.start()
+
+        with self._lock:
+            self._devices[device['name']] = telemetry
+        return telemetry
+
+    def unregister(self, device_name: str):
+        """Stop polling a device, e.g. before disconnecting it"""
+        with self._lock:
+            telemetry = self._devices.pop(device_name, None)
+
+        if telemetry is not None:
+            telemetry.stop()
+
+    def get(self, device_name: str) -> Optional[DeviceTelemetry]:
+        """Get the telemetry worker of a device, if registered"""
+        with self._lock:
+            return self._devices.get(device_name)
+
+    def get_reading(self, device_name: str, param_name: str) -> Optional[Dict]:
+        """Get the latest reading of a device parameter with its age and staleness"""
+        telemetry = self.get(device_name)
+        return telemetry.get_reading(param_name) if telemetry else None
+
+    def get_value(self, device_name: str, param_name: str, default: Any = None) -> Any:
+        """Get the latest value of a device parameter without touching the device"""
+        reading = self.get_reading(device_name, param_name)
+        return reading['value'] if reading else default
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict]]:
+        """Get the latest readings of every registered device"""
+        with self._lock:
+            devices = list(self._devices.items())
+
+        return {name: telemetry.get_readings() for name, telemetry in devices}
+
+    def call(self, device: Dict, method_name: str, *args, timeout: float = 5.0, **kwargs) -> Any:
+        """Call a driver method, serialized with all other I/O to the device"""
+        telemetry = self.get(device['name'])
+        if telemetry is None:
+            return getattr(device['driver'], method_name)(*args, **kwargs)
+
+        return telemetry.submit(method_name, *args, **kwargs).result(timeout=timeout)
+
+    def commands(self, device: Dict, timeout: float = 5.0) -> DeviceCommands:
+        """Get a driver-like object whose calls go through the device's queue"""
+        return DeviceCommands(self, device, timeout)
+
+    def stop_all(self):
+        """Stop every device worker - called on app shutdown"""
+        with self._lock:
+            names = list(self._devices)
+
+        for name in names:
+            self.unregister(name)
+
+
+# Global telemetry service instance
+telemetry = TelemetryService()
@@ -0,0 +1,17 @@
+"""
+Make the ChemiSuite modules and device drivers importable when pytest runs
+from any directory, and run the tests from a scratch directory so that
+module-level instances (e.g. data_logger's database) never touch the lab's
+own files
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'devices', 'drivers'))
+
+_scratch = tempfile.TemporaryDirectory(prefix="chemisuite-tests-")
+os.chdir(_scratch.name)
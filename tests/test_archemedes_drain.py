@@ -0,0 +1,65 @@
+"""Tests for draining the ARChemedes offline queue (pages/archemedes.py)"""
+
+import pytest
+
+from database.publish_queue import PublishQueue
+from mqtt_publisher import MQTT_ERR_NO_CONN, PublishHandle
+from pages import archemedes
+
+
+class FlakyClient:
+    """Publisher stand-in that refuses the messages listed in fail_at (by call number)"""
+
+    def __init__(self, fail_at=()):
+        self.fail_at = set(fail_at)
+        self.calls = 0
+        self.sent = []
+        self.handles = []
+
+    def publish(self, topic, payload, qos=0, retain=False, coalesce=True):
+        self.calls += 1
+        if self.calls in self.fail_at:
+            return PublishHandle(MQTT_ERR_NO_CONN)
+        self.sent.append(payload)
+        handle = PublishHandle()
+        self.handles.append(handle)
+        return handle
+
+    def ack_all(self):
+        for handle in self.handles:
+            handle._done.set()
+
+
+@pytest.fixture
+def drain_state(tmp_path, monkeypatch):
+    queue = PublishQueue(db_path=str(tmp_path / "queue.db"))
+    for index in range(5):
+        queue.put("chemisuite/lab/a", f"m{index}")
+
+    state = archemedes.archemedes_state
+    monkeypatch.setitem(state, 'queue', queue)
+    monkeypatch.setitem(state, 'inflight', {})
+    monkeypatch.setitem(state, 'connected', True)
+    monkeypatch.setitem(state, 'drain_rate', 20)
+    monkeypatch.setitem(state, 'drain_tokens', 20.0)
+    monkeypatch.setitem(state, 'drain_time', None)
+    yield state
+    queue.close()
+
+
+def test_failed_publish_does_not_resend_inflight_rows(drain_state, monkeypatch):
+    client = FlakyClient(fail_at={3})
+    monkeypatch.setitem(drain_state, 'client', client)
+
+    archemedes.drain_queue()
+    assert client.sent == [b"m0", b"m1"]
+    assert len(drain_state['inflight']) == 2
+
+    archemedes.drain_queue()
+    assert client.sent == [b"m0", b"m1", b"m2", b"m3", b"m4"]
+
+    client.ack_all()
+    archemedes.drain_queue()
+    assert drain_state['queue'].depth == 0
+    assert drain_state['inflight'] == {}
+    assert client.sent == [b"m0", b"m1", b"m2", b"m3", b"m4"]
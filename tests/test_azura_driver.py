@@ -0,0 +1,90 @@
+"""Tests for the AZURA pump driver's reply framing and parsing (devices/drivers/Azura_Pump_driver.py)"""
+
+import pytest
+
+from Azura_Pump_driver import AzuraPumpDriver
+
+parse = AzuraPumpDriver._parse_field
+
+
+@pytest.mark.parametrize("response, command, convert, expected", [
+    ("FLOW:2000", "FLOW?", float, 2000.0),
+    ("2000", "FLOW?", float, 2000.0),                  # value only
+    ("FLOW:1.5 mL", "FLOW?", float, 1.5),
+    ("PRESSURE:50", "PRESSURE?", AzuraPumpDriver.QUERIES['get_pressure'][1], 5.0),
+    ("IMOTOR:12", "IMOTOR?", int, 12),
+    ("PRESSURE:50", "FLOW?", float, None),             # late answer to another query
+    ("ERROR", "FLOW?", float, None),
+    ("", "FLOW?", float, None),
+    (None, "FLOW?", float, None),                      # timed out
+])
+def test_parse_field(response, command, convert, expected):
+    assert parse(response, command, convert) == expected
+
+
+class ChunkedSerial:
+    """Serial stand-in that hands out canned bytes a few at a time"""
+
+    def __init__(self, data: bytes, chunk: int = 3):
+        self.data = bytearray(data)
+        self.chunk = chunk
+        self.is_open = True
+        self.written = b''
+
+    @property
+    def in_waiting(self):
+        return min(self.chunk, len(self.data))
+
+    def read(self, size):
+        taken = bytes(self.data[:min(size, self.chunk)])
+        del self.data[:len(taken)]
+        return taken
+
+    def write(self, data):
+        self.written += data
+
+    def reset_input_buffer(self):
+        pass
+
+
+def test_replies_are_framed_by_cr_and_skip_blank_lines():
+    driver = AzuraPumpDriver("COM4", timeout=0.2)
+    driver.ser = ChunkedSerial(b"FLOW:2000\r\n\r\nPRESSURE:50\r\nIMOTOR:7\r")
+
+    assert driver.read_many([('get_flow', {}), ('get_pressure', {}), ('get_motor_current', {})]) == [2000.0, 5.0, 7]
+    assert driver.ser.written == b"FLOW?\rPRESSURE?\rIMOTOR?\r"
+
+
+def test_missing_reply_times_out_as_none():
+    driver = AzuraPumpDriver("COM4", timeout=0.05)
+    driver.ser = ChunkedSerial(b"FLOW:2000\r")
+
+    assert driver.read_many([('get_flow', {}), ('get_pressure', {})]) == [2000.0, None]
+
+
+@pytest.fixture
+def pump():
+    driver = AzuraPumpDriver("sim://azura/1")
+    assert driver.connect()
+    yield driver
+    driver.disconnect()
+
+
+def test_simulated_pump_round_trip(pump):
+    assert pump.set_flow(1500)
+    assert pump.start()
+    assert pump.get_flow() == 1500.0
+
+    flow, head = pump.read_many([('get_flow', {}), ('get_head_type', {})])
+    assert (flow, head) == (1500.0, 10)
+
+    status = pump.get_status()
+    assert status['flow_ml_min'] == 1.5
+    assert status['pressure_mpa'] >= 0
+    assert set(status) == {'flow_ul_min', 'flow_ml_min', 'pressure_mpa', 'motor_current', 'head_type_ml'}
+    assert pump.stop()
+
+
+def test_flow_outside_range_is_not_sent(pump):
+    assert not pump.set_flow(60000)
+    assert pump.get_flow() != 60000
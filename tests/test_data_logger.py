@@ -0,0 +1,136 @@
+"""Tests for the data logger's polling and session handling (data_logger.py)"""
+
+import threading
+import time
+
+import pytest
+
+from data_logger import DataLogger
+from database.db_manager import DatabaseManager
+
+
+class BlockingDriver:
+    """Driver whose reads wait until released, like a device that stops answering"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.reading = threading.Event()
+
+    def get_temperature(self, sensor_type=2):
+        self.reading.set()
+        self.release.wait(5)
+        return 42.0
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "chemisuite.db"))
+    yield db
+    db.close()
+
+
+def make_device(driver):
+    return {
+        'name': 'Hotplate',
+        'type': 'ika_stirrer',
+        'com_port': 'COM9',
+        'driver': driver,
+        'loggable_parameters': {
+            'temperature': {'method': 'get_temperature', 'args': {'sensor_type': 2}, 'unit': '°C',
+                            'display_name': 'Temperature', 'interval': None, 'deadband': None, 'heartbeat': None},
+        },
+    }
+
+
+def test_poll_finishing_after_stop_keeps_its_session(db, monkeypatch):
+    driver = BlockingDriver()
+    logger = DataLogger(db)
+    # Don't wait the full 5 s for the stuck port
+    monkeypatch.setattr(logger, '_wait_for_port_polls', lambda timeout: DataLogger._wait_for_port_polls(logger, 0.1))
+
+    session_id = logger.start_session("run", [make_device(driver)], {'Hotplate': ['temperature']},
+                                      interval_seconds=1)
+    assert driver.reading.wait(5)
+    logger.stop_session()
+    assert logger.active_session_id is None
+
+    # The read answers late; its point still belongs to the stopped session
+    driver.release.set()
+    deadline = time.monotonic() + 5
+    while not db.get_session_data(session_id) and time.monotonic() < deadline:
+        db.flush()
+        time.sleep(0.02)
+    assert [row[3] for row in db.get_session_data(session_id)] == [42.0]
+
+
+def prepare_schedule(logger, parameter_settings, tick_seconds):
+    """Set up the logger's schedule the way start_session does, without the polling thread"""
+    device = make_device(None)
+    device['loggable_parameters']['speed'] = dict(device['loggable_parameters']['temperature'],
+                                                  method='get_speed', unit='RPM')
+    logger.devices_to_log = [device]
+    logger.parameters_to_log = {'Hotplate': ['temperature', 'speed']}
+    logger.interval_seconds = tick_seconds
+    logger._schedule = logger._build_schedule(parameter_settings)
+    logger.tick_seconds = tick_seconds
+    return device
+
+
+def due_names(logger, device, now):
+    return [params for _, params in logger._take_due_parameters([device], now)]
+
+
+def test_fixed_rate_schedule_keeps_each_parameter_cadence(db):
+    logger = DataLogger(db)
+    device = prepare_schedule(logger, {'Hotplate': {'speed': {'interval': 3}}}, tick_seconds=1)
+
+    assert due_names(logger, device, 100.0) == [['temperature', 'speed']]
+    # Slightly late or early ticks don't drift the schedule
+    assert due_names(logger, device, 101.2) == [['temperature']]
+    assert due_names(logger, device, 101.9) == [['temperature']]
+    assert due_names(logger, device, 103.0) == [['temperature', 'speed']]
+    assert logger._schedule[('Hotplate', 'temperature')]['next_due'] == 104.0
+    assert logger._schedule[('Hotplate', 'speed')]['next_due'] == 106.0
+
+
+def test_fixed_rate_schedule_skips_missed_samples(db):
+    logger = DataLogger(db)
+    device = prepare_schedule(logger, {}, tick_seconds=2)
+
+    due_names(logger, device, 100.0)
+    # A stall of several intervals yields one sample, not a burst of catch-up reads
+    assert due_names(logger, device, 109.0) == [['temperature', 'speed']]
+    assert due_names(logger, device, 109.5) == []
+    assert due_names(logger, device, 111.0) == [['temperature', 'speed']]
+
+
+def test_session_settings_override_parameter_defaults(db):
+    logger = DataLogger(db)
+    prepare_schedule(logger, {'Hotplate': {'temperature': {'deadband': 0.5, 'heartbeat': 60, 'interval': None}}},
+                     tick_seconds=5)
+
+    temperature = logger._schedule[('Hotplate', 'temperature')]
+    assert (temperature['interval'], temperature['deadband'], temperature['heartbeat']) == (5, 0.5, 60)
+    assert logger._schedule[('Hotplate', 'speed')]['deadband'] is None
+
+
+def test_deadband_and_heartbeat(db, monkeypatch):
+    logger = DataLogger(db)
+    prepare_schedule(logger, {'Hotplate': {'temperature': {'deadband': 0.5, 'heartbeat': 60}}}, tick_seconds=1)
+    clock = [1000.0]
+    monkeypatch.setattr('data_logger.time.monotonic', lambda: clock[0])
+
+    def record(value, at):
+        clock[0] = at
+        return logger._should_record('Hotplate', 'temperature', value)
+
+    assert record(25.0, 1000)
+    assert not record(25.3, 1001)
+    assert not record(24.6, 1002)     # Measured against the last recorded value, not the last reading
+    assert record(25.6, 1003)
+    assert not record(25.6, 1062)
+    assert record(25.6, 1063)         # Heartbeat since the last recorded point
+    assert logger.suppressed_points == 3
+
+    # Without a deadband every reading is kept
+    assert all(logger._should_record('Hotplate', 'speed', 300.0) for _ in range(3))
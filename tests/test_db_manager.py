@@ -0,0 +1,291 @@
+"""Tests for the ChemiSuite session database (database/db_manager.py)"""
+
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "chemisuite.db"))
+    yield db
+    db.close()
+
+
+def point(session_id, ts, value, parameter='temperature'):
+    return (session_id, ts, 'Hotplate', 'ika_stirrer', parameter, value, '°C')
+
+
+def test_points_without_session_are_dropped(db):
+    session_id = db.create_session("run", 1)
+    db.record_data_points([point(None, 1000.0, 1.0), point(session_id, 1000.0, 2.0)])
+
+    assert db.flush() == 1
+    assert [row[3] for row in db.get_session_data(session_id)] == [2.0]
+
+
+def test_failed_flush_keeps_points(db, monkeypatch):
+    first = db.create_session("first", 1)
+    second = db.create_session("second", 1)
+    db.record_data_points([point(first, 1000.0 + index, float(index)) for index in range(3)])
+    db.record_data_points([point(second, 1000.0, 10.0, parameter='speed')])
+
+    def disk_full(conn, points):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(db, '_update_rollups', disk_full)
+    with pytest.raises(OSError):
+        db.flush()
+    monkeypatch.undo()
+
+    # Nothing was lost, and series created by the rolled-back write are made again
+    assert db.flush() == 4
+    assert [row[3] for row in db.get_session_data(first)] == [0.0, 1.0, 2.0]
+    assert [row[3] for row in db.get_session_data(second)] == [10.0]
+
+
+LEGACY_ROWS = [
+    # session, timestamp, device, type, parameter, value, unit
+    (1, '2024-03-05 10:00:00', 'Hotplate', 'ika_stirrer', 'temperature', 21.5, '°C'),
+    (1, '2024-03-05 10:00:00.500000', 'Hotplate', 'ika_stirrer', 'speed', 300.0, 'RPM'),
+    (1, '2024-03-05 10:00:01', 'Hotplate', 'ika_stirrer', 'temperature', 22.0, '°C'),
+    (1, '2024-03-05 10:00:02', 'Hotplate', 'ika_stirrer', 'temperature', None, '°C'),
+    (2, '2024-03-06 09:30:00', 'Pump', 'azura_pump', 'flow', 2.5, None),
+]
+
+
+def make_legacy_database(path):
+    """Database in the original schema: one TEXT-heavy row per sample"""
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE logging_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, start_time DATETIME NOT NULL,
+            end_time DATETIME, interval_seconds INTEGER NOT NULL, status TEXT NOT NULL, metadata TEXT);
+        CREATE TABLE data_points (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER NOT NULL, timestamp DATETIME NOT NULL,
+            device_name TEXT NOT NULL, device_type TEXT NOT NULL, parameter TEXT NOT NULL,
+            value REAL, unit TEXT, FOREIGN KEY(session_id) REFERENCES logging_sessions(id));
+        CREATE INDEX idx_session_time ON data_points(session_id, timestamp);
+    """)
+    conn.executemany("INSERT INTO logging_sessions (name, start_time, end_time, interval_seconds, status, metadata) "
+                     "VALUES (?, ?, ?, 1, 'stopped', '{}')",
+                     [("first", '2024-03-05 10:00:00', '2024-03-05 11:00:00'),
+                      ("second", '2024-03-06 09:30:00', '2024-03-06 10:00:00')])
+    conn.executemany("INSERT INTO data_points (session_id, timestamp, device_name, device_type, parameter, value, unit) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", LEGACY_ROWS)
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_schema_migration(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "chemisuite.db")
+    make_legacy_database(path)
+
+    db = DatabaseManager(path)
+    try:
+        for session_id in (1, 2):
+            expected = [(timestamp, device, parameter, value, unit or '')
+                        for sid, timestamp, device, _, parameter, value, unit in LEGACY_ROWS if sid == session_id]
+            assert db.get_session_data(session_id) == expected
+
+        # NULL readings are kept as samples but not counted
+        assert db.get_data_point_count(1) == 3
+        stats = {series['parameter']: series for series in db.get_series_stats(1)}
+        assert (stats['temperature']['count'], stats['temperature']['mean']) == (2, 21.75)
+        assert stats['speed']['count'] == 1
+        assert {s['id']: s['data_points'] for s in db.get_all_sessions()} == {1: 3, 2: 1}
+    finally:
+        db.close()
+
+    conn = sqlite3.connect(path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 3
+    conn.close()
+    assert 'data_points_legacy' not in tables
+
+    # Opening the migrated file again is a no-op
+    db = DatabaseManager(path)
+    try:
+        assert len(db.get_session_data(1)) == 4
+    finally:
+        db.close()
+
+
+def test_flush_then_window_read(db):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_000
+    db.record_data_points([point(session_id, base + second, float(second)) for second in range(10)])
+    db.record_data_points([point(session_id, base + 4.5, 100.0, parameter='speed')])
+    assert db.flush() == 11
+
+    window = db.get_data_window(session_id, start=base + 3, end=base + 6)
+    assert [(row[2], row[3]) for row in window] == [('temperature', 3.0), ('temperature', 4.0),
+                                                   ('speed', 100.0), ('temperature', 5.0)]
+    assert [row[3] for row in db.get_data_window(session_id, start=base + 8, parameter='temperature')] == [8.0, 9.0]
+
+
+def test_window_cursors_return_only_new_points(db):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_000
+    db.record_data_points([point(session_id, base + second, float(second)) for second in range(3)])
+    db.flush()
+
+    cursors = {}
+    assert len(db.get_data_window(session_id, cursors=cursors)) == 3
+    assert db.get_data_window(session_id, cursors=cursors) == []
+
+    db.record_data_points([point(session_id, base + 3, 3.0), point(session_id, base + 4, 4.0, parameter='speed')])
+    db.flush()
+    assert [(row[2], row[3]) for row in db.get_data_window(session_id, cursors=cursors)] == [('temperature', 3.0),
+                                                                                          ('speed', 4.0)]
+    assert len(cursors) == 2
+
+
+def test_rollup_counters_match_rebuild(db):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_020   # 20 s before a minute boundary
+    values = [float(index % 7) for index in range(90)]
+    db.record_data_points([point(session_id, base + index, value) for index, value in enumerate(values)])
+    db.record_data_points([point(session_id, base + 0.5, None)])
+    db.flush()
+
+    stats = db.get_series_stats(session_id)[0]
+    assert (stats['count'], stats['min'], stats['max']) == (90, 0.0, 6.0)
+    assert stats['mean'] == pytest.approx(sum(values) / 90)
+
+    rollup = db.get_rollup_data(session_id, '1m')[0]
+    assert rollup['count'] == [20, 60, 10]
+    assert sum(rollup['count']) == 90
+
+    db.rebuild_rollups(session_id)
+    assert db.get_series_stats(session_id)[0] == stats
+    assert db.get_rollup_data(session_id, '1m')[0] == rollup
+
+
+def test_downsampling_bounds_points_and_skips_nulls(db):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_000
+    points = [point(session_id, base + index, 1.0 if index != 500 else 50.0) for index in range(1000)]
+    points += [point(session_id, base + index + 0.5, None) for index in range(0, 1000, 10)]
+    db.record_data_points(points)
+    db.flush()
+
+    for method in ('lttb', 'minmax'):
+        series, = db.get_downsampled_data(session_id, max_points=100, method=method)
+        assert series['raw_points'] == 1000
+        assert len(series['values']) <= 100
+        assert None not in series['values']
+        # The spike survives either way
+        assert max(series['values']) == 50.0
+
+    series, = db.get_downsampled_data(session_id, max_points=100, method='lttb')
+    first, last = db.get_data_window(session_id)[0], db.get_data_window(session_id)[-1]
+    assert series['timestamps'][0] == first[0]
+    assert series['timestamps'][-1] == last[0]
+
+
+def test_downsample_session_thins_old_samples(db):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_020   # 20 s before a minute boundary
+    db.record_data_points([point(session_id, base + index, float(index)) for index in range(180)])
+    db.flush()
+
+    cutoff = base + 20 + 120   # two whole minutes after the first partial one
+    removed = db.downsample_session(session_id, before=cutoff, bucket_seconds=60)
+    old = db.get_data_window(session_id, end=cutoff)
+    assert [row[3] for row in old] == [9.5, 49.5, 109.5]
+    assert removed == 140 - 3
+    assert len(db.get_data_window(session_id, start=cutoff)) == 40
+    # Counters and rollups keep the full-resolution figures
+    assert db.get_data_point_count(session_id) == 180
+
+    # A second run with the same cutoff has nothing left to do
+    assert db.downsample_session(session_id, before=cutoff, bucket_seconds=60) == 0
+
+
+def test_partition_archive_restore(db, tmp_path):
+    session_id = db.create_session("run", 1)
+    other = db.create_session("other", 1)
+    db.record_data_points([point(session_id, 1_700_000_000 + index, float(index)) for index in range(50)])
+    db.record_data_points([point(other, 1_700_000_000, 1.0)])
+    db.flush()
+    expected = db.get_session_data(session_id)
+
+    with pytest.raises(RuntimeError):
+        db.partition_session(session_id, partition_dir=str(tmp_path / "partitions"))
+    db.update_session_status(session_id, 'stopped')
+
+    path = db.partition_session(session_id, partition_dir=str(tmp_path / "partitions"))
+    assert path.startswith(str(tmp_path))
+    assert db.get_session_data(session_id) == expected
+    assert db.get_data_point_count(session_id) == 50
+    hot = db._get_reader().execute("SELECT COUNT(*) FROM series WHERE session_id = ?", (session_id,)).fetchone()[0]
+    assert hot == 0
+    assert len(db.get_session_data(other)) == 1
+
+    archive = db.archive_session(session_id, archive_dir=str(tmp_path / "archive"),
+                                 partition_dir=str(tmp_path / "partitions"))
+    assert archive.endswith('.db.gz')
+    info = db.get_session_info(session_id)
+    assert info['status'] == 'archived'
+    assert [s for s in db.get_all_sessions() if s['id'] == session_id][0]['data_points'] == 50
+
+    db.restore_session(session_id, partition_dir=str(tmp_path / "partitions"))
+    assert db.get_session_info(session_id)['status'] == 'stopped'
+    assert db.get_session_data(session_id) == expected
+
+
+@pytest.mark.parametrize("filename", ["export.csv", "export.csv.gz"])
+def test_csv_round_trip(db, tmp_path, filename):
+    session_id = db.create_session("run", 1)
+    base = 1_700_000_000
+    db.record_data_points([point(session_id, base + index * 0.25, index * 1.5) for index in range(40)])
+    db.record_data_points([(session_id, base, 'Pump', 'azura_pump', 'flow', 2.5, 'mL/min')])
+    db.flush()
+
+    path = str(tmp_path / filename)
+    assert db.export_to_csv(session_id, path) == 41
+
+    imported = db.import_from_csv(path)
+    assert imported != session_id
+    assert db.get_session_data(imported) == db.get_session_data(session_id)
+    assert db.get_data_point_count(imported) == 41
+
+
+def test_retention_pass_applies_policy(db, tmp_path):
+    import sqlite3
+    from datetime import datetime, timedelta
+
+    from database.retention import DEFAULT_POLICY, RetentionManager
+
+    old_run = db.create_session("old", 1)
+    recent_run = db.create_session("recent", 1)
+    active_run = db.create_session("active", 1)
+    start = (datetime.now() - timedelta(days=40)).timestamp()
+    for session_id in (old_run, recent_run, active_run):
+        db.record_data_points([point(session_id, start + index, float(index)) for index in range(120)])
+    db.flush()
+    db.update_session_status(old_run, 'stopped')
+    db.update_session_status(recent_run, 'stopped')
+
+    ended = (datetime.now() - timedelta(days=30)).isoformat()
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE logging_sessions SET end_time = ? WHERE id = ?", (ended, old_run))
+    conn.commit()
+    conn.close()
+
+    policy = dict(DEFAULT_POLICY, downsample_after_days=7, downsample_seconds=60,
+                  partition_after_days=1, partition_dir=str(tmp_path / "partitions"),
+                  archive_after_days=14, archive_dir=str(tmp_path / "archive"))
+    retention = RetentionManager(db, policy)
+    report = retention.run_once(active_session_id=active_run)
+
+    assert report['archived'] == [old_run]
+    assert sorted(report['downsampled']) == [recent_run, active_run]
+    assert report['partitioned'] == []   # The recent run only just ended
+    assert db.get_session_info(old_run)['status'] == 'archived'
+    assert len(db.get_data_window(recent_run)) == len(db.get_data_window(active_run)) < 120
@@ -0,0 +1,71 @@
+"""Tests for the IKA hotplate driver's NAMUR reply handling (devices/drivers/IKA_Hotplate_driver.py)"""
+
+import pytest
+
+from IKA_Hotplate_driver import IKAHotplateDriver
+
+parse = IKAHotplateDriver._parse_reply
+
+
+@pytest.mark.parametrize("response, command, expected", [
+    ("25.5 2", "IN_PV_2", 25.5),           # value and channel
+    ("25.5", "IN_PV_2", 25.5),             # value only
+    ("IN_PV_2 25.5", "IN_PV_2", 25.5),     # echo
+    ("350.0 4", "IN_PV_4", 350.0),
+    ("25.5 4", "IN_PV_2", None),           # another channel's reply
+    ("", "IN_PV_2", None),                 # timed out
+    ("RESET", "IN_PV_2", None),
+    ("25.5 2 7", "IN_PV_2", None),
+])
+def test_parse_reply(response, command, expected):
+    assert parse(response, command) == expected
+
+
+def test_parse_reply_out_of_order_needs_echo():
+    assert parse("25.5", "IN_PV_2", in_order=False) is None
+    assert parse("25.5 2", "IN_PV_2", in_order=False) is None
+    assert parse("IN_PV_2 25.5", "IN_PV_2", in_order=False) == 25.5
+
+
+def test_single_query_accepts_bare_value(monkeypatch):
+    driver = IKAHotplateDriver("sim://ika/1")
+    monkeypatch.setattr(driver, '_send_command', lambda command, *args, **kwargs: "25.5")
+    assert driver.get_temperature() == 25.5
+    assert driver.get_speed() == 25.5
+
+    monkeypatch.setattr(driver, '_send_command', lambda command, *args, **kwargs: "")
+    assert driver.get_temperature() == 0.0
+
+
+@pytest.fixture
+def hotplate(request):
+    driver = IKAHotplateDriver(request.param, response_timeout=0.1)
+    assert driver.connect()[0]
+    yield driver
+    driver.disconnect()
+
+
+@pytest.mark.parametrize("hotplate", ["sim://ika/1"], indirect=True)
+def test_read_many_matches_replies_to_queries(hotplate):
+    hotplate.set_temperature(150)
+    hotplate.set_speed(800)
+
+    temperature, target, target_speed = hotplate.read_many(
+        [('get_temperature', {'sensor_type': 2}), ('get_target_temperature', {'sensor_type': 2}),
+         ('get_target_speed', {})])
+    assert temperature == pytest.approx(22.0, abs=1.0)
+    assert target == 150.0
+    assert target_speed == 800.0
+
+
+@pytest.mark.parametrize("hotplate", ["sim://ika/2?error_rate=0.3&seed=3"], indirect=True)
+def test_lost_replies_never_shift_values(hotplate):
+    hotplate.set_temperature(150)
+
+    values = [hotplate.read_many([('get_temperature', {}), ('get_target_temperature', {})]) for _ in range(30)]
+
+    # A lost temperature reply must not let the setpoint's reply stand in for it
+    assert any(None in pair for pair in values)
+    assert all(temperature is None or temperature < 100 for temperature, _ in values)
+    assert all(target in (None, 150.0) for _, target in values)
+    assert any(pair[0] is not None and pair[1] == 150.0 for pair in values)
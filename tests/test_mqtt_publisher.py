@@ -0,0 +1,182 @@
+"""Tests for MQTTPublisher against the in-process FakeBroker (simulators/mqtt_broker.py)"""
+
+import time
+
+import pytest
+
+import mqtt_publisher
+from mqtt_publisher import MQTT_ERR_NO_CONN, MQTTPublisher
+from simulators.mqtt_broker import FakeBroker
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    """Poll condition until it is true or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def make_publisher():
+    """Factory for started publishers with short backoffs, stopped after the test"""
+    publishers = []
+
+    def make(connection_factory, **kwargs):
+        kwargs.setdefault('backoff_initial', 0.05)
+        kwargs.setdefault('backoff_max', 0.2)
+        publisher = MQTTPublisher(connection_factory, **kwargs)
+        publishers.append(publisher)
+        publisher.start()
+        return publisher
+
+    yield make
+    for publisher in publishers:
+        publisher.stop()
+
+
+def test_publish_while_disconnected_is_refused(make_publisher):
+    broker = FakeBroker()
+    broker.go_offline()
+    publisher = make_publisher(broker.connection)
+
+    assert publisher.publish("lab/a", "1").rc == MQTT_ERR_NO_CONN
+    assert broker.received == 0
+
+
+def test_backoff_after_broker_outage(make_publisher, monkeypatch):
+    broker = FakeBroker()
+    delays = []
+    draw = mqtt_publisher.random.uniform
+
+    def record_delay(low, high):
+        # Waits are drawn from [delay / 2, delay]; keep the delay, not the draw
+        delays.append(high)
+        return draw(low, high)
+
+    monkeypatch.setattr(mqtt_publisher.random, 'uniform', record_delay)
+    publisher = make_publisher(broker.connection, backoff_initial=0.05, backoff_max=0.2)
+    assert wait_until(lambda: publisher.connected)
+
+    broker.go_offline()
+    assert wait_until(lambda: not publisher.connected)
+    assert wait_until(lambda: publisher.get_stats()['reconnect_in_s'] is not None)
+    assert wait_until(lambda: publisher.connect_failures >= 4, timeout=30.0)
+    broker.go_online()
+    assert wait_until(lambda: publisher.connected, timeout=30.0)
+
+    # One wait after the drop and one after each failed attempt: doubling from
+    # backoff_initial, capped at backoff_max
+    failures = publisher.connect_failures
+    assert delays == pytest.approx([0.05, 0.1] + [0.2] * (failures - 1))
+
+    stats = publisher.get_stats()
+    assert stats['connects'] == 2
+    assert stats['disconnects'] == 1
+    assert stats['reconnect_in_s'] is None
+    assert publisher.publish("lab/a", "1", qos=1).wait_for_publish(5.0)
+
+
+def test_inflight_window_is_capped(make_publisher):
+    broker = FakeBroker(latency=0.3)
+    publisher = make_publisher(broker.connection, max_inflight=3, topic_rate=None)
+    assert wait_until(lambda: publisher.connected)
+
+    handles = [publisher.publish(f"lab/device/{index}", str(index), qos=1) for index in range(10)]
+    assert wait_until(lambda: broker.received == 3)
+
+    most = 0
+    deadline = time.monotonic() + 0.8
+    while time.monotonic() < deadline:
+        most = max(most, publisher.get_stats()['inflight'])
+        time.sleep(0.005)
+    assert most == 3
+    assert broker.received <= 9
+
+    assert all(handle.wait_for_publish(3.0) for handle in handles)
+    assert publisher.get_stats()['inflight'] == 0
+    assert publisher.published == 10
+
+
+def test_unacked_messages_are_resent_after_reconnect(make_publisher):
+    broker = FakeBroker(latency=60.0)   # No acks before the connection drops
+    publisher = make_publisher(broker.connection, topic_rate=None)
+    assert wait_until(lambda: publisher.connected)
+
+    handles = [publisher.publish(f"lab/device/{index}", str(index), qos=1) for index in range(4)]
+    publisher.publish("lab/status", "up", qos=0)
+    assert wait_until(lambda: broker.received == 5)
+    assert not any(handle.is_published() for handle in handles)
+
+    broker.latency = 0.01
+    broker.go_offline()
+    assert wait_until(lambda: not publisher.connected)
+    broker.go_online()
+
+    assert all(handle.wait_for_publish(3.0) for handle in handles)
+    assert publisher.resent == 4
+    assert broker.received == 9
+    assert broker.topics["lab/device/0"] == 2
+    assert broker.topics["lab/status"] == 1   # QoS 0 is not retried
+
+
+def test_rate_limited_topic_coalesces(make_publisher):
+    broker = FakeBroker()
+    publisher = make_publisher(broker.connection, topic_rate=2.0)
+    assert wait_until(lambda: publisher.connected)
+
+    first = publisher.publish("lab/x", "0", qos=1, retain=True)
+    assert first.wait_for_publish(2.0)
+    sent_first = time.monotonic()
+
+    # The topic may send again in 0.5 s; meanwhile only the latest value survives
+    waiting = [publisher.publish("lab/x", str(value), qos=1, retain=True) for value in (1, 2, 3)]
+    assert waiting[-1].wait_for_publish(2.0)
+    assert time.monotonic() - sent_first >= 0.4
+
+    assert [handle.superseded for handle in waiting] == [True, True, False]
+    assert not waiting[0].is_published()
+    assert publisher.coalesced == 2
+    assert broker.topics["lab/x"] == 2
+    assert broker.retained["lab/x"] == b"3"
+
+
+def test_uncoalesced_messages_all_send(make_publisher):
+    broker = FakeBroker()
+    publisher = make_publisher(broker.connection, topic_rate=2.0)
+    assert wait_until(lambda: publisher.connected)
+
+    handles = [publisher.publish("lab/x", str(value), qos=1, coalesce=False) for value in range(5)]
+    assert all(handle.wait_for_publish(2.0) for handle in handles)
+    assert publisher.coalesced == 0
+    assert broker.topics["lab/x"] == 5
+
+
+def test_permanent_refusal_stops_retrying(make_publisher):
+    broker = FakeBroker(refuse_rc=4)
+    failures = []
+    publisher = make_publisher(broker.connection,
+                               on_connect_failed=lambda error, permanent: failures.append((error, permanent)))
+
+    assert wait_until(lambda: failures)
+    time.sleep(0.5)
+    assert failures == [("Bad username or password", True)]
+    assert publisher.connect_failures == 1
+    assert not publisher.connected
+    assert publisher.get_stats()['reconnect_in_s'] is None
+    assert broker.connections == 0
+
+
+def test_temporary_refusal_keeps_retrying(make_publisher):
+    broker = FakeBroker(refuse_rc=3)
+    failures = []
+    publisher = make_publisher(broker.connection,
+                               on_connect_failed=lambda error, permanent: failures.append((error, permanent)))
+
+    assert wait_until(lambda: len(failures) >= 3)
+    assert all(failure == ("Server unavailable", False) for failure in failures)
+
+    broker.refuse_rc = 0
+    assert wait_until(lambda: publisher.connected)
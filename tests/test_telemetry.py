@@ -0,0 +1,159 @@
+"""Tests for the shared device telemetry service (telemetry.py)"""
+
+import time
+
+import pytest
+
+import data_manager
+from IKA_Hotplate_driver import IKAHotplateDriver
+from telemetry import TelemetryService
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    """Poll condition until it is true or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def service():
+    service = TelemetryService(default_poll_interval=0.05)
+    yield service
+    service.stop_all()
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_manager, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(data_manager, 'CONFIGS_DIR', str(tmp_path / "configs"))
+
+
+def test_device_from_saved_config_is_polled(service, config_dir):
+    added = {'name': 'Hotplate', 'type': 'ika_stirrer', 'com_port': 'sim://ika/1',
+             'loggable_parameters': {'unused': {'method': 'get_speed'}}}
+    assert data_manager.save_config("lab", [added], [])
+
+    devices, _, _ = data_manager.load_config("lab")
+    device = dict(devices[0])
+    assert 'loggable_parameters' not in device
+
+    device['driver'] = IKAHotplateDriver(device['com_port'])
+    assert device['driver'].connect()[0]
+    try:
+        service.register(device)
+        assert set(device['loggable_parameters']) == {'temperature', 'speed'}
+        assert wait_until(lambda: service.get_value('Hotplate', 'temperature') is not None)
+        assert service.get_value('Hotplate', 'speed') is not None
+    finally:
+        service.unregister('Hotplate')
+        device['driver'].disconnect()
+
+
+def test_unknown_device_type_registers_without_parameters(service):
+    device = {'name': 'Mystery', 'type': 'not_a_device', 'driver': object()}
+    telemetry = service.register(device)
+    assert telemetry.parameters == {}
+    assert service.snapshot() == {'Mystery': {}}
+
+
+class CountingDriver:
+    """Driver that counts reads and notices calls overlapping on its 'port'"""
+
+    def __init__(self):
+        self.reads = 0
+        self.busy = False
+        self.overlaps = 0
+        self.setpoints = []
+
+    def _io(self):
+        if self.busy:
+            self.overlaps += 1
+        self.busy = True
+        time.sleep(0.002)
+        self.busy = False
+
+    def get_temperature(self):
+        self._io()
+        self.reads += 1
+        return 20.0 + self.reads
+
+    def set_temperature(self, value):
+        self._io()
+        self.setpoints.append(value)
+        return True
+
+
+def counting_device(name='Bath'):
+    return {'name': name, 'type': 'test', 'driver': CountingDriver(),
+            'loggable_parameters': {'temperature': {'method': 'get_temperature'}}}
+
+
+def test_commands_are_serialized_with_polling(service):
+    import threading
+
+    device = counting_device()
+    service.register(device, poll_interval=0.001)
+    commands = service.commands(device)
+
+    threads = [threading.Thread(target=lambda start=start: [commands.set_temperature(start + step)
+                                                            for step in range(20)])
+               for start in (0, 100, 200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(device['driver'].setpoints) == 60
+    assert device['driver'].reads > 0
+    assert device['driver'].overlaps == 0
+    assert service.get('Bath').command_count == 60
+
+
+def test_read_serves_fresh_cache_and_refreshes_stale(service):
+    device = counting_device()
+    telemetry = service.register(device, poll_interval=60)
+    assert wait_until(lambda: service.get_value('Bath', 'temperature') is not None)
+    reads = device['driver'].reads
+
+    # Fresh enough: no device traffic
+    assert telemetry.read('temperature', max_age=30) == service.get_value('Bath', 'temperature')
+    assert device['driver'].reads == reads
+
+    # Too old: one read through the worker, which also updates the cache
+    value = telemetry.read('temperature', max_age=0)
+    assert device['driver'].reads == reads + 1
+    assert service.get_reading('Bath', 'temperature')['value'] == value
+    assert not service.get_reading('Bath', 'temperature')['stale']
+
+
+def test_poll_interval_change_takes_effect(service):
+    device = counting_device()
+    telemetry = service.register(device, poll_interval=60)
+    assert wait_until(lambda: device['driver'].reads == 1)
+
+    telemetry.set_poll_interval(0.01)
+    assert wait_until(lambda: device['driver'].reads >= 5, timeout=2)
+
+    telemetry.set_poll_interval(None)
+    assert telemetry.poll_interval == 60
+
+
+def test_unregistered_device_calls_driver_directly(service):
+    device = counting_device()
+    assert service.call(device, 'set_temperature', 50) is True
+    assert device['driver'].setpoints == [50]
+    assert service.get_value('Bath', 'temperature', default='n/a') == 'n/a'
+
+
+def test_stopped_worker_rejects_commands(service):
+    device = counting_device()
+    telemetry = service.register(device, poll_interval=60)
+    service.unregister('Bath')
+
+    with pytest.raises(RuntimeError):
+        telemetry.submit('set_temperature', 1).result(timeout=1)
+    assert service.get('Bath') is None